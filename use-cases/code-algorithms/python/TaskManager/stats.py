@@ -0,0 +1,98 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import timedelta
+
+from models import TaskStatus
+
+
+class TaskStatistics:
+    """
+    Counters over a task collection, kept up to date by TaskStorage.
+
+    track() is called whenever a task is added or changed and untrack() when
+    it is deleted, so statistics never need a scan over all tasks.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_status = Counter()
+        self.by_priority = Counter()
+        self._facts = {}
+        # Due dates of tasks that are not done, kept sorted
+        self._open_due_dates = []
+        # Completion timestamps bucketed by calendar day, each bucket sorted
+        self._completions_by_day = {}
+
+    def track(self, task):
+        """Add a task to the counters, replacing any previously tracked state."""
+        self.untrack(task.id)
+        facts = (task.status, task.priority, task.due_date, task.completed_at)
+        self._facts[task.id] = facts
+        self._apply(facts, 1)
+
+    def untrack(self, task_id):
+        """Remove a task from the counters. Unknown IDs are ignored."""
+        facts = self._facts.pop(task_id, None)
+        if facts is not None:
+            self._apply(facts, -1)
+
+    def clear(self):
+        self.__init__()
+
+    def _apply(self, facts, delta):
+        status, priority, due_date, completed_at = facts
+        self.total += delta
+        self.by_status[status] += delta
+        self.by_priority[priority] += delta
+
+        if due_date is not None and status != TaskStatus.DONE:
+            if delta > 0:
+                insort(self._open_due_dates, due_date)
+            else:
+                del self._open_due_dates[bisect_left(self._open_due_dates, due_date)]
+
+        if completed_at is not None:
+            bucket = self._completions_by_day.setdefault(completed_at.date(), [])
+            if delta > 0:
+                insort(bucket, completed_at)
+            else:
+                del bucket[bisect_left(bucket, completed_at)]
+                if not bucket:
+                    del self._completions_by_day[completed_at.date()]
+
+    def count_overdue(self, now):
+        """Count tasks that are past due and not done."""
+        return bisect_left(self._open_due_dates, now)
+
+    def count_completed_between(self, start, end):
+        """Count tasks completed in the window [start, end]."""
+        count = 0
+        day = start.date()
+        while day <= end.date():
+            bucket = self._completions_by_day.get(day)
+            if bucket:
+                low = bisect_left(bucket, start) if day == start.date() else 0
+                high = bisect_right(bucket, end) if day == end.date() else len(bucket)
+                count += high - low
+            day += timedelta(days=1)
+        return count
+
+    def verify(self, tasks, now):
+        """Return True if the counters match a full recount of tasks."""
+        tasks = list(tasks)
+        window_start = now - timedelta(days=7)
+        overdue = len([
+            task for task in tasks
+            if task.due_date and task.due_date < now and task.status != TaskStatus.DONE
+        ])
+        completed = len([
+            task for task in tasks
+            if task.completed_at and window_start <= task.completed_at <= now
+        ])
+        return (
+            self.total == len(tasks)
+            and +self.by_status == Counter(task.status for task in tasks)
+            and +self.by_priority == Counter(task.priority for task in tasks)
+            and self.count_overdue(now) == overdue
+            and self.count_completed_between(window_start, now) == completed
+        )
@@ -3,6 +3,7 @@ import json
 import os
 from datetime import datetime
 from models import Task, TaskPriority, TaskStatus
+from stats import TaskStatistics
 
 class TaskEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -41,9 +42,13 @@ class TaskDecoder(json.JSONDecoder):
         return obj
 
 class TaskStorage:
-    def __init__(self, storage_path="tasks.json"):
+    def __init__(self, storage_path="tasks.json", stats_check_interval=1000):
         self.storage_path = storage_path
         self.tasks = {}
+        self.statistics = TaskStatistics()
+        # Number of mutations between consistency checks of the counters
+        self.stats_check_interval = stats_check_interval
+        self._mutations_since_check = 0
         self.load()
 
     def load(self):
@@ -54,6 +59,7 @@ class TaskStorage:
                     if isinstance(tasks_data, list):
                         for task in tasks_data:
                             self.tasks[task.id] = task
+                            self.statistics.track(task)
             except Exception as e:
                 print(f"Error loading tasks: {e}")
 
@@ -66,16 +72,39 @@ class TaskStorage:
 
     def add_task(self, task):
         self.tasks[task.id] = task
+        self.reindex_task(task)
         self.save()
         return task.id
 
     def get_task(self, task_id):
         return self.tasks.get(task_id)
 
+    def reindex_task(self, task):
+        """Refresh the counters after a task was added or changed in place."""
+        self.statistics.track(task)
+        self._record_mutation()
+
+    def verify_statistics(self, now=None):
+        """Check the counters against a full recount, rebuilding them on mismatch."""
+        self._mutations_since_check = 0
+        if self.statistics.verify(self.tasks.values(), now or datetime.now()):
+            return True
+        print("Statistics counters out of sync; rebuilding from stored tasks")
+        self.statistics.clear()
+        for task in self.tasks.values():
+            self.statistics.track(task)
+        return False
+
+    def _record_mutation(self):
+        self._mutations_since_check += 1
+        if self.stats_check_interval and self._mutations_since_check >= self.stats_check_interval:
+            self.verify_statistics()
+
     def update_task(self, task_id, **kwargs):
         task = self.get_task(task_id)
         if task:
             task.update(**kwargs)
+            self.reindex_task(task)
             self.save()
             return True
         return False
@@ -83,6 +112,8 @@ class TaskStorage:
     def delete_task(self, task_id):
         if task_id in self.tasks:
             del self.tasks[task_id]
+            self.statistics.untrack(task_id)
+            self._record_mutation()
             self.save()
             return True
         return False
@@ -44,6 +44,7 @@ class TaskManager:
             task = self.storage.get_task(task_id)
             if task:
                 task.mark_as_done()
+                self.storage.reindex_task(task)
                 self.storage.save()
                 return True
         else:
@@ -85,34 +86,15 @@ class TaskManager:
         return False
 
     def get_statistics(self):
-        tasks = self.storage.get_all_tasks()
-        total = len(tasks)
-
-        # Count by status
-        status_counts = {status.value: 0 for status in TaskStatus}
-        for task in tasks:
-            status_counts[task.status.value] += 1
-
-        # Count by priority
-        priority_counts = {priority.name: 0 for priority in TaskPriority}
-        for task in tasks:
-            priority_counts[task.priority.name] += 1
-
-        # Count overdue
-        overdue_count = len([task for task in tasks if task.is_overdue()])
-
-        # Count completed in last 7 days
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        completed_recently = len([
-            task for task in tasks
-            if task.completed_at and task.completed_at >= seven_days_ago
-        ])
+        # Counters are maintained by the storage layer on every mutation
+        stats = self.storage.statistics
+        now = datetime.now()
 
         return {
-            "total": total,
-            "by_status": status_counts,
-            "by_priority": priority_counts,
-            "overdue": overdue_count,
-            "completed_last_week": completed_recently
+            "total": stats.total,
+            "by_status": {status.value: stats.by_status[status] for status in TaskStatus},
+            "by_priority": {priority.name: stats.by_priority[priority] for priority in TaskPriority},
+            "overdue": stats.count_overdue(now),
+            "completed_last_week": stats.count_completed_between(now - timedelta(days=7), now)
         }
 
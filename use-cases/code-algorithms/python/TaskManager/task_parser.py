@@ -1,8 +1,34 @@
+import calendar
 import re
 from datetime import datetime, timedelta
 
 from models import TaskStatus, TaskPriority, Task
 
+# Resolved #date tokens for the current calendar day, keyed by lower-cased
+# token. Unknown tokens are stored as None so they are not re-parsed.
+_date_cache = {}
+_date_cache_day = None
+_DATE_CACHE_MAX_SIZE = 10000
+
+_WEEKDAYS = {
+    'monday': 0, 'mon': 0,
+    'tuesday': 1, 'tue': 1,
+    'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3,
+    'friday': 4, 'fri': 4,
+}
+
+_MONTHS = {}
+for _number in range(1, 13):
+    _MONTHS[calendar.month_name[_number].lower()] = _number
+    _MONTHS[calendar.month_abbr[_number].lower()] = _number
+
+_OFFSET_PATTERN = re.compile(r'\+(\d+)([dwm])')
+
+# A #date token is a word, an offset such as +3d or an ISO date; other
+# punctuation ends the token, as it always has.
+_DATE_TOKEN_PATTERN = re.compile(r'\s#(\+\d+[dwm]\b|\d{4}-\d{2}-\d{2}\b|\w+)')
+
 
 def parse_task_from_text(text):
     """
@@ -17,7 +43,8 @@ def parse_task_from_text(text):
     - @tag adds a tag
     - !N sets priority (1=low, 2=medium, 3=high, 4=urgent)
     - !urgent/!high/!medium/!low sets priority by name
-    - #date sets a due date
+    - #date sets a due date (today, tomorrow, next_week, a weekday, a month
+      name, +3d / +2w / +1m offsets or YYYY-MM-DD)
     """
     # Default task properties
     title = text.strip()
@@ -51,47 +78,18 @@ def parse_task_from_text(text):
             title = re.sub(r'\s@' + tag + r'\b', '', title)
 
     # Extract date markers (#date)
-    date_matches = re.findall(r'\s#(\w+)', text)
+    date_matches = _DATE_TOKEN_PATTERN.findall(text)
     if date_matches:
         # Remove from title
         for date_str in date_matches:
-            title = re.sub(r'\s#' + date_str + r'\b', '', title)
+            title = re.sub(r'\s#' + re.escape(date_str) + r'\b', '', title)
 
         # Try to parse date references
+        now = datetime.now()
         for date_str in date_matches:
-            date_str = date_str.lower()
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-            if date_str in ('today', 'now'):
-                due_date = today
-                break
-            elif date_str == 'tomorrow':
-                due_date = today + timedelta(days=1)
-                break
-            elif date_str in ('next_week', 'nextweek'):
-                due_date = today + timedelta(days=7)
-                break
-            elif date_str in ('monday', 'mon'):
-                due_date = get_next_weekday(today, 0)  # 0 = Monday
-                break
-            elif date_str in ('tuesday', 'tue'):
-                due_date = get_next_weekday(today, 1)
-                break
-            elif date_str in ('wednesday', 'wed'):
-                due_date = get_next_weekday(today, 2)
+            due_date = resolve_date_token(date_str, now)
+            if due_date is not None:
                 break
-            elif date_str in ('thursday', 'thu'):
-                due_date = get_next_weekday(today, 3)
-                break
-            elif date_str in ('friday', 'fri'):
-                due_date = get_next_weekday(today, 4)
-                break
-            # Try to parse as YYYY-MM-DD
-            try:
-                due_date = datetime.strptime(date_str, '%Y-%m-%d')
-                break
-            except ValueError:
-                pass
 
     # Trim excess whitespace from title
     title = re.sub(r'\s+', ' ', title).strip()
@@ -110,3 +108,119 @@ def get_next_weekday(current_date, weekday):
     if days_ahead <= 0:  # Target day already happened this week
         days_ahead += 7
     return current_date + timedelta(days=days_ahead)
+
+
+def _resolve_keyword(date_str, today):
+    """Resolve fixed keywords such as today, tomorrow and next_week."""
+    if date_str in ('today', 'now'):
+        return today
+    if date_str == 'tomorrow':
+        return today + timedelta(days=1)
+    if date_str in ('next_week', 'nextweek'):
+        return today + timedelta(days=7)
+    return None
+
+
+def _resolve_weekday(date_str, today):
+    """Resolve a weekday name to its next occurrence."""
+    if date_str in _WEEKDAYS:
+        return get_next_weekday(today, _WEEKDAYS[date_str])
+    return None
+
+
+def _add_months(current_date, months):
+    """Move a date by whole months, clamping the day to the month's last day."""
+    month_index = current_date.month - 1 + months
+    year = current_date.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(current_date.day, calendar.monthrange(year, month)[1])
+    return current_date.replace(year=year, month=month, day=day)
+
+
+def _resolve_offset(date_str, today):
+    """Resolve relative offsets such as +3d (days), +2w (weeks) or +1m (months)."""
+    match = _OFFSET_PATTERN.fullmatch(date_str)
+    if not match:
+        return None
+    amount = int(match.group(1))
+    if match.group(2) == 'm':
+        return _add_months(today, amount)
+    if match.group(2) == 'w':
+        amount *= 7
+    return today + timedelta(days=amount)
+
+
+def _resolve_month(date_str, today):
+    """Resolve a month name to the first day of its next occurrence."""
+    month = _MONTHS.get(date_str)
+    if month is None:
+        return None
+    # The current month has already started, so it means next year's
+    months_ahead = (month - today.month) % 12 or 12
+    return _add_months(today.replace(day=1), months_ahead)
+
+
+def _resolve_iso_date(date_str, today):
+    """Resolve an absolute YYYY-MM-DD date."""
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+# Resolvers are tried in order; the first one returning a datetime wins.
+DATE_RESOLVERS = [
+    _resolve_keyword,
+    _resolve_weekday,
+    _resolve_offset,
+    _resolve_month,
+    _resolve_iso_date,
+]
+
+
+def register_date_resolver(resolver):
+    """
+    Add a resolver for extra #date tokens.
+
+    The resolver is called as resolver(token, today) with a lower-cased token
+    and today's date at midnight, and returns a datetime or None. It is tried
+    before the built-in YYYY-MM-DD parsing.
+    """
+    DATE_RESOLVERS.insert(len(DATE_RESOLVERS) - 1, resolver)
+    clear_date_cache()
+
+
+def clear_date_cache():
+    """Drop all memoized #date resolutions."""
+    global _date_cache_day
+    _date_cache.clear()
+    _date_cache_day = None
+
+
+def resolve_date_token(date_str, now=None):
+    """
+    Resolve a #date token to a due date, or None if it is not a date.
+
+    Results are memoized per calendar day, so repeated tokens such as
+    #friday or #2025-01-31 are only parsed once a day.
+    """
+    global _date_cache_day
+    if now is None:
+        now = datetime.now()
+    if now.date() != _date_cache_day or len(_date_cache) >= _DATE_CACHE_MAX_SIZE:
+        _date_cache.clear()
+        _date_cache_day = now.date()
+
+    key = date_str.lower()
+    if key in _date_cache:
+        return _date_cache[key]
+
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    due_date = None
+    for resolver in DATE_RESOLVERS:
+        due_date = resolver(key, today)
+        if due_date is not None:
+            break
+
+    _date_cache[key] = due_date
+    return due_date
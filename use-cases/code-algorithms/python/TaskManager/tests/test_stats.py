@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from models import Task, TaskPriority, TaskStatus
+from stats import TaskStatistics
+from storage import TaskStorage
+from task_manager import TaskManager
+
+
+class TaskStatisticsTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.storage_path = os.path.join(self.temp_dir.name, "tasks.json")
+
+    def test_counters_follow_storage_mutations(self):
+        """Test that counters are updated on add, update, done and delete."""
+        task_manager = TaskManager(self.storage_path)
+        first = task_manager.create_task("First", priority_value=3)
+        second = task_manager.create_task("Second", priority_value=1, due_date_str="2020-01-01")
+
+        task_manager.update_task_status(first, "done")
+        task_manager.update_task_priority(second, 4)
+
+        stats = task_manager.get_statistics()
+        self.assertEqual(stats["total"], 2)
+        self.assertEqual(stats["by_status"]["done"], 1)
+        self.assertEqual(stats["by_priority"]["URGENT"], 1)
+        self.assertEqual(stats["by_priority"]["LOW"], 0)
+        self.assertEqual(stats["overdue"], 1)
+        self.assertEqual(stats["completed_last_week"], 1)
+
+        task_manager.delete_task(first)
+        stats = task_manager.get_statistics()
+        self.assertEqual(stats["total"], 1)
+        self.assertEqual(stats["completed_last_week"], 0)
+        self.assertTrue(task_manager.storage.verify_statistics())
+
+    def test_counters_rebuilt_on_load(self):
+        """Test that counters are rebuilt when tasks are loaded from disk."""
+        TaskManager(self.storage_path).create_task("Saved", due_date_str="2020-01-01")
+
+        stats = TaskManager(self.storage_path).get_statistics()
+        self.assertEqual(stats["total"], 1)
+        self.assertEqual(stats["overdue"], 1)
+
+    def test_completed_window(self):
+        """Test the rolling completion window boundaries."""
+        now = datetime(2024, 3, 10, 12, 0)
+        stats = TaskStatistics()
+        for days_ago in (0, 3, 7, 8):
+            task = Task(f"Done {days_ago}")
+            task.status = TaskStatus.DONE
+            task.completed_at = now - timedelta(days=days_ago)
+            stats.track(task)
+
+        self.assertEqual(stats.count_completed_between(now - timedelta(days=7), now), 3)
+
+    def test_verify_statistics_detects_drift(self):
+        """Test that the consistency check rebuilds stale counters."""
+        storage = TaskStorage(self.storage_path)
+        task = Task("Sneaky", priority=TaskPriority.LOW)
+        storage.add_task(task)
+
+        # Mutate without telling the storage
+        task.status = TaskStatus.REVIEW
+
+        self.assertFalse(storage.verify_statistics())
+        self.assertEqual(storage.statistics.by_status[TaskStatus.REVIEW], 1)
+        self.assertTrue(storage.verify_statistics())
+
+
+if __name__ == '__main__':
+    unittest.main()
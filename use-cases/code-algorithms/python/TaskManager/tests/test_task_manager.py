@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+import os
+import tempfile
 from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import Mock, patch
@@ -166,8 +168,10 @@ class TaskManagerTest(unittest.TestCase):
         and returns statistics for tasks, including total count, counts by status
         and priority, overdue tasks, and tasks completed in the last week.
         """
-        # Mock the TaskStorage
-        mock_storage = Mock()
+        # Use a throwaway storage file
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        storage = TaskStorage(os.path.join(temp_dir.name, "tasks.json"))
 
         # Create sample tasks
         task1 = Task("Task 1", "Description 1", TaskPriority.MEDIUM, datetime.now() + timedelta(days=1))
@@ -177,12 +181,13 @@ class TaskManagerTest(unittest.TestCase):
         task3 = Task("Task 3", "Description 3", TaskPriority.LOW, datetime.now() + timedelta(days=2))
         task3.status = TaskStatus.IN_PROGRESS
 
-        # Set up the mock to return the sample tasks
-        mock_storage.get_all_tasks.return_value = [task1, task2, task3]
+        # Add the sample tasks so the storage counters pick them up
+        for task in (task1, task2, task3):
+            storage.add_task(task)
 
-        # Create TaskManager instance with mocked storage
+        # Create TaskManager instance with the temporary storage
         task_manager = TaskManager()
-        task_manager.storage = mock_storage
+        task_manager.storage = storage
 
         # Call the method under test
         result = task_manager.get_statistics()
@@ -209,9 +214,10 @@ class TaskManagerTest(unittest.TestCase):
         Test get_statistics method when the task list is empty.
         This is an edge case where the method should handle having no tasks gracefully.
         """
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
         task_manager = TaskManager()
-        task_manager.storage = Mock()
-        task_manager.storage.get_all_tasks.return_value = []
+        task_manager.storage = TaskStorage(os.path.join(temp_dir.name, "tasks.json"))
 
         stats = task_manager.get_statistics()
 
@@ -3,7 +3,14 @@ from datetime import datetime, timedelta
 from unittest.mock import patch
 
 from models import TaskPriority
-from task_parser import parse_task_from_text, get_next_weekday
+import task_parser
+from task_parser import (
+    parse_task_from_text,
+    get_next_weekday,
+    resolve_date_token,
+    register_date_resolver,
+    clear_date_cache,
+)
 
 
 class TaskParserTest(unittest.TestCase):
@@ -145,6 +152,103 @@ class TaskParserTest(unittest.TestCase):
         self.assertEqual(len(task.tags), 1)
         self.assertIsNotNone(task.due_date)
 
+    def test_parse_task_with_iso_date(self):
+        """Test parsing a task with an absolute YYYY-MM-DD date."""
+        task = parse_task_from_text("Submit report #2025-01-31")
+        self.assertEqual(task.title, "Submit report")
+        self.assertEqual(task.due_date, datetime(2025, 1, 31))
+
+    @patch('task_parser.datetime')
+    def test_parse_task_with_offsets_and_months(self, mock_datetime):
+        """Test parsing relative offsets and month names."""
+        mock_datetime.now.return_value = datetime(2023, 6, 15, 10, 0, 0)
+
+        task = parse_task_from_text("Renew passport #+3d")
+        self.assertEqual(task.title, "Renew passport")
+        self.assertEqual(task.due_date, datetime(2023, 6, 18))
+
+        task = parse_task_from_text("Renew passport #+2w")
+        self.assertEqual(task.due_date, datetime(2023, 6, 29))
+
+        # Month still ahead this year
+        task = parse_task_from_text("Plan holiday #december")
+        self.assertEqual(task.due_date, datetime(2023, 12, 1))
+
+        # Month already passed rolls over to next year
+        task = parse_task_from_text("File taxes #Mar")
+        self.assertEqual(task.due_date, datetime(2024, 3, 1))
+
+    @patch('task_parser.datetime')
+    def test_parse_task_with_month_offsets(self, mock_datetime):
+        """Test that month offsets clamp to the last day of the target month."""
+        mock_datetime.now.return_value = datetime(2024, 1, 31, 10, 0, 0)
+        clear_date_cache()
+
+        task = parse_task_from_text("Pay rent #+1m")
+        self.assertEqual(task.title, "Pay rent")
+        self.assertEqual(task.due_date, datetime(2024, 2, 29))  # leap year
+
+        task = parse_task_from_text("Pay rent #+13m")
+        self.assertEqual(task.due_date, datetime(2025, 2, 28))
+
+        # Month names roll over into the next year
+        task = parse_task_from_text("Plan budget #jan")
+        self.assertEqual(task.due_date, datetime(2025, 1, 1))
+        clear_date_cache()
+
+    def test_parse_date_token_forms(self):
+        """Test which #tokens are read as a whole."""
+        # Offsets and ISO dates are whole tokens
+        task = parse_task_from_text("Call Bob #+3d now")
+        self.assertEqual(task.title, "Call Bob now")
+        self.assertIsNotNone(task.due_date)
+
+        task = parse_task_from_text("Ship it #2025-02-03.")
+        self.assertEqual(task.title, "Ship it.")
+        self.assertEqual(task.due_date, datetime(2025, 2, 3))
+
+        # Other punctuation still ends a word token
+        task = parse_task_from_text("Review #work-items")
+        self.assertEqual(task.title, "Review-items")
+        self.assertIsNone(task.due_date)
+
+        # Malformed offsets are not dates and stay in the title
+        task = parse_task_from_text("Call Bob #+3x")
+        self.assertEqual(task.title, "Call Bob #+3x")
+        self.assertIsNone(task.due_date)
+
+    def test_resolve_date_token_cache(self):
+        """Test that resolutions are memoized per day, including misses."""
+        clear_date_cache()
+        day_one = datetime(2023, 6, 15, 9, 0, 0)
+        self.assertEqual(resolve_date_token("Tomorrow", day_one), datetime(2023, 6, 16))
+        self.assertIsNone(resolve_date_token("someday", day_one))
+        self.assertIn("tomorrow", task_parser._date_cache)
+        self.assertIn("someday", task_parser._date_cache)
+
+        # Cached results are reused within the same day
+        with patch.object(task_parser, 'DATE_RESOLVERS', []):
+            self.assertEqual(resolve_date_token("tomorrow", day_one.replace(hour=18)),
+                             datetime(2023, 6, 16))
+
+        # The cache is rebuilt when the calendar day changes
+        day_two = datetime(2023, 6, 16, 9, 0, 0)
+        self.assertEqual(resolve_date_token("tomorrow", day_two), datetime(2023, 6, 17))
+        self.assertNotIn("someday", task_parser._date_cache)
+
+    def test_register_date_resolver(self):
+        """Test adding a custom #date resolver."""
+        def resolve_eom(date_str, today):
+            if date_str == 'eom':
+                return today.replace(day=28)
+            return None
+
+        with patch.object(task_parser, 'DATE_RESOLVERS', list(task_parser.DATE_RESOLVERS)):
+            register_date_resolver(resolve_eom)
+            self.assertEqual(resolve_date_token("eom", datetime(2023, 6, 15, 9, 0)),
+                             datetime(2023, 6, 28))
+        clear_date_cache()
+
     def test_get_next_weekday(self):
         """Test the get_next_weekday function."""
         # Test when target day is after current day
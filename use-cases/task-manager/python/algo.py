@@ -1,10 +1,13 @@
 """Scoring and ranking helpers for task prioritization in the CLI app."""
 
 from datetime import datetime
+from operator import itemgetter
 
 from .models import TaskPriority, TaskStatus
+from .profiling import timed
 
 
+@timed("algo.calculate_task_score")
 def calculate_task_score(task, current_user_id=None):
     """Calculate a priority score for a task based on multiple factors.
 
@@ -82,6 +85,7 @@ def calculate_task_score(task, current_user_id=None):
 
     return score
 
+@timed("algo.sort_tasks_by_importance")
 def sort_tasks_by_importance(tasks):
     """Sort tasks by calculated importance score (highest first).
 
@@ -104,11 +108,12 @@ def sort_tasks_by_importance(tasks):
     Notes:
         The scoring uses `calculate_task_score()` and is computed once per task.
     """
-    # Calculate scores once and sort by the score
+    # Calculate scores once and sort by the score; equal scores keep their input order
     task_scores = [(calculate_task_score(task), task) for task in tasks]
-    sorted_tasks = [task for _, task in sorted(task_scores, reverse=True)]
+    sorted_tasks = [task for _, task in sorted(task_scores, key=itemgetter(0), reverse=True)]
     return sorted_tasks
 
+@timed("algo.get_top_priority_tasks")
 def get_top_priority_tasks(tasks, limit=5):
     """Return the top N priority tasks.
 
@@ -1,16 +1,32 @@
 """Application layer for task management operations used by the CLI."""
 
 # task_manager/app.py
-import argparse
-from datetime import datetime, timedelta
+import heapq
+from datetime import datetime, time, timedelta
+from itertools import islice
+from .archive import TaskArchive
+from .metrics import watch_storage
 from .models import Task, TaskPriority, TaskStatus
+from .profiling import instrument_methods
 from .storage import TaskStorage
+from .sweeper import AbandonSweeper
 
+@instrument_methods
 class TaskManager:
     """High-level facade for CRUD operations and statistics.
 
     Args:
         storage_path (str): Path to the JSON file used for persistence.
+        sweep_interval (timedelta): Minimum time between auto-abandon sweeps.
+        cache_size (int | None): Hydrated-task cache size; when set, tasks are
+            kept on disk (see `TaskStorage`).
+        archive_after (timedelta | None): Age after which the sweep moves
+            done and abandoned tasks to `<storage_path>.archive/`; None (the
+            default) leaves them in the task file until `archive_tasks()`.
+        refresh_interval (timedelta | None): Minimum time between checks for
+            tasks changed by other processes; None never checks.
+        history (bool): Record every change in the change history under
+            `<storage_path>.history/`; off by default.
 
     Example:
         >>> manager = TaskManager("tasks.json")
@@ -19,14 +35,32 @@ class TaskManager:
 
     Notes:
         This class delegates storage concerns to `TaskStorage` and focuses on
-        validation, formatting, and derived behavior.
+        validation, formatting, and derived behavior. Stale overdue tasks are
+        abandoned by `sweeper`, which write operations trigger at most once per
+        `sweep_interval`; read operations never sweep. With `archive_after`
+        set, the same sweep archives long-finished tasks. Archived tasks are
+        only read back when a caller passes `include_archived=True`. Every
+        operation first picks up tasks changed by other processes, checking
+        the files at most once per `refresh_interval`.
     """
 
-    def __init__(self, storage_path="tasks.json"):
+    def __init__(self, storage_path="tasks.json", sweep_interval=timedelta(hours=1),
+                 cache_size=None, archive_after=None,
+                 refresh_interval=timedelta(seconds=1), history=False):
         """Initialize a `TaskManager` with a storage backend.
 
         Args:
             storage_path (str): File path for persisted tasks.
+            sweep_interval (timedelta): Minimum time between sweeps.
+            cache_size (int | None): Hydrated-task cache size, or None to keep
+                every task in memory.
+            archive_after (timedelta | None): Finished-task age before the
+                sweep archives a task, or None to archive only on request.
+            refresh_interval (timedelta | None): Minimum time between checks
+                for changes written by other processes, or None to never
+                check (see `TaskStorage.refresh()`).
+            history (bool): Record every change in the change history (see
+                `get_task_history()`).
 
         Returns:
             None
@@ -35,37 +69,59 @@ class TaskManager:
             >>> TaskManager("tasks.json")
             ...
         """
-        self.storage = TaskStorage(storage_path)
-
-    def _auto_abandon_overdue(self):
-        """Mark stale, low-priority overdue tasks as abandoned.
+        self.storage = TaskStorage(
+            storage_path, cache_size=cache_size,
+            refresh_interval=refresh_interval.total_seconds() if refresh_interval else None,
+            history=history,
+        )
+        # Kept even without `archive_after` so archive_tasks() output stays readable
+        self.archive = TaskArchive(f"{storage_path}.archive", archive_after or timedelta(days=30))
+        self.sweeper = AbandonSweeper(self.storage, interval=sweep_interval,
+                                      archive=self.archive if archive_after else None)
+        watch_storage(self.storage)
+
+    def sweep_abandoned(self):
+        """Abandon stale, low-priority overdue tasks right away.
 
         Returns:
-            None
+            list[str]: IDs of the tasks that were abandoned.
 
         Notes:
             Tasks that are overdue by more than 7 days and are not high/urgent
-            are automatically moved to `ABANDONED`.
+            are moved to `ABANDONED`. See `AbandonSweeper`.
         """
-        cutoff = datetime.now() - timedelta(days=7)
-        changed = False
+        return self.sweeper.sweep()
 
-        for task in self.storage.get_all_tasks():
-            if task.status in (TaskStatus.DONE, TaskStatus.ABANDONED):
-                continue
-            if not task.due_date or task.due_date >= cutoff:
-                continue
-            if task.priority in (TaskPriority.HIGH, TaskPriority.URGENT):
-                continue
+    def archive_tasks(self, older_than=None):
+        """Archive done and abandoned tasks right away.
 
-            task.update(status=TaskStatus.ABANDONED)
-            changed = True
+        Args:
+            older_than (timedelta | None): Minimum time since the task was
+                finished, defaults to the configured `archive_after`, or 30
+                days when none is configured.
 
-        if changed:
-            self.storage.save()
+        Returns:
+            list[str]: IDs of the archived tasks.
+        """
+        archive = self.archive
+        if older_than is not None:
+            archive = TaskArchive(archive.directory, older_than, archive.segment_size)
+        return archive.archive_from(self.storage)
+
+    def close(self):
+        """Write pending changes and fold the change log into the task file.
+
+        Returns:
+            None
+
+        Notes:
+            Call it when done with the manager, so the task file alone holds
+            every task (see `TaskStorage.close()`). The CLI does so on exit.
+        """
+        self.storage.close()
 
     def create_task(self, title, description="", priority_value=2,
-                   due_date_str=None, tags=None):
+                   due_date_str=None, tags=None, repeat=None):
         """Create a new task and persist it.
 
         Args:
@@ -74,6 +130,9 @@ class TaskManager:
             priority_value (int): Priority value mapped by `TaskPriority`.
             due_date_str (str | None): Due date in YYYY-MM-DD format.
             tags (list[str] | None): Optional list of tag strings.
+            repeat (str | None): Recurrence rule such as "weekly:mon,thu"
+                (see `recurrence`). The task then becomes a series whose
+                first occurrence is due on `due_date_str`, or today.
 
         Returns:
             str | None: The created task ID, or None when parsing fails.
@@ -88,11 +147,13 @@ class TaskManager:
             True
 
         Notes:
-            Invalid `due_date_str` is handled by printing an error and
-            returning None.
+            Invalid `due_date_str` or `repeat` values are handled by printing
+            an error and returning None.
         """
         #There is a magic number here, what does 2 mean? Is it on a scale of 1 to 10, 1 to 5?? Not descriptive enough
         priority = TaskPriority(priority_value)
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
         due_date = None
         if due_date_str:
             try:
@@ -101,52 +162,318 @@ class TaskManager:
                 print("Invalid date format. Use YYYY-MM-DD")
                 return None
 
-        task = Task(title, description, priority, due_date, tags)
+        recurrence = None
+        if repeat:
+            from .recurrence import make_recurrence
+
+            try:
+                recurrence = make_recurrence(repeat, due_date or datetime.combine(datetime.now(), time.min))
+            except ValueError as e:
+                print(e)
+                return None
+            due_date = None
+
+        task = Task(title, description, priority, due_date, tags, recurrence=recurrence)
         task_id = self.storage.add_task(task)
         return task_id
 
-    def list_tasks(self, status_filter=None, priority_filter=None, show_overdue=False):
-        """List tasks with optional filters.
+    def list_tasks(self, status_filter=None, priority_filter=None, show_overdue=False, **filters):
+        """List tasks matching every given filter.
 
         Args:
-            status_filter (str | None): Status value to filter by.
-            priority_filter (int | None): Priority value to filter by.
+            status_filter (str | list[str] | None): Status value(s) to allow.
+            priority_filter (int | None): Exact priority value to filter by.
             show_overdue (bool): If True, only overdue tasks are returned.
+            **filters: Further filters and paging options, see `build_query()`.
 
         Returns:
-            list[Task]: Matching tasks.
+            list[Task]: Matching tasks, or an empty list on invalid input.
 
         Raises:
-            ValueError: If `status_filter` or `priority_filter` is invalid.
+            ValueError: If a status, priority or sort key is invalid.
 
         Example:
             >>> manager = TaskManager("tasks.json")
-            >>> manager.list_tasks()
+            >>> manager.list_tasks(status_filter=["todo", "review"], tags_any=["work"])
             ...
         """
-        self._auto_abandon_overdue()
-        if show_overdue:
-            return self.storage.get_overdue_tasks()
+        return list(self.iter_tasks(status_filter, priority_filter, show_overdue, **filters))
+
+    def iter_tasks(self, *args, include_archived=False, **kwargs):
+        """Lazily yield tasks matching the filters accepted by `build_query()`.
+
+        Args:
+            include_archived (bool): Also read the archive segments.
+
+        Returns:
+            Iterator[Task]: Matching tasks in the requested order.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> first_page = list(manager.iter_tasks(limit=20))
+        """
+        query = self.build_query(*args, **kwargs)
+        if query is not None:
+            yield from self.query_tasks(query, include_archived)
+
+    def build_query(self, status_filter=None, priority_filter=None, show_overdue=False,
+                    min_priority=None, max_priority=None, tags_any=None, tags_all=None,
+                    due_after_str=None, due_before_str=None, text=None,
+                    sort_by="created", reverse=False, limit=None, after_id=None):
+        """Translate CLI-style filter values into a `TaskQuery`.
+
+        Args:
+            status_filter (str | list[str] | None): Status value(s) to allow.
+            priority_filter (int | None): Exact priority value to filter by.
+            show_overdue (bool): If True, only overdue tasks are returned.
+            min_priority (int | None): Lowest allowed priority value.
+            max_priority (int | None): Highest allowed priority value.
+            tags_any (list[str] | None): Tasks must carry at least one tag.
+            tags_all (list[str] | None): Tasks must carry all tags.
+            due_after_str (str | None): Due on or after YYYY-MM-DD.
+            due_before_str (str | None): Due before YYYY-MM-DD.
+            text (str | None): Substring of title or description.
+            sort_by (str): Sort key, see `query.SORT_KEYS`.
+            reverse (bool): Reverse the sort order.
+            limit (int | None): Maximum number of tasks to return.
+            after_id (str | None): Return only tasks after this cursor in
+                the sort order: a cursor printed for the next page (see
+                `query.encode_cursor()`) or the ID of the last task seen.
+
+        Returns:
+            TaskQuery | None: The query, or None when a date or the cursor
+            is invalid.
+
+        Raises:
+            ValueError: If a status, priority or sort key is invalid.
 
-        if status_filter:
-            status = TaskStatus(status_filter)
-            return self.storage.get_tasks_by_status(status)
+        Notes:
+            Filters are combined with AND. See `TaskQuery` for how the most
+            selective storage index is chosen.
+        """
+        from .query import TaskQuery, decode_cursor
 
+        self.storage.maybe_refresh()
+        if isinstance(status_filter, str):
+            status_filter = [status_filter]
         if priority_filter:
-            priority = TaskPriority(priority_filter)
-            return self.storage.get_tasks_by_priority(priority)
+            min_priority = max_priority = priority_filter
+
+        try:
+            due_after = datetime.strptime(due_after_str, "%Y-%m-%d") if due_after_str else None
+            due_before = datetime.strptime(due_before_str, "%Y-%m-%d") if due_before_str else None
+        except ValueError:
+            print("Invalid date format. Use YYYY-MM-DD")
+            return None
+
+        query = TaskQuery(
+            statuses=[TaskStatus(value) for value in status_filter] if status_filter else None,
+            min_priority=TaskPriority(min_priority) if min_priority else None,
+            max_priority=TaskPriority(max_priority) if max_priority else None,
+            tags_any=tags_any,
+            tags_all=tags_all,
+            due_after=due_after,
+            due_before=due_before,
+            overdue=show_overdue,
+            text=text,
+            sort_by=sort_by,
+            reverse=reverse,
+            limit=limit,
+        )
+        if after_id and "," in after_id:
+            try:
+                query.after = decode_cursor(after_id, sort_by)
+            except ValueError:
+                print(f"Invalid cursor: {after_id}")
+                return None
+        elif after_id:
+            cursor_task = self._get_task_or_occurrence(after_id)
+            if cursor_task is None:
+                cursor_task = self.archive.get_task(after_id)
+            if cursor_task is None:
+                print(f"Unknown cursor task: {after_id}")
+                return None
+            query.after = query.cursor_for(cursor_task)
+        return query
 
-        return self.storage.get_all_tasks()
+    def query_tasks(self, query, include_archived=False):
+        """Run a prepared `TaskQuery`.
+
+        Args:
+            query (TaskQuery): Query to execute.
+            include_archived (bool): Merge in matching archived tasks.
+
+        Returns:
+            Iterator[Task]: Matching tasks in the query's sort order.
+
+        Notes:
+            Archived tasks are not indexed, so including them scans every
+            archive segment.
+        """
+        self.storage.maybe_refresh()
+        streams = [query.iter_results(self.storage)]
+        now = datetime.now()
+        end = query.due_before
+        if query.overdue:
+            end = min(end, now) if end else now
+        if end is not None and self.storage.recurring_ids():
+            streams.append(query.select(self.iter_occurrences(query.due_after, end), now))
+        if include_archived:
+            streams.append(query.select(
+                task for task in self.archive.iter_tasks() if task.id not in self.storage.tasks
+            ))
+        if len(streams) == 1:
+            return streams[0]
+        merged = heapq.merge(*streams, key=query.cursor_for, reverse=query.reverse)
+        return islice(merged, query.limit) if query.limit is not None else merged
+
+    def iter_occurrences(self, start=None, end=None):
+        """Lazily expand recurring tasks into their occurrences.
+
+        Args:
+            start (datetime | None): Earliest due date, defaults to each
+                series' first occurrence.
+            end (datetime | None): Exclusive latest due date; None keeps
+                yielding forever.
+
+        Returns:
+            Iterator[Task]: Occurrences of every open series, earliest due
+            first (see `recurrence.iter_occurrences()`).
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> next_week = list(manager.iter_occurrences(datetime.now(), datetime.now() + timedelta(days=7)))
+
+        Notes:
+            Series are found through the storage index of recurring tasks
+            and each one yields its dates one at a time, so only the
+            occurrences that are consumed are ever built.
+        """
+        from .recurrence import iter_occurrences
+
+        with self.storage.lock:
+            series = [self.storage.get_task(task_id) for task_id in self.storage.recurring_ids()]
+        streams = [
+            iter_occurrences(task, start, end) for task in series
+            if task.status not in (TaskStatus.DONE, TaskStatus.ABANDONED)
+        ]
+        return heapq.merge(*streams, key=lambda task: task.due_date)
+
+    def _get_task_or_occurrence(self, task_id):
+        task = self.storage.get_task(task_id)
+        if task is None and "@" in task_id:
+            from .recurrence import get_occurrence, parse_occurrence_id
+
+            parsed = parse_occurrence_id(task_id)
+            series = self.storage.get_task(parsed[0]) if parsed else None
+            if series is not None and series.recurrence is not None:
+                return get_occurrence(series, parsed[1])
+        return task
+
+    def resolve_task_id(self, task_id):
+        """Expand a short task ID prefix to the full ID.
+
+        Args:
+            task_id (str): Full ID or unique prefix (for example the 8
+                characters shown by the CLI).
+
+        Returns:
+            str | None: The full task ID, or None when no task matches.
+
+        Raises:
+            AmbiguousTaskIdError: If the prefix matches several tasks.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> manager.resolve_task_id("3f2a9c1e")
+            ...
+        """
+        self.storage.maybe_refresh()
+        prefix, separator, day = task_id.partition("@")
+        if separator:
+            series_id = self.storage.resolve_task_id(prefix)
+            return f"{series_id}@{day}" if series_id else None
+        return self.storage.resolve_task_id(task_id)
+
+    def search(self, query, limit=10, include_archived=False):
+        """Find tasks by words in their title or description.
+
+        Args:
+            query (str): Search text; every word must match.
+            limit (int): Maximum number of results.
+            include_archived (bool): Fill remaining places with matching
+                archived tasks.
+
+        Returns:
+            list[Task]: Matching tasks ranked by relevance, tasks from the
+            task file first.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> manager.search("quarterly report", limit=5)
+            ...
+        """
+        self.storage.maybe_refresh()
+        tasks = self.storage.search(query, limit)
+        if include_archived and len(tasks) < limit:
+            tasks += self.archive.search(query, limit - len(tasks), exclude=self.storage.tasks)
+        return tasks
+
+    def export_tasks(self, out, fmt="ndjson", timestamps="iso"):
+        """Stream every task to `out` as NDJSON or CSV.
+
+        Args:
+            out (TextIO): Writable text stream.
+            fmt (str): "ndjson" or "csv".
+            timestamps (str): "iso" or "epoch".
+
+        Returns:
+            int: Number of exported tasks.
+
+        Raises:
+            ValueError: If `fmt` or `timestamps` is unknown.
+
+        Example:
+            >>> import sys
+            >>> TaskManager("tasks.json").export_tasks(sys.stdout, "csv")
+            ...
+        """
+        from .transfer import export_tasks
+
+        self.storage.maybe_refresh()
+        return export_tasks(self.storage.iter_tasks(), out, fmt, timestamps)
+
+    def import_tasks(self, source, fmt="ndjson", batch_size=1000):
+        """Stream tasks from NDJSON or CSV into storage.
+
+        Args:
+            source (TextIO): Readable text stream.
+            fmt (str): "ndjson" or "csv".
+            batch_size (int): Tasks added to storage per batch.
+
+        Returns:
+            dict: Import counts and throughput, see `transfer.import_tasks()`.
+
+        Raises:
+            ValueError: If `fmt` is unknown.
+        """
+        from .transfer import import_tasks
+
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
+        return import_tasks(self.storage, source, fmt, batch_size)
 
     def update_task_status(self, task_id, new_status_value):
         """Update a task's status.
 
         Args:
-            task_id (str): Task ID.
+            task_id (str): Task ID, or an occurrence ID ("<series id>@<date>")
+                to record the status of one occurrence of a recurring task.
             new_status_value (str): New status value.
 
         Returns:
-            bool: True when updated, False when not found.
+            bool: True when updated, False when not found or when another
+            process changed the same fields first.
 
         Raises:
             ValueError: If `new_status_value` is invalid.
@@ -157,11 +484,23 @@ class TaskManager:
             False
         """
         new_status = TaskStatus(new_status_value)
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
+        occurrence = self._get_task_or_occurrence(task_id) if "@" in task_id else None
+        if occurrence is not None:
+            series = self.storage.get_task(occurrence.series_id)
+            if series.set_occurrence_status(occurrence.due_date.date(), new_status):
+                self.storage.reindex_task(series, text_changed=False)
+                self.storage.save()
+            return True
         if new_status == TaskStatus.DONE:
             task = self.storage.get_task(task_id)
             if task:
-                task.mark_as_done()
-                self.storage.save()
+                if task.status != TaskStatus.DONE:
+                    task.mark_as_done()
+                    self.storage.reindex_task(task)
+                    self.storage.save()
+                    return not self.storage.autosave or task_id not in self.storage.conflicts
                 return True
         else:
             return self.storage.update_task(task_id, status=new_status)
@@ -174,7 +513,8 @@ class TaskManager:
             new_priority_value (int): Priority value.
 
         Returns:
-            bool: True when updated, False when not found.
+            bool: True when updated, False when not found or when another
+            process changed the same fields first.
 
         Raises:
             ValueError: If `new_priority_value` is invalid.
@@ -185,6 +525,8 @@ class TaskManager:
             False
         """
         new_priority = TaskPriority(new_priority_value)
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
         return self.storage.update_task(task_id, priority=new_priority)
 
     def update_task_due_date(self, task_id, due_date_str):
@@ -207,6 +549,8 @@ class TaskManager:
         """
         try:
             due_date = datetime.strptime(due_date_str, "%Y-%m-%d")
+            self.storage.maybe_refresh()
+            self.sweeper.maybe_sweep()
             return self.storage.update_task(task_id, due_date=due_date)
         except ValueError:
             print("Invalid date format. Use YYYY-MM-DD")
@@ -226,24 +570,62 @@ class TaskManager:
             >>> manager.delete_task("id")
             False
         """
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
         return self.storage.delete_task(task_id)
 
     def get_task_details(self, task_id):
-        """Retrieve a task by ID after applying auto-abandon logic.
+        """Retrieve a task by ID.
 
         Args:
-            task_id (str): Task ID.
+            task_id (str): Task ID or occurrence ID ("<series id>@<date>").
 
         Returns:
-            Task | None: The task if found, otherwise None.
+            Task | None: The task or occurrence if found, otherwise None.
 
         Example:
             >>> manager = TaskManager("tasks.json")
             >>> manager.get_task_details("id") is None
             True
         """
-        self._auto_abandon_overdue()
-        return self.storage.get_task(task_id)
+        self.storage.maybe_refresh()
+        return self._get_task_or_occurrence(task_id)
+
+    def get_task_history(self, task_id):
+        """List the recorded changes of a task, oldest first.
+
+        Args:
+            task_id (str): Task ID; deleted tasks keep their history.
+
+        Returns:
+            list[dict]: History entries (see `TaskHistory.revisions()`), or an
+            empty list when the task has none or history is disabled.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> manager.get_task_history("id")
+            []
+        """
+        if self.storage.history is None:
+            return []
+        with self.storage.lock:
+            return self.storage.history.revisions(task_id)
+
+    def get_task_revision(self, task_id, revision):
+        """Rebuild a task as it was at an earlier revision.
+
+        Args:
+            task_id (str): Task ID.
+            revision (int): Revision number from `get_task_history()`.
+
+        Returns:
+            Task | None: The task at that revision, or None when the revision
+            is unknown or the task was deleted by then.
+        """
+        if self.storage.history is None:
+            return None
+        with self.storage.lock:
+            return self.storage.history.task_at(task_id, revision)
 
     def add_tag_to_task(self, task_id, tag):
         """Add a tag to a task if it is not already present.
@@ -260,10 +642,12 @@ class TaskManager:
             >>> manager.add_tag_to_task("id", "urgent")
             False
         """
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
         task = self.storage.get_task(task_id)
         if task:
-            if tag not in task.tags:
-                task.tags.append(tag)
+            if task.add_tag(tag):
+                self.storage.reindex_task(task)
                 self.storage.save()
             return True
         return False
@@ -283,13 +667,130 @@ class TaskManager:
             >>> manager.remove_tag_from_task("id", "urgent")
             False
         """
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
         task = self.storage.get_task(task_id)
-        if task and tag in task.tags:
-            task.tags.remove(tag)
+        if task and task.remove_tag(tag):
+            self.storage.reindex_task(task)
             self.storage.save()
             return True
         return False
 
+    def add_dependency(self, task_id, blocker_id):
+        """Mark a task as blocked until another task is finished.
+
+        Args:
+            task_id (str): Task that has to wait.
+            blocker_id (str): Task that must be done or abandoned first.
+
+        Returns:
+            bool: True when recorded, False when a task is not found or the
+            dependency would create a cycle.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> manager.add_dependency("id", "other-id")
+            False
+
+        Notes:
+            A cycle is reported by printing an error.
+        """
+        from .depgraph import DependencyCycleError
+
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
+        try:
+            return self.storage.add_dependency(task_id, blocker_id)
+        except DependencyCycleError as e:
+            print(e)
+            return False
+
+    def remove_dependency(self, task_id, blocker_id):
+        """Stop a task from waiting for another.
+
+        Args:
+            task_id (str): Blocked task.
+            blocker_id (str): Blocking task.
+
+        Returns:
+            bool: True when removed, False when the dependency is not found.
+        """
+        self.storage.maybe_refresh()
+        self.sweeper.maybe_sweep()
+        return self.storage.remove_dependency(task_id, blocker_id)
+
+    def ready_tasks(self, limit=10, due_before=None):
+        """List the most important tasks that can be started now.
+
+        Args:
+            limit (int | None): Maximum number of tasks, None for all.
+            due_before (datetime | None): Also rank the open occurrences of
+                ready recurring tasks due from the start of today until this
+                time.
+
+        Returns:
+            list[Task]: Open tasks with no open blocker, ordered by
+            `sort_tasks_by_importance()`. Recurring tasks are represented
+            by their occurrences, never by the series itself.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> isinstance(manager.ready_tasks(limit=5), list)
+            True
+
+        Notes:
+            Only the ready set kept by storage is scored, never the whole
+            task list or dependency graph.
+        """
+        from .algo import sort_tasks_by_importance
+
+        self.storage.maybe_refresh()
+        with self.storage.lock:
+            ready_ids = self.storage.ready_ids()
+            tasks = [self.storage.get_task(task_id) for task_id in ready_ids - self.storage.recurring_ids()]
+            ready_series = ready_ids & self.storage.recurring_ids()
+        if due_before is not None and ready_series:
+            today = datetime.combine(datetime.now().date(), time.min)
+            tasks.extend(
+                task for task in self.iter_occurrences(today, due_before)
+                if task.series_id in ready_series and task.status == TaskStatus.TODO
+            )
+        ranked = sort_tasks_by_importance(tasks)
+        return ranked if limit is None else ranked[:limit]
+
+    def notify_due_dates(self, on_due_soon=None, on_overdue=None, on_abandon=None,
+                         due_soon=timedelta(hours=1)):
+        """Create a notifier that calls back as tasks reach their due dates.
+
+        Args:
+            on_due_soon (Callable[[str, datetime], None] | None): Called with
+                the task ID and due date `due_soon` before a task is due.
+            on_overdue (Callable[[str, datetime], None] | None): Called when a
+                task becomes overdue.
+            on_abandon (Callable[[str, datetime], None] | None): Called when
+                the sweeper would abandon a task.
+            due_soon (timedelta): Warning time before the due date.
+
+        Returns:
+            DueDateNotifier: Notifier watching this manager's storage; run it
+            with `start()` or `run_async()` and release it with `close()`.
+
+        Example:
+            >>> manager = TaskManager("tasks.json")
+            >>> notifier = manager.notify_due_dates(on_overdue=print)
+            >>> notifier.start()
+
+        Notes:
+            Occurrences of recurring tasks are not notified; their series
+            has no due date.
+        """
+        from .notifier import DueDateNotifier
+
+        return DueDateNotifier(
+            self.storage, on_due_soon, on_overdue, on_abandon,
+            due_soon=due_soon, grace_period=self.sweeper.grace_period,
+        )
+
     def get_statistics(self):
         """Compute aggregate statistics across all tasks.
 
@@ -303,37 +804,38 @@ class TaskManager:
             True
 
         Notes:
-            Status and priority counts include all tasks in storage.
+            Status and priority counts include all tasks in storage, with a
+            recurring task counted once as its series. The other values are
+            read from the counters kept by `TaskStorage`, so no task list is
+            scanned here. Occurrences of recurring tasks count towards
+            `overdue` and `completed_last_week` as they do in listings; they
+            are counted from the few series and their exceptions alone,
+            without building the occurrences.
         """
-        self._auto_abandon_overdue()
-        tasks = self.storage.get_all_tasks()
-        total = len(tasks)
-
-        # Count by status
-        status_counts = {status.value: 0 for status in TaskStatus}
-        for task in tasks:
-            status_counts[task.status.value] += 1
-
-        # Count by priority
-        priority_counts = {priority.value: 0 for priority in TaskPriority}
-        for task in tasks:
-            priority_counts[task.priority.value] += 1
-
-        # Count overdue
-        overdue_count = len([task for task in tasks if task.is_overdue()])
-
-        # Count completed in last 7 days
-        seven_days_ago = datetime.now() - timedelta(days=7)
-        completed_recently = len([
-            task for task in tasks
-            if task.completed_at and task.completed_at >= seven_days_ago
-        ])
+        from .recurrence import count_open_occurrences, iter_completions
+
+        self.storage.maybe_refresh()
+        stats = self.storage.statistics
+        now = datetime.now()
+        week_ago = now - timedelta(days=7)
+        overdue = stats.count_overdue(now)
+        completed = stats.count_completed_between(week_ago, now)
+        if self.storage.recurring_ids():
+            with self.storage.lock:
+                series = [self.storage.get_task(task_id) for task_id in self.storage.recurring_ids()]
+            overdue += sum(
+                count_open_occurrences(task, now) for task in series
+                if task.status not in (TaskStatus.DONE, TaskStatus.ABANDONED)
+            )
+            completed += sum(
+                1 for task in series for completed_at in iter_completions(task) if week_ago <= completed_at <= now
+            )
 
         return {
-            "total": total,
-            "by_status": status_counts,
-            "by_priority": priority_counts,
-            "overdue": overdue_count,
-            "completed_last_week": completed_recently
+            "total": stats.total,
+            "by_status": {status.value: stats.by_status[status] for status in TaskStatus},
+            "by_priority": {priority.value: stats.by_priority[priority] for priority in TaskPriority},
+            "overdue": overdue,
+            "completed_last_week": completed,
         }
 
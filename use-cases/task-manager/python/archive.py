@@ -0,0 +1,196 @@
+"""Cold storage for finished tasks in compressed archive segments."""
+
+# task_manager/archive.py
+# gzip and the record codecs are imported where segments are read or written,
+# so constructing a TaskArchive costs nothing on the CLI's startup path.
+import os
+from datetime import datetime, timedelta
+
+from .metrics import registry as metrics
+from .models import TaskStatus
+
+ARCHIVED_STATUSES = (TaskStatus.DONE, TaskStatus.ABANDONED)
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".ndjson.gz"
+DEFAULT_SEGMENT_SIZE = 10000
+
+
+class TaskArchive:
+    """Move long-finished tasks out of the working set into archive segments.
+
+    Segments are gzip-compressed NDJSON files (see `transfer.py`) written
+    once and never modified, so the hot task file only holds tasks that can
+    still change.
+
+    Args:
+        directory (str): Folder holding the segments, created on first write.
+        archive_after (timedelta): How long a task must have been done or
+            abandoned before it is archived.
+        segment_size (int): Maximum number of tasks per segment.
+
+    Example:
+        >>> from .storage import TaskStorage
+        >>> archive = TaskArchive("tasks.json.archive")
+        >>> archive.archive_from(TaskStorage("tasks.json"))
+        []
+
+    Notes:
+        The age of a task is measured from `completed_at`, or `updated_at`
+        when it was never completed (abandoned tasks). A segment is written
+        before its tasks leave the hot store, so a crash in between leaves a
+        task in both places rather than in neither; readers prefer the hot
+        copy.
+    """
+
+    def __init__(self, directory, archive_after=timedelta(days=30),
+                 segment_size=DEFAULT_SEGMENT_SIZE):
+        """Initialize the archive.
+
+        Returns:
+            None
+        """
+        self.directory = directory
+        self.archive_after = archive_after
+        self.segment_size = segment_size
+
+    def segments(self):
+        """List segment files, oldest first.
+
+        Returns:
+            list[str]: Paths of the archive segments.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def candidates(self, storage, now=None):
+        """Find stored tasks old enough to archive.
+
+        Args:
+            storage (TaskStorage): Hot storage.
+            now (datetime | None): Reference time, defaults to now.
+
+        Returns:
+            list[Task]: Done or abandoned tasks finished before the cutoff.
+        """
+        cutoff = (now or datetime.now()) - self.archive_after
+        with storage.lock:
+            task_ids = set().union(*(storage.ids_by_status(status) for status in ARCHIVED_STATUSES))
+            tasks = [storage.get_task(task_id) for task_id in task_ids]
+        return [task for task in tasks if (task.completed_at or task.updated_at) < cutoff]
+
+    def archive_from(self, storage, now=None):
+        """Archive every eligible task and remove it from `storage`.
+
+        Args:
+            storage (TaskStorage): Hot storage.
+            now (datetime | None): Reference time, defaults to now.
+
+        Returns:
+            list[str]: IDs of the archived tasks.
+        """
+        now = now or datetime.now()
+        with storage.lock:
+            tasks = self.candidates(storage, now)
+            if not tasks:
+                return []
+            for start in range(0, len(tasks), self.segment_size):
+                self._write_segment(tasks[start:start + self.segment_size], now)
+            task_ids = [task.id for task in tasks]
+            storage.delete_tasks(task_ids)
+            # The point of archiving is a smaller task file, so rewrite it now
+            storage.compact()
+        metrics.inc("archived_tasks_total", len(task_ids))
+        return task_ids
+
+    def _write_segment(self, tasks, now):
+        import gzip
+
+        from .transfer import export_tasks
+
+        os.makedirs(self.directory, exist_ok=True)
+        stem = f"{SEGMENT_PREFIX}{now:%Y%m%dT%H%M%S}"
+        sequence = 0
+        path = os.path.join(self.directory, f"{stem}-{sequence:04d}{SEGMENT_SUFFIX}")
+        while os.path.exists(path):
+            sequence += 1
+            path = os.path.join(self.directory, f"{stem}-{sequence:04d}{SEGMENT_SUFFIX}")
+        temp_path = f"{path}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as out:
+            export_tasks(tasks, out, "ndjson")
+        os.replace(temp_path, path)
+        return path
+
+    def _iter_records(self, paths):
+        import gzip
+
+        from .transfer import iter_records
+
+        for path in paths:
+            with gzip.open(path, "rt", encoding="utf-8") as source:
+                for _, record, error in iter_records(source):
+                    if error is None:
+                        yield record
+
+    def iter_tasks(self):
+        """Lazily yield every archived task, one segment at a time.
+
+        Yields:
+            Task: Archived tasks in the order they were archived.
+        """
+        from .transfer import record_to_task
+
+        for record in self._iter_records(self.segments()):
+            yield record_to_task(record)
+
+    def get_task(self, task_id):
+        """Look up one archived task by its full ID.
+
+        Args:
+            task_id (str): Task ID.
+
+        Returns:
+            Task | None: The archived task, or None when it is not archived.
+
+        Notes:
+            Scans the segments, newest first.
+        """
+        from .transfer import record_to_task
+
+        for record in self._iter_records(reversed(self.segments())):
+            if record.get("id") == task_id:
+                return record_to_task(record)
+        return None
+
+    def search(self, query, limit=10, exclude=()):
+        """Full-text search over the archived tasks.
+
+        Args:
+            query (str): Words to look for; all must match.
+            limit (int): Maximum number of tasks to return.
+            exclude (Container[str]): IDs to skip, such as tasks that are
+                also in the hot store.
+
+        Returns:
+            list[Task]: Matching tasks, best match first.
+
+        Notes:
+            The archive has no persistent index; a temporary `TextIndex` is
+            built over the segments for each search.
+        """
+        from .search import TextIndex
+
+        index = TextIndex()
+        for task in self.iter_tasks():
+            if task.id not in exclude:
+                index.update(task)
+        task_ids = index.search(query, limit)
+        if not task_ids:
+            return []
+        wanted = set(task_ids)
+        found = {task.id: task for task in self.iter_tasks() if task.id in wanted}
+        return [found[task_id] for task_id in task_ids]
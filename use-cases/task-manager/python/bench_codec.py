@@ -0,0 +1,94 @@
+"""Encode/decode benchmark for the task file codecs.
+
+Compares the previous `json` + `TaskEncoder`/`TaskDecoder` path (indented)
+with `TaskCodec` on each available backend. Run it from `use-cases/task-manager`:
+
+    python -m python.bench_codec --tasks 100000 1000000
+
+Each cell is the best of `--repeat` runs; sizes are the encoded bytes.
+"""
+
+# task_manager/bench_codec.py
+import argparse
+import gc
+import json
+import time
+from datetime import datetime, timedelta
+
+from .codec import BACKENDS, TaskCodec, orjson
+from .models import Task, TaskPriority
+from .storage import TaskDecoder, TaskEncoder
+
+
+def build_tasks(count):
+    """Generate `count` tasks with every field populated.
+
+    Args:
+        count (int): Number of tasks.
+
+    Returns:
+        list[Task]: Generated tasks.
+    """
+    now = datetime.now()
+    tasks = []
+    for i in range(count):
+        task = Task(f"Task {i}", f"Generated description {i}", TaskPriority(i % 4 + 1),
+                    now + timedelta(days=i % 60 - 30), [f"tag{i % 10}", "bench"])
+        if i % 3 == 0:
+            task.mark_as_done()
+        tasks.append(task)
+    return tasks
+
+
+def best_time(func, repeat):
+    """Return the fastest of `repeat` runs of `func` in seconds, and its last result."""
+    best = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def codecs():
+    """Yield `(label, encode, decode)` for the old path and each backend."""
+    yield (
+        "json indent=2 (TaskEncoder)",
+        lambda tasks: json.dumps(tasks, cls=TaskEncoder, indent=2).encode("utf-8"),
+        lambda data: json.loads(data, cls=TaskDecoder),
+    )
+    for backend in BACKENDS:
+        if backend == "orjson" and orjson is None:
+            continue
+        codec = TaskCodec(backend)
+        yield f"TaskCodec({backend})", codec.encode_tasks, codec.decode_tasks
+
+
+def main():
+    """Run the benchmark and print one line per codec and task count.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Task codec encode/decode benchmark")
+    parser.add_argument("--tasks", help="Task counts to test", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--repeat", help="Runs per measurement", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'codec':<30} {'tasks':>9} {'encode s':>9} {'decode s':>9} {'MB':>8}")
+    for count in args.tasks:
+        tasks = build_tasks(count)
+        for label, encode, decode in codecs():
+            encode_seconds, data = best_time(lambda tasks=tasks: encode(tasks), args.repeat)
+            decode_seconds, _ = best_time(lambda data=data: len(decode(data)), args.repeat)
+            print(f"{label:<30} {count:>9} {encode_seconds:>9.3f} {decode_seconds:>9.3f} "
+                  f"{len(data) / 1e6:>8.1f}")
+            del data
+        del tasks
+
+
+if __name__ == "__main__":
+    main()
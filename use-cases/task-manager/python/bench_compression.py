@@ -0,0 +1,81 @@
+"""CPU-versus-I/O benchmark for compressed task files.
+
+Saves and loads the same generated tasks as plain JSON and with every
+installed compressor, then estimates how long copying the file takes at the
+given link speeds (backups, sync). Run it from `use-cases/task-manager`:
+
+    python -m python.bench_compression --tasks 100000 --mbps 100 1000
+
+A compressor pays off when its extra save/load time is smaller than the
+transfer time it saves.
+"""
+
+# task_manager/bench_compression.py
+import argparse
+import os
+import tempfile
+import time
+
+from .bench_codec import build_tasks
+from .compression import EXTENSIONS, is_available
+from .storage import TaskStorage
+
+
+def measure(path, tasks):
+    """Save `tasks` to `path` and load them back.
+
+    Args:
+        path (str): Task file; its extension selects the compressor.
+        tasks (list[Task]): Tasks to store.
+
+    Returns:
+        tuple[float, float, int]: Save seconds, load seconds, file size.
+    """
+    storage = TaskStorage(path)
+    storage.autosave = False
+    storage.add_tasks(tasks)
+    start = time.perf_counter()
+    storage.commit()
+    save_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TaskStorage(path)
+    load_seconds = time.perf_counter() - start
+    return save_seconds, load_seconds, os.path.getsize(path)
+
+
+def main():
+    """Run the benchmark and print one line per file format.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Compressed task file benchmark")
+    parser.add_argument("--tasks", help="Number of generated tasks", type=int, default=100000)
+    parser.add_argument("--mbps", help="Link speeds in Mbit/s for the transfer estimate", type=float,
+                        nargs="+", default=[100.0, 1000.0])
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.tasks)
+    formats = [""] + [ext for ext, (name, _) in EXTENSIONS.items() if is_available(name)]
+    skipped = [name for name, _ in EXTENSIONS.values() if not is_available(name)]
+    transfer_headers = "".join(f" {f'{mbps:g} Mb/s s':>12}" for mbps in args.mbps)
+    print(f"{args.tasks} tasks; transfer = save + copy at link speed"
+          + (f" (not installed: {', '.join(skipped)})" if skipped else ""))
+    print(f"{'file':<16} {'MB':>8} {'ratio':>6} {'save s':>8} {'load s':>8}{transfer_headers}")
+
+    plain_size = None
+    with tempfile.TemporaryDirectory() as workdir:
+        for extension in formats:
+            name = f"tasks.json{extension}"
+            save_seconds, load_seconds, size = measure(os.path.join(workdir, name), tasks)
+            plain_size = plain_size or size
+            transfers = "".join(
+                f" {save_seconds + size * 8 / (mbps * 1e6):>12.2f}" for mbps in args.mbps
+            )
+            print(f"{name:<16} {size / 1e6:>8.1f} {plain_size / size:>6.1f} "
+                  f"{save_seconds:>8.2f} {load_seconds:>8.2f}{transfers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Throughput of concurrent writer processes sharing one task file.
+
+Each writer process opens its own `TaskStorage` on the same file and commits
+one change per operation: every other operation creates a task, the rest
+update one of a few shared tasks so that writers collide. Run it from
+`use-cases/task-manager`:
+
+    python -m python.bench_concurrency --processes 1 2 4 8 --operations 200
+
+Afterwards every created task must be in the file (no lost updates).
+"""
+
+# task_manager/bench_concurrency.py
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from .models import Task
+from .storage import TaskStorage
+
+
+def _writer(path, worker, operations, shared_ids, start, results):
+    # Conflicts are counted below; their messages would flood the report
+    sys.stdout = open(os.devnull, "w")
+    storage = TaskStorage(path)
+    created = []
+    conflicts = 0
+    start.wait()
+    for i in range(operations):
+        if i % 2 == 0:
+            created.append(storage.add_task(Task(f"Worker {worker} task {i}")))
+        else:
+            storage.update_task(shared_ids[i % len(shared_ids)], description=f"Worker {worker} op {i}")
+        conflicts += len(storage.conflicts)
+    results.put((created, conflicts, storage.full_reloads))
+
+
+def run_writers(path, processes, operations, shared_tasks=4):
+    """Run writer processes against one task file and check the result.
+
+    Args:
+        path (str): Task file, created with `shared_tasks` tasks.
+        processes (int): Number of writer processes.
+        operations (int): Commits per process.
+        shared_tasks (int): Tasks that all writers update.
+
+    Returns:
+        dict: `seconds`, `commits_per_second`, `conflicts`, `full_reloads`
+        and `lost`, the number of created tasks missing from the file.
+    """
+    storage = TaskStorage(path)
+    shared_ids = [storage.add_task(Task(f"Shared {i}")) for i in range(shared_tasks)]
+
+    context = multiprocessing.get_context()
+    start = context.Event()
+    results = context.Queue()
+    workers = [
+        context.Process(target=_writer, args=(path, worker, operations, shared_ids, start, results))
+        for worker in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    started = time.perf_counter()
+    start.set()
+    outcomes = [results.get() for _ in workers]
+    seconds = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    stored = TaskStorage(path).tasks
+    created = [task_id for ids, _, _ in outcomes for task_id in ids]
+    return {
+        "seconds": seconds,
+        "commits_per_second": processes * operations / seconds,
+        "conflicts": sum(conflicts for _, conflicts, _ in outcomes),
+        "full_reloads": sum(reloads for _, _, reloads in outcomes),
+        "lost": sum(1 for task_id in created if task_id not in stored),
+    }
+
+
+def main():
+    """Run the harness for each process count and print one line per run.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Concurrent writer benchmark")
+    parser.add_argument("--processes", help="Writer process counts", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--operations", help="Commits per process", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'processes':>9} {'commits/s':>10} {'seconds':>8} {'conflicts':>9} {'reloads':>8} {'lost':>5}")
+    for processes in args.processes:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run_writers(os.path.join(workdir, "tasks.json"), processes, args.operations)
+        print(f"{processes:>9} {result['commits_per_second']:>10.0f} {result['seconds']:>8.2f} "
+              f"{result['conflicts']:>9} {result['full_reloads']:>8} {result['lost']:>5}")
+
+
+if __name__ == "__main__":
+    main()
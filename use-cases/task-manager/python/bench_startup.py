@@ -0,0 +1,95 @@
+"""Cold-start benchmark for the CLI subcommands.
+
+Runs each subcommand in a fresh interpreter against a generated task file and
+reports the median wall-clock time. Run it from `use-cases/task-manager`:
+
+    python -m python.bench_startup --tasks 5000 --repeat 7
+
+Compare the numbers before and after a change to catch startup regressions.
+`python -X importtime -m python.cli <command>` shows where the time goes.
+"""
+
+# task_manager/bench_startup.py
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PACKAGE_PARENT = Path(__file__).resolve().parents[1]
+
+SUBCOMMANDS = [
+    ["--help"],
+    ["show", "{task_id}"],
+    ["show", "{short_id}"],
+    ["list", "-n", "20"],
+    ["list", "-t", "tag1", "--sort", "due", "-n", "20"],
+    ["search", "task 42"],
+    ["stats"],
+]
+
+
+def build_task_file(path, count):
+    """Write `count` generated tasks to `path` and return one task ID.
+
+    Args:
+        path (str): Storage file to create.
+        count (int): Number of tasks.
+
+    Returns:
+        str: ID of one of the generated tasks.
+    """
+    from datetime import datetime, timedelta
+
+    from .models import Task, TaskPriority
+    from .storage import TaskStorage
+
+    storage = TaskStorage(path)
+    storage.autosave = False
+    now = datetime.now()
+    for i in range(count):
+        task = Task(f"Task {i}", f"Generated description {i}", TaskPriority(i % 4 + 1),
+                    now + timedelta(days=i % 60 - 30), [f"tag{i % 10}"])
+        storage.add_task(task)
+    storage.commit()
+    return task.id
+
+
+def time_command(argv, cwd, repeat):
+    """Return the median run time of one CLI command in milliseconds."""
+    env = dict(os.environ, PYTHONPATH=str(PACKAGE_PARENT))
+    env.pop("TASK_MANAGER_SOCKET", None)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "python.cli", *argv], cwd=cwd, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    """Run the benchmark and print one line per subcommand.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="CLI cold-start benchmark")
+    parser.add_argument("--tasks", help="Number of generated tasks", type=int, default=5000)
+    parser.add_argument("--repeat", help="Runs per subcommand", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        task_id = build_task_file(os.path.join(workdir, "tasks.json"), args.tasks)
+        print(f"{args.tasks} tasks, median of {args.repeat} runs")
+        for argv in SUBCOMMANDS:
+            argv = [arg.format(task_id=task_id, short_id=task_id[:8]) for arg in argv]
+            elapsed = time_command(argv, workdir, args.repeat)
+            print(f"{' '.join(argv)[:40]:<40} {elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
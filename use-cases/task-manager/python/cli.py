@@ -1,32 +1,41 @@
 """Command-line interface for the task manager application."""
 
 # task_manager/cli.py
+# Application modules are imported inside the handlers that need them, so
+# `--help`, argument errors and commands forwarded to a daemon start fast.
+# Run `python -X importtime -m python.cli <command>` to profile startup.
 import argparse
-from datetime import datetime
-from .app import TaskManager
-from .models import TaskPriority, TaskStatus
+import os
+import sys
+from functools import lru_cache
+
+from .profiling import PROFILE_DUMP_ENV_VAR, PROFILE_ENV_VAR, profiler, timed
+
+SOCKET_ENV_VAR = "TASK_MANAGER_SOCKET"
+CACHE_SIZE_ENV_VAR = "TASK_MANAGER_CACHE_SIZE"
+HISTORY_ENV_VAR = "TASK_MANAGER_HISTORY"
+OUTPUT_FORMATS = ["table", "json", "ndjson", "ids"]
+OUTPUT_BUFFER_LINES = 1000
+TASK_SEPARATOR = "-" * 50
 
-def format_task(task):
-    """Render a task as a human-readable multi-line string.
+
+def default_socket_path(storage_path="tasks.json"):
+    """Return the daemon socket path used for a storage file.
 
     Args:
-        task (Task): Task instance to format.
+        storage_path (str): Task storage file served by the daemon.
 
     Returns:
-        str: Human-friendly string representation for CLI output.
+        str: `$TASK_MANAGER_SOCKET` if set, otherwise `<storage_path>.sock`.
+    """
+    return os.environ.get(SOCKET_ENV_VAR) or f"{storage_path}.sock"
 
-    Raises:
-        AttributeError: If `task` is missing expected attributes.
 
-    Example:
-        >>> from .models import Task
-        >>> t = Task("Write tests")
-        >>> isinstance(format_task(t), str)
-        True
+@lru_cache(maxsize=None)
+def _symbol_tables():
+    """Build the status and priority symbol tables once per process."""
+    from .models import TaskPriority, TaskStatus
 
-    Notes:
-        Uses compact status and priority symbols for quick scanning.
-    """
     status_symbol = {
         TaskStatus.TODO: "[ ]",
         TaskStatus.IN_PROGRESS: "[>]",
@@ -41,20 +50,151 @@ def format_task(task):
         TaskPriority.HIGH: "!!!",
         TaskPriority.URGENT: "!!!!"
     }
+    return status_symbol, priority_symbol
+
 
-    due_str = f"Due: {task.due_date.strftime('%Y-%m-%d')}" if task.due_date else "No due date"
+def format_task(task):
+    """Render a task as a human-readable multi-line string.
+
+    Args:
+        task (Task): Task instance to format.
+
+    Returns:
+        str: Human-friendly string representation for CLI output.
+
+    Raises:
+        AttributeError: If `task` is missing expected attributes.
+
+    Example:
+        >>> from .models import Task
+        >>> t = Task("Write tests")
+        >>> isinstance(format_task(t), str)
+        True
+
+    Notes:
+        Uses compact status and priority symbols for quick scanning.
+    """
+    status_symbol, priority_symbol = _symbol_tables()
+
+    due_str = f"Due: {task.due_date.date().isoformat()}" if task.due_date else "No due date"
     tags_str = f"Tags: {', '.join(task.tags)}" if task.tags else "No tags"
 
+    blocked_str = (
+        f"\n  Blocked by: {', '.join(task_id[:8] for task_id in task.blocked_by)}" if task.blocked_by else ""
+    )
+    if task.recurrence:
+        blocked_str += f"\n  Repeats: {task.recurrence['rule']} from {task.recurrence['start'][:10]}"
+
     return (
-        f"{status_symbol[task.status]} {task.id[:8]} - {priority_symbol[task.priority]} {task.title}\n"
+        f"{status_symbol[task.status]} {short_task_id(task.id)} - {priority_symbol[task.priority]} {task.title}\n"
         f"  {task.description}\n"
         f"  {due_str} | {tags_str}\n"
-        f"  Created: {task.created_at.strftime('%Y-%m-%d %H:%M')}"
+        f"  Created: {task.created_at.isoformat(' ', 'minutes')}{blocked_str}"
     )
 
-def main():
+
+def short_task_id(task_id):
+    """Shorten a task ID to the 8-character prefix the CLI accepts back.
+
+    Args:
+        task_id (str): Full task or occurrence ID.
+
+    Returns:
+        str: The prefix, keeping the `@YYYY-MM-DD` of occurrence IDs so they
+        still resolve to the occurrence rather than its series.
+    """
+    head, separator, day = task_id.partition("@")
+    return f"{head[:8]}{separator}{day}"
+
+
+def _field_text(value):
+    if value is None or value == []:
+        return "-"
+    if isinstance(value, list):
+        return ",".join(value)
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+@timed("cli.write_tasks")
+def write_tasks(tasks, out, fmt="table", fields=None):
+    """Render tasks to `out` in one of `OUTPUT_FORMATS`.
+
+    Args:
+        tasks (Iterable[Task]): Tasks to render, consumed lazily.
+        out (TextIO): Destination stream.
+        fmt (str): "table", "json", "ndjson" or "ids".
+        fields (list[str] | None): Record fields to include (see
+            `transfer.FIELDS`). For "table" this switches to one
+            tab-separated line per task. Ignored for "ids".
+
+    Returns:
+        tuple[int, Task | None]: Number of tasks written and the last task.
+
+    Raises:
+        ValueError: If a field name is unknown.
+
+    Example:
+        >>> from .models import Task
+        >>> write_tasks([Task("Write tests")], sys.stdout, "ids")
+        ...
+
+    Notes:
+        Output is collected in chunks of `OUTPUT_BUFFER_LINES` tasks and
+        written with a single `write()` per chunk. Only the requested fields
+        are computed.
+    """
+    prefix, suffix, first_separator, separator = "", "", "", ""
+    if fmt == "ids":
+        render = lambda task: task.id + "\n"
+    elif fmt == "table" and not fields:
+        render = lambda task: f"{format_task(task)}\n{TASK_SEPARATOR}\n"
+    else:
+        from .transfer import record_builder
+
+        to_record = record_builder(fields)
+        if fmt == "table":
+            prefix = "\t".join(fields) + "\n"
+            render = lambda task: "\t".join(map(_field_text, to_record(task).values())) + "\n"
+        else:
+            import json
+
+            encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+            if fmt == "json":
+                prefix, suffix, first_separator, separator = "[", "]\n", "\n", ",\n"
+                render = lambda task: encode(to_record(task))
+            else:
+                render = lambda task: encode(to_record(task)) + "\n"
+
+    buffer = [prefix]
+    count = 0
+    last_task = None
+    for task in tasks:
+        buffer.append(separator if count else first_separator)
+        buffer.append(render(task))
+        count += 1
+        last_task = task
+        if len(buffer) >= 2 * OUTPUT_BUFFER_LINES:
+            out.write("".join(buffer))
+            buffer.clear()
+    if fmt == "json" and count:
+        buffer.append("\n")
+    buffer.append(suffix)
+    out.write("".join(buffer))
+    return count, last_task
+
+
+def main(argv=None, task_manager=None, cwd=None):
     """Entry point for the CLI.
 
+    Args:
+        argv (list[str] | None): Command-line arguments, defaults to
+            `sys.argv[1:]`.
+        task_manager (TaskManager | None): Already loaded manager to use.
+            When omitted, the command is forwarded to a running daemon if
+            there is one, otherwise a `TaskManager` is loaded from disk.
+        cwd (str | None): Directory that relative file arguments refer to,
+            when it is not the current one (commands run by the daemon).
+
     Returns:
         None
 
@@ -69,6 +209,8 @@ def main():
         This function wires command parsing to `TaskManager` operations.
     """
     parser = argparse.ArgumentParser(description="Task Manager CLI")
+    parser.add_argument("--profile", help=f"Print per-operation timings to stderr (or set ${PROFILE_ENV_VAR})", action="store_true")
+    parser.add_argument("--profile-dump", help=f"Also write cProfile stats to this file (or set ${PROFILE_DUMP_ENV_VAR})")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
     # Create task command
@@ -78,46 +220,146 @@ def main():
     create_parser.add_argument("-p", "--priority", help="Task priority (1-4)", type=int, choices=[1, 2, 3, 4], default=2)
     create_parser.add_argument("-u", "--due", help="Due date (YYYY-MM-DD)", default=None)
     create_parser.add_argument("-t", "--tags", help="Comma-separated tags", default="")
+    create_parser.add_argument(
+        "-r", "--repeat", help="Repeat the task, e.g. daily, weekly:mon,fri or monthly:1", default=None
+    )
 
     # List tasks command
     list_parser = subparsers.add_parser("list", help="List all tasks")
-    list_parser.add_argument("-s", "--status", help="Filter by status", choices=["todo", "in_progress", "review", "done", "abandoned"])
+    list_parser.add_argument("-s", "--status", help="Filter by status (repeatable)", action="append", choices=["todo", "in_progress", "review", "done", "abandoned"])
     list_parser.add_argument("-p", "--priority", help="Filter by priority", type=int, choices=[1, 2, 3, 4])
+    list_parser.add_argument("--min-priority", help="Lowest priority to include", type=int, choices=[1, 2, 3, 4])
+    list_parser.add_argument("--max-priority", help="Highest priority to include", type=int, choices=[1, 2, 3, 4])
     list_parser.add_argument("-o", "--overdue", help="Show only overdue tasks", action="store_true")
+    list_parser.add_argument("-t", "--tag", help="Require tag (repeatable, all must match)", action="append")
+    list_parser.add_argument("--any-tag", help="Match any of these tags (repeatable)", action="append")
+    list_parser.add_argument("--due-after", help="Due on or after date (YYYY-MM-DD)")
+    list_parser.add_argument("--due-before", help="Due before date (YYYY-MM-DD)")
+    list_parser.add_argument("-q", "--text", help="Text to find in title or description")
+    list_parser.add_argument("--sort", help="Sort key", choices=["created", "updated", "due", "priority", "status", "title", "score"], default="created")
+    list_parser.add_argument("-r", "--reverse", help="Reverse sort order", action="store_true")
+    list_parser.add_argument("-n", "--limit", help="Maximum number of tasks to show", type=int)
+    list_parser.add_argument("--after", help="Show tasks after this cursor (printed as the next page hint) or task ID")
+    list_parser.add_argument("--format", help="Output format", choices=OUTPUT_FORMATS, default="table")
+    list_parser.add_argument("--fields", help="Comma-separated fields to output (e.g. id,title,due_date)")
+    list_parser.add_argument("--include-archived", help="Also list archived tasks (scans the archive)", action="store_true")
 
     # Update task commands
     update_status_parser = subparsers.add_parser("status", help="Update task status")
-    update_status_parser.add_argument("task_id", help="Task ID")
+    update_status_parser.add_argument("task_id", help="Task ID or unique prefix")
     update_status_parser.add_argument("status", help="New status", choices=["todo", "in_progress", "review", "done", "abandoned"])
 
     update_priority_parser = subparsers.add_parser("priority", help="Update task priority")
-    update_priority_parser.add_argument("task_id", help="Task ID")
+    update_priority_parser.add_argument("task_id", help="Task ID or unique prefix")
     update_priority_parser.add_argument("priority", help="New priority", type=int, choices=[1, 2, 3, 4])
 
     update_due_parser = subparsers.add_parser("due", help="Update task due date")
-    update_due_parser.add_argument("task_id", help="Task ID")
+    update_due_parser.add_argument("task_id", help="Task ID or unique prefix")
     update_due_parser.add_argument("due_date", help="New due date (YYYY-MM-DD)")
 
     # Tag management
     add_tag_parser = subparsers.add_parser("tag", help="Add tag to task")
-    add_tag_parser.add_argument("task_id", help="Task ID")
+    add_tag_parser.add_argument("task_id", help="Task ID or unique prefix")
     add_tag_parser.add_argument("tag", help="Tag to add")
 
     remove_tag_parser = subparsers.add_parser("untag", help="Remove tag from task")
-    remove_tag_parser.add_argument("task_id", help="Task ID")
+    remove_tag_parser.add_argument("task_id", help="Task ID or unique prefix")
     remove_tag_parser.add_argument("tag", help="Tag to remove")
 
+    # Dependencies
+    block_parser = subparsers.add_parser("block", help="Make a task wait for another task")
+    block_parser.add_argument("task_id", help="Task ID or unique prefix of the waiting task")
+    block_parser.add_argument("blocker_id", help="Task ID or unique prefix of the task to finish first")
+
+    unblock_parser = subparsers.add_parser("unblock", help="Remove a dependency between tasks")
+    unblock_parser.add_argument("task_id", help="Task ID or unique prefix of the waiting task")
+    unblock_parser.add_argument("blocker_id", help="Task ID or unique prefix of the blocking task")
+
+    ready_parser = subparsers.add_parser("ready", help="Show the most important tasks that can be started now")
+    ready_parser.add_argument("-n", "--limit", help="Maximum number of tasks", type=int, default=10)
+    ready_parser.add_argument(
+        "--days", help="Include occurrences of recurring tasks due in the next N days", type=int, default=None
+    )
+
     # Other commands
     show_parser = subparsers.add_parser("show", help="Show task details")
-    show_parser.add_argument("task_id", help="Task ID")
+    show_parser.add_argument("task_id", help="Task ID or unique prefix")
+
+    history_parser = subparsers.add_parser("history", help=f"Show the recorded changes of a task (recorded when ${HISTORY_ENV_VAR} is set)")
+    history_parser.add_argument("task_id", help="Task ID or unique prefix")
+    history_parser.add_argument("-r", "--revision", help="Show the task as it was at this revision", type=int)
 
     delete_parser = subparsers.add_parser("delete", help="Delete a task")
-    delete_parser.add_argument("task_id", help="Task ID")
+    delete_parser.add_argument("task_id", help="Task ID or unique prefix")
 
-    stats_parser = subparsers.add_parser("stats", help="Show task statistics")
+    search_parser = subparsers.add_parser("search", help="Search task titles and descriptions")
+    search_parser.add_argument("query", help="Words to search for")
+    search_parser.add_argument("-n", "--limit", help="Maximum number of results", type=int, default=10)
+    search_parser.add_argument("--include-archived", help="Also search archived tasks", action="store_true")
 
-    args = parser.parse_args()
-    task_manager = TaskManager()
+    stats_parser = subparsers.add_parser("stats", help="Show task statistics")
+    stats_parser.add_argument("--verify", help="Check the counters against a full recount of the tasks", action="store_true")
+
+    export_parser = subparsers.add_parser("export", help="Export tasks as NDJSON or CSV")
+    export_parser.add_argument("-o", "--output", help="Output file (default: stdout)", default="-")
+    export_parser.add_argument("-f", "--format", help="Output format (default: from file extension, else ndjson)", choices=["ndjson", "csv"])
+    export_parser.add_argument("--timestamps", help="Timestamp encoding", choices=["iso", "epoch"], default="iso")
+
+    import_parser = subparsers.add_parser("import", help="Import tasks from NDJSON or CSV")
+    import_parser.add_argument("input", help="Input file, or - for stdin")
+    import_parser.add_argument("-f", "--format", help="Input format (default: from file extension, else ndjson)", choices=["ndjson", "csv"])
+    import_parser.add_argument("--batch-size", help="Tasks written per batch", type=int, default=1000)
+
+    subparsers.add_parser("sweep", help="Abandon stale low-priority overdue tasks")
+
+    archive_parser = subparsers.add_parser("archive", help="Move long-finished tasks to compressed archive segments")
+    archive_parser.add_argument("--older-than", help="Days since the task was done or abandoned (default: 30)", type=int)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Serve commands from memory over a Unix socket")
+    daemon_parser.add_argument("--stop", help="Stop the running daemon", action="store_true")
+    daemon_parser.add_argument("--metrics-file", help="Rewrite Prometheus metrics to this file after each command")
+    daemon_parser.add_argument("--metrics-port", help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics", type=int)
+
+    metrics_parser = subparsers.add_parser("metrics", help="Print metrics in Prometheus text format")
+    metrics_parser.add_argument("-o", "--output", help="Write to this file instead of stdout")
+
+    subparsers.add_parser("shell", help="Run commands interactively with batched writes")
+
+    watch_parser = subparsers.add_parser("watch", help="Report tasks as they come due, become overdue or would be abandoned")
+    watch_parser.add_argument("--due-soon", help="Minutes of warning before a due date (default: 60)", type=int, default=60)
+
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+    socket_path = default_socket_path()
+    if cwd is not None:
+        for attr in ("input", "output", "profile_dump"):
+            value = getattr(args, attr, None)
+            if value and value != "-":
+                setattr(args, attr, os.path.join(cwd, value))
+
+    if task_manager is None:
+        if not args.command:
+            parser.print_help()
+            return
+        if os.path.exists(socket_path):
+            from .daemon import send_request
+
+            if args.command == "daemon" and args.stop:
+                response = send_request({"shutdown": True}, socket_path)
+                print(response["output"].rstrip() if response else "No task daemon is running.")
+                return
+            # The daemon cannot read this process's stdin
+            reads_stdin = args.command == "import" and args.input == "-"
+            if args.command not in ("daemon", "shell", "watch") and not reads_stdin:
+                response = send_request({"argv": argv, "cwd": os.getcwd()}, socket_path, sys.stdout, sys.stderr)
+                if response is not None:
+                    if response.get("status"):
+                        sys.exit(response["status"])
+                    return
+        elif args.command == "daemon" and args.stop:
+            print("No task daemon is running.")
+            return
 
     def handle_create():
         tags = [tag.strip() for tag in args.tags.split(",")] if args.tags else []
@@ -126,31 +368,56 @@ def main():
             args.description,
             args.priority,
             args.due,
-            tags
+            tags,
+            repeat=args.repeat
         )
         if task_id:
             print(f"Created task with ID: {task_id}")
 
     def handle_list():
-        tasks = task_manager.list_tasks(args.status, args.priority, args.overdue)
-        if tasks:
-            for task in tasks:
-                print(format_task(task))
-                print("-" * 50)
-        else:
+        tasks = task_manager.iter_tasks(
+            args.status,
+            args.priority,
+            args.overdue,
+            min_priority=args.min_priority,
+            max_priority=args.max_priority,
+            tags_any=args.any_tag,
+            tags_all=args.tag,
+            due_after_str=args.due_after,
+            due_before_str=args.due_before,
+            text=args.text,
+            sort_by=args.sort,
+            reverse=args.reverse,
+            limit=args.limit,
+            after_id=args.after,
+            include_archived=args.include_archived,
+        )
+        fields = [field.strip() for field in args.fields.split(",") if field.strip()] if args.fields else None
+        try:
+            shown, last_task = write_tasks(tasks, sys.stdout, args.format, fields)
+        except ValueError as e:
+            print(e)
+            return
+        if not shown and args.format == "table":
             print("No tasks found matching the criteria.")
+        elif args.limit and shown == args.limit:
+            # Keep machine-readable output parseable
+            hint_stream = sys.stdout if args.format == "table" else sys.stderr
+            from .query import encode_cursor
+
+            print(f"Next page: --after {encode_cursor(last_task, args.sort)}", file=hint_stream)
 
     def handle_status():
         if task_manager.update_task_status(args.task_id, args.status):
             print(f"Updated task status to {args.status}")
         else:
-            print("Failed to update task status. Task not found.")
+            print("Failed to update task status. Task not found or changed by another process.")
 
     def handle_priority():
         if task_manager.update_task_priority(args.task_id, args.priority):
             print(f"Updated task priority to {args.priority}")
         else:
-            print("Failed to update task priority. Task not found.")
+            print("Failed to update task priority. Task not found or changed by another process.")
 
     def handle_due():
         if task_manager.update_task_due_date(args.task_id, args.due_date):
@@ -170,6 +437,32 @@ def main():
         else:
             print("Failed to remove tag. Task or tag not found.")
 
+    def handle_block():
+        if task_manager.add_dependency(args.task_id, args.blocker_id):
+            print(f"Task {args.task_id} now waits for {args.blocker_id}")
+        else:
+            print("Failed to add dependency.")
+
+    def handle_unblock():
+        if task_manager.remove_dependency(args.task_id, args.blocker_id):
+            print(f"Task {args.task_id} no longer waits for {args.blocker_id}")
+        else:
+            print("Failed to remove dependency. Task or dependency not found.")
+
+    def handle_ready():
+        due_before = None
+        if args.days is not None:
+            from datetime import datetime, timedelta
+
+            due_before = datetime.now() + timedelta(days=args.days)
+        tasks = task_manager.ready_tasks(args.limit, due_before=due_before)
+        if tasks:
+            for task in tasks:
+                print(format_task(task))
+                print("-" * 50)
+        else:
+            print("No tasks are ready to start.")
+
     def handle_show():
         task = task_manager.get_task_details(args.task_id)
         if task:
@@ -177,13 +470,44 @@ def main():
         else:
             print("Task not found.")
 
+    def handle_history():
+        if args.revision is not None:
+            task = task_manager.get_task_revision(args.task_id, args.revision)
+            if task:
+                print(format_task(task))
+            else:
+                print("Revision not found.")
+            return
+        entries = task_manager.get_task_history(args.task_id)
+        for entry in entries:
+            if "deleted" in entry:
+                change = "deleted"
+            elif "task" in entry:
+                change = "created" if entry["rev"] == 1 else "full snapshot"
+            else:
+                change = ", ".join(f"{name}={_field_text(value)}" for name, value in entry["fields"].items())
+            print(f"{entry['rev']:>4}  {entry['at'][:16].replace('T', ' ')}  {change}")
+        if not entries:
+            print("No history recorded for this task.")
+
     def handle_delete():
         if task_manager.delete_task(args.task_id):
             print(f"Deleted task {args.task_id}")
         else:
             print("Failed to delete task. Task not found.")
 
+    def handle_search():
+        tasks = task_manager.search(args.query, args.limit, args.include_archived)
+        if tasks:
+            for task in tasks:
+                print(format_task(task))
+                print("-" * 50)
+        else:
+            print("No tasks matched the search.")
+
     def handle_stats():
+        if args.verify and task_manager.storage.verify_statistics():
+            print("Statistics counters match the stored tasks")
         stats = task_manager.get_statistics()
         print(f"Total tasks: {stats['total']}")
         print("By status:")
@@ -194,6 +518,115 @@ def main():
             print(f"  {priority}: {count}")
         print(f"Overdue tasks: {stats['overdue']}")
         print(f"Completed in last 7 days: {stats['completed_last_week']}")
+        cache = task_manager.storage.cache_info()
+        if cache is not None:
+            print(f"Task cache: {cache['size']}/{cache['capacity']} loaded, "
+                  f"hit rate {cache['hit_rate']:.0%}, {cache['evictions']} evictions")
+
+    def handle_export():
+        from .transfer import format_for_path
+
+        fmt = args.format or format_for_path(args.output)
+        if args.output == "-":
+            task_manager.export_tasks(sys.stdout, fmt, args.timestamps)
+            return
+        try:
+            with open(args.output, "w", newline="" if fmt == "csv" else None) as out:
+                count = task_manager.export_tasks(out, fmt, args.timestamps)
+        except OSError as e:
+            print(f"Error writing {args.output}: {e}")
+            return
+        print(f"Exported {count} task(s) to {args.output}")
+
+    def handle_import():
+        from .transfer import format_for_path
+
+        fmt = args.format or format_for_path(args.input)
+        try:
+            if args.input == "-":
+                result = task_manager.import_tasks(sys.stdin, fmt, args.batch_size)
+            else:
+                with open(args.input, "r", newline="" if fmt == "csv" else None) as source:
+                    result = task_manager.import_tasks(source, fmt, args.batch_size)
+        except OSError as e:
+            print(f"Error reading {args.input}: {e}")
+            return
+        print(
+            f"Imported {result['imported']} task(s), skipped {result['skipped']} "
+            f"in {result['seconds']:.2f}s ({result['per_second']:.0f} tasks/s)"
+        )
+
+    def handle_metrics():
+        from .metrics import FileSink, registry
+
+        if args.output:
+            FileSink(args.output).publish(registry)
+            print(f"Wrote metrics to {args.output}")
+        else:
+            print(registry.render(), end="")
+
+    def handle_daemon():
+        from .daemon import TaskDaemon
+        from .metrics import FileSink, HttpSink
+
+        metrics_sink = None
+        if args.metrics_port is not None:
+            metrics_sink = HttpSink(port=args.metrics_port)
+        elif args.metrics_file:
+            metrics_sink = FileSink(args.metrics_file)
+
+        try:
+            daemon = TaskDaemon(task_manager, socket_path, main, metrics_sink)
+        except RuntimeError as e:
+            print(e)
+            return
+        print(f"Task daemon listening on {socket_path}")
+        daemon.serve()
+
+    def handle_shell():
+        from .shell import TaskShell
+
+        TaskShell(task_manager, main).cmdloop()
+
+    def handle_watch():
+        import asyncio
+        from datetime import datetime, timedelta
+
+        labels = {"due_soon": "due soon", "overdue": "overdue", "abandon": "would be abandoned"}
+
+        def reporter(event):
+            def report(task_id, due_date):
+                task = task_manager.get_task_details(task_id)
+                title = task.title if task else ""
+                print(
+                    f"{datetime.now():%Y-%m-%d %H:%M} {labels[event]}: {short_task_id(task_id)} - {title}"
+                    f" (due {due_date:%Y-%m-%d %H:%M})",
+                    flush=True,
+                )
+            return report
+
+        notifier = task_manager.notify_due_dates(
+            reporter("due_soon"), reporter("overdue"), reporter("abandon"),
+            due_soon=timedelta(minutes=args.due_soon),
+        )
+        print(f"Watching {len(notifier)} upcoming deadline(s); press Ctrl-C to stop.", flush=True)
+        try:
+            asyncio.run(notifier.run_async())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            notifier.close()
+
+    def handle_sweep():
+        abandoned = task_manager.sweep_abandoned()
+        print(f"Abandoned {len(abandoned)} overdue task(s)")
+
+    def handle_archive():
+        from datetime import timedelta
+
+        older_than = timedelta(days=args.older_than) if args.older_than is not None else None
+        archived = task_manager.archive_tasks(older_than)
+        print(f"Archived {len(archived)} finished task(s)")
 
     handlers = {
         "create": handle_create,
@@ -203,16 +636,66 @@ def main():
         "due": handle_due,
         "tag": handle_tag,
         "untag": handle_untag,
+        "block": handle_block,
+        "unblock": handle_unblock,
+        "ready": handle_ready,
         "show": handle_show,
+        "history": handle_history,
         "delete": handle_delete,
+        "search": handle_search,
         "stats": handle_stats,
+        "export": handle_export,
+        "import": handle_import,
+        "sweep": handle_sweep,
+        "archive": handle_archive,
+        "metrics": handle_metrics,
+        "daemon": handle_daemon,
+        "shell": handle_shell,
+        "watch": handle_watch,
     }
 
-    handler = handlers.get(args.command)
-    if handler:
-        handler()
-    else:
-        parser.print_help()
+    def dispatch():
+        nonlocal task_manager
+        if task_manager is None:
+            from .app import TaskManager
+
+            cache_size = os.environ.get(CACHE_SIZE_ENV_VAR)
+            task_manager = TaskManager(
+                cache_size=int(cache_size) if cache_size else None,
+                history=bool(os.environ.get(HISTORY_ENV_VAR)),
+            )
+
+        # Accept the short IDs printed by format_task wherever a task ID is expected
+        from .storage import AmbiguousTaskIdError
+
+        try:
+            for attr in ("task_id", "blocker_id", "after"):
+                value = getattr(args, attr, None)
+                # A page cursor carries a full ID already
+                if value and not (attr == "after" and "," in value):
+                    setattr(args, attr, task_manager.resolve_task_id(value) or value)
+        except AmbiguousTaskIdError as e:
+            print(e)
+            return
+
+        handler = handlers.get(args.command)
+        if handler:
+            handler()
+        else:
+            parser.print_help()
+
+    owned = task_manager is None
+    profile_dump = args.profile_dump or os.environ.get(PROFILE_DUMP_ENV_VAR)
+    try:
+        if args.profile or profile_dump or os.environ.get(PROFILE_ENV_VAR):
+            with profiler.session(profile_dump):
+                dispatch()
+        else:
+            dispatch()
+    finally:
+        # Leave a self-contained task file behind; a daemon's manager is closed when it stops
+        if owned and task_manager is not None:
+            task_manager.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""Fast JSON encoding and decoding of tasks.
+
+Tasks are read into and written from flat records built by one `attrgetter`
+call per task, without `Task.__init__` or per-object decoder hooks. When the
+optional `orjson` package is installed it is used for the JSON text itself;
+otherwise the standard library is used. Both backends produce the same
+records, so files written by either are interchangeable.
+"""
+
+# task_manager/codec.py
+import gc
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from operator import attrgetter
+
+from .models import Task, TaskPriority, TaskStatus
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+CODEC_ENV_VAR = "TASK_MANAGER_JSON"
+BACKENDS = ("orjson", "json")
+STREAM_CHUNK_SIZE = 1 << 20
+FIELDS = (
+    "id", "title", "description", "priority", "status",
+    "created_at", "updated_at", "due_date", "completed_at", "tags", "blocked_by",
+    "recurrence", "version", "revision",
+)
+
+_record_values = attrgetter(*FIELDS)
+_PRIORITIES = {priority.value: priority for priority in TaskPriority}
+_STATUSES = {status.value: status for status in TaskStatus}
+_fromisoformat = datetime.fromisoformat
+_new_task = object.__new__
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector around bulk record conversion.
+
+    Converting many tasks allocates only acyclic containers, and while they
+    are alive the collector would otherwise rescan them again and again.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def task_to_dict(task):
+    """Convert a task to the JSON-serializable dict stored in task files.
+
+    Args:
+        task (Task): Task to convert.
+
+    Returns:
+        dict: Record with the keys in `FIELDS`; enums become their values and
+        datetimes ISO 8601 strings.
+    """
+    (task_id, title, description, priority, status,
+     created_at, updated_at, due_date, completed_at, tags, blocked_by,
+     recurrence, version, revision) = _record_values(task)
+    return {
+        "id": task_id,
+        "title": title,
+        "description": description,
+        "priority": priority.value,
+        "status": status.value,
+        "created_at": _isoformat(created_at),
+        "updated_at": _isoformat(updated_at),
+        "due_date": _isoformat(due_date),
+        "completed_at": _isoformat(completed_at),
+        "tags": tags,
+        "blocked_by": blocked_by,
+        "recurrence": recurrence,
+        "version": version,
+        "revision": revision,
+    }
+
+
+def _native_record(task):
+    """Record for backends that serialize enums and datetimes themselves."""
+    return dict(zip(FIELDS, _record_values(task)))
+
+
+def dict_to_task(record):
+    """Build a task from a stored record without running `Task.__init__`.
+
+    Args:
+        record (dict): Record with at least `id`, `title`, `priority` and
+            `status`.
+
+    Returns:
+        Task: The decoded task, with no recorded changes.
+
+    Raises:
+        ValueError: If the priority or status value is invalid.
+        KeyError: If a required key is missing.
+    """
+    priority = _PRIORITIES.get(record["priority"]) or TaskPriority(record["priority"])
+    status = _STATUSES.get(record["status"]) or TaskStatus(record["status"])
+    created_at = record.get("created_at")
+    created_at = _fromisoformat(created_at) if created_at else datetime.now()
+    updated_at = record.get("updated_at")
+    due_date = record.get("due_date")
+    completed_at = record.get("completed_at")
+
+    task = _new_task(Task)
+    task.__dict__ = {
+        "id": record["id"],
+        "title": record["title"],
+        "description": record.get("description", ""),
+        "priority": priority,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": _fromisoformat(updated_at) if updated_at else created_at,
+        "due_date": _fromisoformat(due_date) if due_date else None,
+        "completed_at": _fromisoformat(completed_at) if completed_at else None,
+        "tags": record.get("tags") or [],
+        "blocked_by": record.get("blocked_by") or [],
+        "recurrence": record.get("recurrence"),
+        "version": record.get("version", 0),
+        "revision": record.get("revision", 0),
+        "_changed": set(),
+        "_deltas": None,
+    }
+    return task
+
+
+class TaskCodec:
+    """Encode and decode tasks with the fastest available JSON backend.
+
+    Args:
+        backend (str | None): "orjson" or "json". Defaults to
+            `$TASK_MANAGER_JSON`, then orjson when it is installed.
+
+    Raises:
+        ValueError: If `backend` is unknown or not installed.
+
+    Example:
+        >>> codec = TaskCodec("json")
+        >>> codec.decode_tasks(codec.encode_tasks([Task("Write docs")]))[0].title
+        'Write docs'
+
+    Notes:
+        Output is compact (no indentation or spaces after separators) and
+        always UTF-8 bytes, with one record per line so that `decode_stream()`
+        can parse a file while it is read. Bulk methods pause the cyclic
+        garbage collector. Any JSON array of task records is accepted on
+        decode, including the indented files written by earlier versions.
+    """
+
+    def __init__(self, backend=None):
+        """Select the JSON backend.
+
+        Returns:
+            None
+        """
+        backend = backend or os.environ.get(CODEC_ENV_VAR) or ("orjson" if orjson else "json")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("The orjson backend requires the orjson package")
+        self.backend = backend
+        if backend == "orjson":
+            self.loads = orjson.loads
+            self._dumps = orjson.dumps
+            self._to_record = _native_record
+        else:
+            self.loads = json.loads
+            encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+            self._dumps = lambda value: encode(value).encode("utf-8")
+            self._to_record = task_to_dict
+
+    def encode_task(self, task):
+        """Encode one task as a compact JSON object.
+
+        Args:
+            task (Task): Task to encode.
+
+        Returns:
+            bytes: UTF-8 JSON without a trailing newline.
+        """
+        return self._dumps(self._to_record(task))
+
+    def encode_tasks(self, tasks):
+        """Encode tasks as a compact JSON array with one record per line.
+
+        Args:
+            tasks (Iterable[Task]): Tasks to encode.
+
+        Returns:
+            bytes: UTF-8 JSON array.
+        """
+        encoded = [self.encode_task(task) for task in tasks]
+        return b"[\n" + b",\n".join(encoded) + b"\n]" if encoded else b"[]"
+
+    def decode_task(self, data):
+        """Decode one JSON task object.
+
+        Args:
+            data (bytes | str): JSON object.
+
+        Returns:
+            Task: Decoded task.
+        """
+        return dict_to_task(self.loads(data))
+
+    def decode_tasks(self, data):
+        """Decode a JSON array of task records.
+
+        Args:
+            data (bytes | str): JSON array.
+
+        Returns:
+            list[Task]: Decoded tasks; an empty list when `data` is not an
+            array.
+        """
+        with _gc_paused():
+            records = self.loads(data)
+            if not isinstance(records, list):
+                return []
+            return [dict_to_task(record) for record in records]
+
+    def decode_stream(self, stream, chunk_size=STREAM_CHUNK_SIZE):
+        """Decode a task array written by `encode_tasks()` while reading it.
+
+        Args:
+            stream (BinaryIO): Readable stream, such as a decompressing file.
+            chunk_size (int): Bytes read at a time.
+
+        Returns:
+            list[Task]: Decoded tasks.
+
+        Raises:
+            ValueError: If the data does not hold one record per line (for
+                example an indented file); read it whole and use
+                `decode_tasks()` instead.
+
+        Notes:
+            Only one chunk of the encoded data is held in memory at a time.
+        """
+        tasks = []
+        pending = b""
+        with _gc_paused():
+            while True:
+                chunk = stream.read(chunk_size)
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop() if chunk else b""
+                for line in lines:
+                    line = line.strip()
+                    if line.endswith(b","):
+                        line = line[:-1]
+                    if line in (b"", b"[", b"]", b"[]"):
+                        continue
+                    if not line.startswith(b"{"):
+                        raise ValueError("Task data does not hold one record per line")
+                    tasks.append(dict_to_task(self.loads(line)))
+                if not chunk:
+                    return tasks
+
+
+codec = TaskCodec()
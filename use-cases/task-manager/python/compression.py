@@ -0,0 +1,149 @@
+"""Transparent compression of task files, chosen by file extension."""
+
+# task_manager/compression.py
+import io
+import os
+
+# Extension -> (compressor, level). Levels favour speed: the files are small
+# enough that the gain from higher levels does not pay for the CPU time.
+EXTENSIONS = {
+    ".gz": ("gzip", 6),
+    ".zst": ("zstd", 3),
+    ".lz4": ("lz4", 0),
+}
+MODULES = {"gzip": "gzip", "zstd": "zstandard", "lz4": "lz4.frame"}
+
+
+def compression_for_path(path):
+    """Return the compressor implied by a file name.
+
+    Args:
+        path (str): Task file path, for example "tasks.json.zst".
+
+    Returns:
+        str | None: "gzip", "zstd", "lz4", or None for an uncompressed file.
+    """
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), (None, None))[0]
+
+
+def is_available(compressor):
+    """Check whether the library behind a compressor is installed.
+
+    Args:
+        compressor (str): "gzip", "zstd" or "lz4".
+
+    Returns:
+        bool: True when files of that kind can be read and written.
+    """
+    try:
+        __import__(MODULES[compressor])
+    except ImportError:
+        return False
+    return True
+
+
+def open_file(path, mode="rb"):
+    """Open a task file, compressing or decompressing as a stream.
+
+    Args:
+        path (str): File path; the extension selects the compressor.
+        mode (str): "rb" or "wb".
+
+    Returns:
+        BinaryIO: File object. Compressed data is processed in chunks as it
+        is read or written, never as a whole.
+
+    Raises:
+        ValueError: If the extension needs a library that is not installed
+            (`zstandard` for .zst, `lz4` for .lz4).
+
+    Example:
+        >>> with open_file("tasks.json.gz", "wb") as f:
+        ...     f.write(b"[]")
+        2
+    """
+    compressor, level = EXTENSIONS.get(os.path.splitext(path)[1].lower(), (None, None))
+    if compressor is None:
+        return open(path, mode)
+    _require(compressor, path)
+    writing = "w" in mode
+    if compressor == "gzip":
+        import gzip
+
+        return gzip.open(path, mode, compresslevel=level) if writing else gzip.open(path, mode)
+    if compressor == "zstd":
+        import zstandard
+
+        if writing:
+            return zstandard.ZstdCompressor(level=level).stream_writer(open(path, "wb"), closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    import lz4.frame
+
+    if writing:
+        return lz4.frame.open(path, mode, compression_level=level)
+    return lz4.frame.open(path, mode)
+
+
+def _require(compressor, path):
+    """Raise ValueError when the library behind a compressor is missing."""
+    if not is_available(compressor):
+        raise ValueError(f"Reading and writing {path} requires the {MODULES[compressor].split('.')[0]} package")
+
+
+def compress(data, compressor, path):
+    """Compress a block of data into one self-contained frame.
+
+    Args:
+        data (bytes): Data to compress.
+        compressor (str): "gzip", "zstd" or "lz4".
+        path (str): File the frame is written to, named in errors.
+
+    Returns:
+        bytes: Frame that can be appended after other frames of the same
+        kind; `decompress()` reads such a sequence back as one block.
+
+    Raises:
+        ValueError: If the library behind the compressor is not installed.
+    """
+    _require(compressor, path)
+    level = dict(EXTENSIONS.values())[compressor]
+    if compressor == "gzip":
+        import gzip
+
+        return gzip.compress(data, compresslevel=level)
+    if compressor == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    import lz4.frame
+
+    return lz4.frame.compress(data, compression_level=level)
+
+
+def decompress(data, compressor, path):
+    """Decompress a sequence of frames written by `compress()`.
+
+    Args:
+        data (bytes): Concatenated frames.
+        compressor (str): "gzip", "zstd" or "lz4".
+        path (str): File the frames were read from, named in errors.
+
+    Returns:
+        bytes: The decompressed frames joined together.
+
+    Raises:
+        ValueError: If the library behind the compressor is not installed.
+    """
+    _require(compressor, path)
+    if compressor == "gzip":
+        import gzip
+
+        return gzip.decompress(data)
+    if compressor == "zstd":
+        import zstandard
+
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True)
+        return reader.read()
+    import lz4.frame
+
+    return lz4.frame.LZ4FrameFile(io.BytesIO(data)).read()
@@ -0,0 +1,319 @@
+"""Cross-process coordination for a shared task file.
+
+`FileLock` serializes writers (and keeps readers away from half-written
+files) with an advisory lock on `<storage_path>.lock`. `ChangeLog` records
+the records each commit wrote in `<storage_path>.changes`. It is the write
+path: the task file holds the tasks as of the start of the log's current
+generation, and the log's entries are replayed on top of it. A process whose
+copy is stale catches up by reading only the new log entries. The log is
+kept small next to the task file and folded into it on close, so the task
+file alone is normally a complete copy of the data.
+"""
+
+# task_manager/concurrency.py
+import json
+import os
+import uuid
+
+from .compression import compress, decompress
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MAX_LOG_BYTES = 4 * 1024 * 1024
+MIN_LOG_BYTES = 64 * 1024
+# Fraction of the task file size the log may reach before it is folded in
+LOG_RATIO = 0.25
+HEADER_BYTES = 256
+
+
+class FileLock:
+    """Advisory lock on a file, usable as a context manager.
+
+    Args:
+        path (str): Lock file, created if missing. Its content is unused.
+        shared (bool): Take a shared (reader) lock instead of an exclusive
+            one. Windows only has exclusive locks. A shared lock is skipped
+            while the lock file does not exist, so readers create no files.
+
+    Example:
+        >>> with FileLock("tasks.json.lock"):
+        ...     pass
+
+    Notes:
+        Locks are advisory: they only exclude processes that also use
+        `FileLock` on the same path. Acquiring blocks until the lock is free.
+        The lock file only goes missing before the first commit, which
+        creates it before writing anything, and task files are only ever
+        replaced atomically.
+    """
+
+    def __init__(self, path, shared=False):
+        """Initialize the lock without acquiring it.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.shared = shared
+        self._file = None
+
+    def __enter__(self):
+        if self.shared and not os.path.exists(self.path):
+            return self
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class ChangeLog:
+    """Append-only log of the task records written by each commit.
+
+    The first line names a generation, the task file the log applies to and
+    the one the generation started from; every further line is one commit:
+    `{"changed": [<task record>, ...], "fields": [[<field>, ...], ...],
+    "deleted": [<task id>, ...]}`, where `fields` lists the fields each
+    record changed. A position is a `(generation, offset)` pair.
+
+    Args:
+        path (str): Log file.
+        max_bytes (int): Size the log may not grow past; `append()` refuses
+            entries beyond it so the caller can compact. Below that, the log
+            may grow to `LOG_RATIO` of the task file size, or `MIN_LOG_BYTES`
+            for small files.
+        compressor (str | None): "gzip", "zstd" or "lz4" to compress every
+            entry like the task file (see `compression.py`); the header stays
+            plain so it can be rewritten in place.
+
+    Notes:
+        Callers must hold the storage `FileLock` for every method. The
+        header records the fingerprint (`stat` values) of the task file the
+        entries apply to; a task file replaced since, whether by compaction
+        or by another program, already holds or overrides them, so they are
+        not replayed. A reader whose generation no longer matches has missed
+        history and must reload the task file. The log is only created by
+        the first commit; a reader that found none catches up from the whole
+        log as long as its generation started from the task file it read.
+    """
+
+    def __init__(self, path, max_bytes=MAX_LOG_BYTES, compressor=None):
+        """Initialize the log without touching the file.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compressor = compressor
+
+    def _split(self, data):
+        """Split raw log bytes after the header into entry lines."""
+        if data and self.compressor:
+            data = decompress(data, self.compressor, self.path)
+        return [line for line in data.split(b"\n") if line]
+
+    def _limit(self, base):
+        """Return the size the log may grow to next to the task file `base` describes."""
+        if not base:
+            return self.max_bytes
+        return min(self.max_bytes, max(MIN_LOG_BYTES, int(base[1] * LOG_RATIO)))
+
+    def _read_header(self, f):
+        """Return `(generation, base, start, header_length)`; generation is None when unreadable."""
+        header = f.readline()
+        try:
+            data = json.loads(header)
+            # False matches no fingerprint: older headers did not record the start
+            return data["generation"], data.get("base"), data.get("start", False), len(header)
+        except (ValueError, KeyError, TypeError):
+            return None, None, False, len(header)
+
+    @staticmethod
+    def _encode_header(generation, base, start):
+        # Fixed width, so the base can be updated in place without moving entries
+        header = json.dumps({"generation": generation, "base": base, "start": start}).encode("utf-8")
+        return header.ljust(HEADER_BYTES - 1) + b"\n"
+
+    def position(self):
+        """Return the position just after the last entry.
+
+        Returns:
+            tuple[str | None, int]: Generation and offset; `(None, 0)` when
+            there is no log yet.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                generation = self._read_header(f)[0]
+                return generation, f.seek(0, os.SEEK_END)
+        except FileNotFoundError:
+            return None, 0
+
+    def has_entries(self):
+        """Check whether any commit is recorded in the log.
+
+        Returns:
+            bool: True when entries follow the header.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        with f:
+            self._read_header(f)
+            return bool(f.read(1))
+
+    def read_since(self, position, base=None):
+        """Read the entries appended after `position`.
+
+        Args:
+            position (tuple[str | None, int]): Position from `position()`,
+                `read_since()` or `append()`, or `(None, 0)` when there was
+                no log yet.
+            base (list | None): Fingerprint of the task file the reader last
+                read; with a `(None, 0)` position, the whole log is read when
+                its generation started from that file.
+
+        Returns:
+            tuple[list[bytes] | None, tuple]: Raw entry lines, or None when
+            history was lost (new generation or truncated log), and the new
+            position.
+        """
+        generation, offset = position
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return ([] if generation is None else None), (None, 0)
+        with f:
+            current, _, start, length = self._read_header(f)
+            end = f.seek(0, os.SEEK_END)
+            if generation is None and current is not None and start == base:
+                generation, offset = current, length
+            if current != generation or offset > end:
+                return None, (current, end)
+            f.seek(offset)
+            data = f.read(end - offset)
+        return self._split(data), (current, end)
+
+    def read_all(self, base):
+        """Read every entry of the current generation that applies to a task file.
+
+        Args:
+            base (list | None): Fingerprint of the task file as it is now.
+
+        Returns:
+            tuple[list[bytes], tuple]: Raw entry lines, empty when the log
+            was written against another task file, and the position after
+            the last entry.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return [], (None, 0)
+        with f:
+            generation, logged_base, _, _ = self._read_header(f)
+            data = f.read()
+            end = f.tell()
+        if logged_base != base:
+            return [], (generation, end)
+        return self._split(data), (generation, end)
+
+    def start_generation(self, base):
+        """Empty the log under a new generation.
+
+        Args:
+            base (list | None): Fingerprint of the task file, which must
+                already hold every change in the log.
+
+        Returns:
+            tuple[str, int]: Position just after the header.
+        """
+        generation = uuid.uuid4().hex
+        with open(self.path, "wb") as f:
+            f.write(self._encode_header(generation, base, base))
+            return generation, f.tell()
+
+    def set_base(self, base):
+        """Record a new fingerprint of the task file, keeping the entries.
+
+        Args:
+            base (list | None): Fingerprint of a task file that holds every
+                change in the log.
+
+        Returns:
+            tuple[str, int]: Position just after the last entry; readers of
+            this generation keep their positions.
+        """
+        with open(self.path, "r+b") as f:
+            generation, _, start, length = self._read_header(f)
+            if generation is None or length != HEADER_BYTES:
+                return self.start_generation(base)
+            f.seek(0)
+            f.write(self._encode_header(generation, base, start))
+            return generation, f.seek(0, os.SEEK_END)
+
+    def ensure(self, base):
+        """Create the log if it does not exist yet.
+
+        Args:
+            base (list | None): Fingerprint of the current task file.
+
+        Returns:
+            tuple[str, int]: Position just after the last entry.
+        """
+        generation, end = self.position()
+        if generation is None:
+            return self.start_generation(base)
+        return generation, end
+
+    def append(self, changed, fields, deleted, base):
+        """Append one commit's entry.
+
+        Args:
+            changed (list[bytes]): Encoded task records (see `codec`).
+            fields (list[list[str]]): Names of the fields each record
+                changed, in the same order.
+            deleted (Iterable[str]): IDs of deleted tasks.
+            base (list | None): Fingerprint of the current task file.
+
+        Returns:
+            tuple[str, int] | None: Position after the new entry, or None
+            when the task file must be rewritten instead: there is no log
+            yet, the log belongs to another task file, or the entry would
+            take it past its size limit. Nothing is written then.
+        """
+        entry = (b'{"changed":[' + b",".join(changed) + b'],"fields":'
+                 + json.dumps(fields).encode("utf-8") + b',"deleted":'
+                 + json.dumps(list(deleted)).encode("utf-8") + b"}\n")
+        if self.compressor:
+            entry = compress(entry, self.compressor, self.path)
+        try:
+            f = open(self.path, "r+b")
+        except FileNotFoundError:
+            return None
+        with f:
+            generation, logged_base, _, _ = self._read_header(f)
+            end = f.seek(0, os.SEEK_END)
+            if generation is None or logged_base != base or end + len(entry) > self._limit(base):
+                return None
+            f.write(entry)
+            return generation, f.tell()
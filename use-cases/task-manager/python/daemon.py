@@ -0,0 +1,232 @@
+"""Resident daemon that serves CLI commands over a Unix-domain socket."""
+
+# task_manager/daemon.py
+import io
+import json
+import os
+import socket
+import socketserver
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+
+REQUEST_TIMEOUT_SECONDS = 30
+OUTPUT_CHUNK_CHARS = 64 * 1024
+
+
+def send_request(request, socket_path, output=None, errors=None):
+    """Send one request to a running daemon.
+
+    Args:
+        request (dict): `{"argv": [...], "cwd": ...}` or `{"shutdown": True}`.
+        socket_path (str): Daemon socket path.
+        output (TextIO | None): Stream to copy the command's stdout to as it
+            arrives. When omitted, it is collected in the response.
+        errors (TextIO | None): Same for the command's stderr, for example
+            `--profile` reports.
+
+    Returns:
+        dict | None: The daemon's response, or None when no daemon is
+        reachable (the caller should then run the command directly).
+
+    Notes:
+        The protocol is one JSON document per line in each direction. The
+        daemon sends `{"output": ...}` and `{"error": ...}` chunks while the
+        command runs, then a final document that also holds `status`.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    streams = {"output": output, "error": errors}
+    chunks = {"output": [], "error": []}
+    received = False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(REQUEST_TIMEOUT_SECONDS)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                for line in reader:
+                    received = True
+                    response = json.loads(line)
+                    for key, text in response.items():
+                        if key not in streams:
+                            continue
+                        if streams[key] is not None:
+                            streams[key].write(text)
+                        else:
+                            chunks[key].append(text)
+                    if "status" in response:
+                        break
+                else:
+                    if not received:
+                        return None
+                    response = {"status": 1}
+    except OSError:
+        if not received:
+            return None
+        # Once output arrived the command ran, so it must not be run again here
+        response = {"status": 1}
+    response.update((key, "".join(parts)) for key, parts in chunks.items())
+    return response
+
+
+class _OutputStream(io.TextIOBase):
+    """Text stream that hands what is written to `send` in chunks."""
+
+    def __init__(self, send, key):
+        self._send = send
+        self._key = key
+        self._parts = []
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= OUTPUT_CHUNK_CHARS:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._parts:
+            self._send(self._key, "".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.dispatch(json.loads(line), self._send_output)
+        except Exception as e:
+            response = {"output": f"Daemon error: {e}\n", "status": 1}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    def _send_output(self, key, text):
+        self.wfile.write(json.dumps({key: text}).encode("utf-8") + b"\n")
+
+
+class TaskDaemon(socketserver.UnixStreamServer):
+    """Keep a `TaskManager` loaded and run CLI commands against it.
+
+    Args:
+        task_manager (TaskManager): Loaded manager shared by all requests.
+        socket_path (str): Unix socket to listen on.
+        run_command (Callable[[list[str], TaskManager, str | None], None]):
+            Runs one CLI command with relative file paths resolved against
+            the given directory, normally `cli.main`.
+        metrics_sink (FileSink | HttpSink | None): Where to publish metrics;
+            republished after every request.
+
+    Example:
+        >>> from .app import TaskManager
+        >>> from .cli import main
+        >>> daemon = TaskDaemon(TaskManager(), "tasks.json.sock", main)
+        >>> daemon.serve()
+        ...
+
+    Notes:
+        Requests are handled one at a time, so commands never interleave.
+        The socket is created with owner-only permissions.
+    """
+
+    def __init__(self, task_manager, socket_path, run_command, metrics_sink=None):
+        """Bind the socket, replacing a stale socket file if needed.
+
+        Returns:
+            None
+
+        Raises:
+            RuntimeError: If another daemon is already serving the socket.
+        """
+        if send_request({"ping": True}, socket_path) is not None:
+            raise RuntimeError(f"A task daemon is already listening on {socket_path}")
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        self.task_manager = task_manager
+        self.socket_path = socket_path
+        self.run_command = run_command
+        self.metrics_sink = metrics_sink
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def dispatch(self, request, send_output=None):
+        """Handle one decoded request.
+
+        Args:
+            request (dict): Request document.
+            send_output (Callable[[str, str], None] | None): Receives
+                `("output", text)` and `("error", text)` chunks of the
+                command's stdout and stderr, about `OUTPUT_CHUNK_CHARS` long,
+                while it runs, so large listings and exports are not held in
+                memory.
+
+        Returns:
+            dict: Response document with the exit status and the command
+            output not yet passed to `send_output`.
+        """
+        if request.get("ping"):
+            return {"output": "", "status": 0}
+        if request.get("shutdown"):
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"output": "Task daemon stopping\n", "status": 0}
+
+        if send_output is None:
+            output, errors = io.StringIO(), io.StringIO()
+        else:
+            output, errors = _OutputStream(send_output, "output"), _OutputStream(send_output, "error")
+        status = 0
+        with redirect_stdout(output), redirect_stderr(errors):
+            try:
+                self.run_command(request["argv"], self.task_manager, request.get("cwd"))
+            except SystemExit as e:
+                status = e.code if isinstance(e.code, int) else int(e.code is not None)
+        self.publish_metrics()
+        if send_output is not None:
+            output.flush()
+            errors.flush()
+            return {"output": "", "error": "", "status": status}
+        return {"output": output.getvalue(), "error": errors.getvalue(), "status": status}
+
+    def publish_metrics(self):
+        """Publish the metrics registry to `metrics_sink`, if any.
+
+        Returns:
+            None
+        """
+        if self.metrics_sink is None:
+            return
+        from .metrics import registry
+
+        try:
+            self.metrics_sink.publish(registry)
+        except OSError as e:
+            print(f"Error publishing metrics: {e}")
+
+    def serve(self):
+        """Serve requests until stopped, then remove the socket file.
+
+        Returns:
+            None
+        """
+        self.task_manager.sweeper.start()
+        self.publish_metrics()
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.task_manager.sweeper.stop()
+            if self.metrics_sink is not None:
+                self.metrics_sink.close()
+            self.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
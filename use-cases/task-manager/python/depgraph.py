@@ -0,0 +1,276 @@
+"""Incrementally maintained "blocked by" graph between tasks.
+
+Edges point from a blocker to the task it blocks. The graph keeps a
+topological order and the set of ready tasks (open, with no open blocker) up
+to date as edges and task states change, so neither is recomputed from
+scratch. Order maintenance follows Pearce and Kelly's dynamic topological
+sort: adding an edge that already agrees with the order costs O(1), and
+otherwise only the tasks ranked between its two ends are searched and
+renumbered. The same search detects cycles.
+"""
+
+# task_manager/depgraph.py
+
+
+class DependencyCycleError(ValueError):
+    """Raised when a dependency would make a task (indirectly) block itself.
+
+    Args:
+        task_id (str): Task that would be blocked.
+        blocker_id (str): Task that would block it.
+    """
+
+    def __init__(self, task_id, blocker_id):
+        """Initialize the error with the rejected edge.
+
+        Returns:
+            None
+        """
+        self.task_id = task_id
+        self.blocker_id = blocker_id
+        super().__init__(
+            f"Task {blocker_id} cannot block {task_id}: {task_id} already blocks it"
+        )
+
+
+class DependencyGraph:
+    """Blocker edges, topological order and ready set over task IDs.
+
+    Example:
+        >>> graph = DependencyGraph()
+        >>> graph.update("b", [], finished=False)
+        []
+        >>> graph.update("a", ["b"], finished=False)
+        []
+        >>> sorted(graph.ready)
+        ['b']
+        >>> graph.update("b", [], finished=True)
+        []
+        >>> sorted(graph.ready)
+        ['a']
+
+    Notes:
+        A task is known once `update()` has been called for it. Edges may
+        name tasks that are not known yet (for example while the graph is
+        being built from unordered storage); such blockers do not block until
+        they become known, and deleted or archived blockers stop blocking.
+    """
+
+    def __init__(self):
+        """Create an empty graph.
+
+        Returns:
+            None
+        """
+        self._blockers = {}
+        self._dependents = {}
+        self._rank = {}
+        self._next_rank = 0
+        self._open = set()
+        self._known = set()
+        self._open_blockers = {}
+        self.ready = set()
+
+    def __contains__(self, task_id):
+        return task_id in self._known
+
+    def _add_node(self, task_id):
+        if task_id not in self._rank:
+            self._rank[task_id] = self._next_rank
+            self._next_rank += 1
+            self._blockers[task_id] = set()
+            self._dependents[task_id] = set()
+            self._open_blockers[task_id] = 0
+
+    def _drop_if_unused(self, task_id):
+        if task_id not in self._known and not self._blockers[task_id] and not self._dependents[task_id]:
+            del self._rank[task_id], self._blockers[task_id], self._dependents[task_id]
+            del self._open_blockers[task_id]
+
+    def _refresh_ready(self, task_id):
+        if task_id in self._open and not self._open_blockers[task_id]:
+            self.ready.add(task_id)
+        else:
+            self.ready.discard(task_id)
+
+    def blockers_of(self, task_id):
+        """Return the IDs of the tasks blocking `task_id`.
+
+        Args:
+            task_id (str): Task ID.
+
+        Returns:
+            set[str]: Blocker IDs. Treat as read-only.
+        """
+        return self._blockers.get(task_id, set())
+
+    def dependents_of(self, task_id):
+        """Return the IDs of the tasks `task_id` blocks.
+
+        Args:
+            task_id (str): Task ID.
+
+        Returns:
+            set[str]: Dependent IDs. Treat as read-only.
+        """
+        return self._dependents.get(task_id, set())
+
+    def add_edge(self, blocker_id, task_id):
+        """Record that `blocker_id` blocks `task_id`.
+
+        Args:
+            blocker_id (str): Blocking task.
+            task_id (str): Blocked task.
+
+        Returns:
+            bool: True when the edge is new.
+
+        Raises:
+            DependencyCycleError: If `task_id` already blocks `blocker_id`,
+                directly or through other tasks. The graph is left unchanged.
+        """
+        if blocker_id == task_id:
+            raise DependencyCycleError(task_id, blocker_id)
+        self._add_node(blocker_id)
+        self._add_node(task_id)
+        if blocker_id in self._blockers[task_id]:
+            return False
+        if self._rank[task_id] < self._rank[blocker_id]:
+            self._reorder(blocker_id, task_id)
+        self._blockers[task_id].add(blocker_id)
+        self._dependents[blocker_id].add(task_id)
+        if blocker_id in self._open:
+            self._open_blockers[task_id] += 1
+            self.ready.discard(task_id)
+        return True
+
+    def _reorder(self, blocker_id, task_id):
+        """Move the affected region so that `blocker_id` ranks before `task_id`.
+
+        Only tasks ranked between the two ends are visited: those reachable
+        from `task_id` and those reaching `blocker_id`. Reaching `blocker_id`
+        from `task_id` means the edge would close a cycle.
+        """
+        rank = self._rank
+        upper = rank[blocker_id]
+        lower = rank[task_id]
+
+        forward = []
+        seen = {task_id}
+        stack = [task_id]
+        while stack:
+            node = stack.pop()
+            forward.append(node)
+            for dependent in self._dependents[node]:
+                if dependent == blocker_id:
+                    raise DependencyCycleError(task_id, blocker_id)
+                if dependent not in seen and rank[dependent] < upper:
+                    seen.add(dependent)
+                    stack.append(dependent)
+
+        backward = []
+        seen = {blocker_id}
+        stack = [blocker_id]
+        while stack:
+            node = stack.pop()
+            backward.append(node)
+            for blocker in self._blockers[node]:
+                if blocker not in seen and rank[blocker] > lower:
+                    seen.add(blocker)
+                    stack.append(blocker)
+
+        backward.sort(key=rank.__getitem__)
+        forward.sort(key=rank.__getitem__)
+        moved = backward + forward
+        for node, new_rank in zip(moved, sorted(rank[node] for node in moved)):
+            rank[node] = new_rank
+
+    def remove_edge(self, blocker_id, task_id):
+        """Forget that `blocker_id` blocks `task_id`.
+
+        Args:
+            blocker_id (str): Blocking task.
+            task_id (str): Blocked task.
+
+        Returns:
+            bool: True when the edge existed.
+        """
+        blockers = self._blockers.get(task_id)
+        if not blockers or blocker_id not in blockers:
+            return False
+        blockers.discard(blocker_id)
+        self._dependents[blocker_id].discard(task_id)
+        if blocker_id in self._open:
+            self._open_blockers[task_id] -= 1
+            self._refresh_ready(task_id)
+        self._drop_if_unused(blocker_id)
+        self._drop_if_unused(task_id)
+        return True
+
+    def update(self, task_id, blocker_ids, finished):
+        """Make a task known with the given blockers and state.
+
+        Args:
+            task_id (str): Task ID.
+            blocker_ids (Iterable[str]): Every task currently blocking it.
+            finished (bool): True for done or abandoned tasks, which neither
+                block others nor are ready.
+
+        Returns:
+            list[str]: Blockers that were skipped because they would close a
+            cycle (possible only for data written without `add_edge()`
+            checks, such as a hand-edited file).
+        """
+        self._add_node(task_id)
+        self._known.add(task_id)
+        rejected = []
+        current = self._blockers[task_id]
+        if blocker_ids or current:
+            wanted = set(blocker_ids)
+            for blocker_id in current - wanted:
+                self.remove_edge(blocker_id, task_id)
+            for blocker_id in wanted - current:
+                try:
+                    self.add_edge(blocker_id, task_id)
+                except DependencyCycleError:
+                    rejected.append(blocker_id)
+        self._set_open(task_id, not finished)
+        return rejected
+
+    def remove(self, task_id):
+        """Forget a task; it no longer blocks the tasks it blocked.
+
+        Args:
+            task_id (str): Task ID.
+
+        Returns:
+            None
+        """
+        if task_id not in self._known:
+            return
+        self._set_open(task_id, False)
+        self._known.discard(task_id)
+        for blocker_id in list(self._blockers[task_id]):
+            self.remove_edge(blocker_id, task_id)
+        if task_id in self._rank:
+            self._drop_if_unused(task_id)
+
+    def _set_open(self, task_id, is_open):
+        if (task_id in self._open) != is_open:
+            delta = 1 if is_open else -1
+            if is_open:
+                self._open.add(task_id)
+            else:
+                self._open.discard(task_id)
+            for dependent in self._dependents[task_id]:
+                self._open_blockers[dependent] += delta
+                self._refresh_ready(dependent)
+        self._refresh_ready(task_id)
+
+    def topological_order(self):
+        """List known tasks so that every blocker comes before the tasks it blocks.
+
+        Returns:
+            list[str]: Task IDs.
+        """
+        return sorted(self._known, key=self._rank.__getitem__)
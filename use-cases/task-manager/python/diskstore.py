@@ -0,0 +1,337 @@
+"""On-disk task store with a bounded LRU cache of hydrated tasks."""
+
+# task_manager/diskstore.py
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from .codec import codec, dict_to_task
+
+MIN_COMPACT_GARBAGE_BYTES = 64 * 1024
+
+
+def _decode_line(line):
+    """Return `(task_id, record)` for a log line; record is None for deletions."""
+    record = codec.loads(line)
+    return record["id"], None if record.get("deleted") else record
+
+
+def iter_log_tasks(data):
+    """Decode the live tasks of a record log held in memory.
+
+    Args:
+        data (bytes): Log contents, one JSON record per line.
+
+    Yields:
+        Task: The latest version of every task that was not deleted.
+    """
+    records = {}
+    for line in data.splitlines():
+        if line.strip():
+            task_id, record = _decode_line(line)
+            records.pop(task_id, None)
+            if record is not None:
+                records[task_id] = record
+    for record in records.values():
+        yield dict_to_task(record)
+
+
+class DiskTaskStore(MutableMapping):
+    """Dict-like task store that keeps records on disk and few tasks in memory.
+
+    The file is an append-only log of JSON task records, one per line. Only
+    an ID-to-offset index is held for every task; hydrated `Task` objects live
+    in an LRU cache of at most `cache_size` entries.
+
+    Args:
+        path (str): Log file. A file in the legacy JSON array format is
+            converted on open and kept as `<path>.legacy`.
+        cache_size (int): Maximum number of hydrated tasks kept in memory.
+
+    Example:
+        >>> store = DiskTaskStore("tasks.json", cache_size=1000)
+        >>> store.cache_info()["capacity"]
+        1000
+
+    Notes:
+        Changed tasks are marked dirty by assigning them (`store[id] = task`)
+        and are appended to the log only by `flush()`, which storage calls
+        from `commit()` under its file lock. Dirty tasks evicted from the
+        cache stay pinned in memory until then. Tasks that were not assigned
+        are never rewritten.
+        Deletions are written on `flush()`. The log is compacted when stale
+        records outweigh live ones.
+    """
+
+    def __init__(self, path, cache_size=10000):
+        """Open or create the log and index its records.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If `cache_size` is smaller than 1.
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.path = path
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self._lock = threading.RLock()
+        self._offsets = {}
+        self._cache = OrderedDict()
+        self._pinned = {}
+        self._dirty = set()
+        self._deleted = set()
+        self._garbage_bytes = 0
+        self._convert_legacy_file()
+        self._file = open(path, "a+b")
+        self._scan()
+
+    def _convert_legacy_file(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            head = f.read(64).lstrip()
+            if not head.startswith(b"["):
+                return
+            f.seek(0)
+            tasks = codec.decode_tasks(f.read())
+        # Convert next to the original, which is only replaced once the
+        # conversion is complete on disk, and keep a copy of it
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "wb") as out:
+                for task in tasks:
+                    out.write(self._encode(task))
+                out.flush()
+                os.fsync(out.fileno())
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        shutil.copyfile(self.path, f"{self.path}.legacy")
+        os.replace(temp_path, self.path)
+
+    def _scan(self):
+        self._file.seek(0)
+        offset = 0
+        for line in self._file:
+            length = len(line)
+            if line.strip():
+                task_id, record = _decode_line(line)
+                previous = self._offsets.pop(task_id, None)
+                if previous is not None:
+                    self._garbage_bytes += previous[1]
+                if record is None:
+                    self._garbage_bytes += length
+                else:
+                    self._offsets[task_id] = (offset, length)
+            offset += length
+
+    @staticmethod
+    def _encode(task):
+        return codec.encode_task(task) + b"\n"
+
+    def _read(self, location):
+        offset, length = location
+        self._file.seek(offset)
+        return codec.decode_task(self._file.read(length))
+
+    def _append(self, data):
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(data)
+        return offset
+
+    def _write_back(self, task):
+        data = self._encode(task)
+        task.mark_clean()
+        offset = self._append(data)
+        previous = self._offsets.get(task.id)
+        if previous is not None:
+            self._garbage_bytes += previous[1]
+        self._offsets[task.id] = (offset, len(data))
+        self.writebacks += 1
+
+    def _evict(self):
+        while len(self._cache) > self.cache_size:
+            task_id, task = self._cache.popitem(last=False)
+            self.evictions += 1
+            if task_id in self._dirty:
+                # Written by the next flush(), not outside the caller's commit
+                self._pinned[task_id] = task
+
+    def _loaded(self, task_id):
+        """Return the in-memory task for an ID, cached or pinned, or None."""
+        task = self._cache.get(task_id)
+        return task if task is not None else self._pinned.get(task_id)
+
+    def __getitem__(self, task_id):
+        with self._lock:
+            task = self._cache.get(task_id)
+            if task is not None:
+                self._cache.move_to_end(task_id)
+                self.hits += 1
+                return task
+            task = self._pinned.pop(task_id, None)
+            if task is not None:
+                self.hits += 1
+                self._cache[task_id] = task
+                self._evict()
+                return task
+            location = self._offsets[task_id]
+            self.misses += 1
+            task = self._read(location)
+            self._cache[task_id] = task
+            self._evict()
+            return task
+
+    def __setitem__(self, task_id, task):
+        with self._lock:
+            self._pinned.pop(task_id, None)
+            self._cache[task_id] = task
+            self._cache.move_to_end(task_id)
+            self._dirty.add(task_id)
+            self._deleted.discard(task_id)
+            self._offsets.setdefault(task_id, None)
+            self._evict()
+
+    def __delitem__(self, task_id):
+        with self._lock:
+            location = self._offsets.pop(task_id)
+            self._cache.pop(task_id, None)
+            self._pinned.pop(task_id, None)
+            self._dirty.discard(task_id)
+            if location is not None:
+                self._deleted.add(task_id)
+                self._garbage_bytes += location[1]
+
+    def __contains__(self, task_id):
+        return task_id in self._offsets
+
+    def __iter__(self):
+        return iter(list(self._offsets))
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def values(self):
+        """Yield every task without filling the cache.
+
+        Yields:
+            Task: Cached instances where present, otherwise a fresh decode.
+        """
+        for task_id in list(self._offsets):
+            with self._lock:
+                task = self._loaded(task_id)
+                if task is None:
+                    location = self._offsets.get(task_id)
+                    if location is None:
+                        continue
+                    task = self._read(location)
+            yield task
+
+    def items(self):
+        """Yield `(task_id, task)` pairs without filling the cache."""
+        for task in self.values():
+            yield task.id, task
+
+    def flush(self):
+        """Write dirty tasks and pending deletions to the log.
+
+        Returns:
+            None
+
+        Notes:
+            Compacts the log afterwards when stale records take more space
+            than live ones.
+        """
+        with self._lock:
+            for task_id in list(self._dirty):
+                self._write_back(self._loaded(task_id))
+            self._dirty.clear()
+            self._pinned.clear()
+            for task_id in self._deleted:
+                self._append(b'{"id":"%s","deleted":true}\n' % task_id.encode("utf-8"))
+            self._deleted.clear()
+            self._file.flush()
+            live_bytes = sum(length for _, length in filter(None, self._offsets.values()))
+            if self._garbage_bytes > max(live_bytes, MIN_COMPACT_GARBAGE_BYTES):
+                self.compact()
+
+    def compact(self):
+        """Rewrite the log with only the latest record of each live task.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            temp_path = f"{self.path}.tmp"
+            offsets = {}
+            with open(temp_path, "wb") as out:
+                for task_id, location in self._offsets.items():
+                    if task_id in self._dirty or location is None:
+                        data = self._encode(self._loaded(task_id))
+                    else:
+                        self._file.seek(location[0])
+                        data = self._file.read(location[1])
+                    offsets[task_id] = (out.tell(), len(data))
+                    out.write(data)
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "a+b")
+            self._offsets = offsets
+            self._dirty.clear()
+            self._pinned.clear()
+            self._deleted.clear()
+            self._garbage_bytes = 0
+
+    @property
+    def pinned(self):
+        """int: Changed tasks evicted from the cache and held until the next flush."""
+        return len(self._pinned)
+
+    @property
+    def file_size(self):
+        """int: Current size of the log file in bytes."""
+        with self._lock:
+            return self._file.seek(0, os.SEEK_END)
+
+    def cache_info(self):
+        """Describe cache usage.
+
+        Returns:
+            dict: `size`, `capacity`, `hits`, `misses`, `hit_rate`,
+            `evictions`, `writebacks`, `dirty` and `pinned` counts. `size`
+            leaves out the `pinned` dirty tasks held beyond the capacity
+            until the next flush.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "capacity": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "writebacks": self.writebacks,
+            "dirty": len(self._dirty),
+            "pinned": len(self._pinned),
+        }
+
+    def close(self):
+        """Flush pending changes and close the log file.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if not self._file.closed:
+                self.flush()
+                self._file.close()
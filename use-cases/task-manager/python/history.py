@@ -0,0 +1,240 @@
+"""Append-only change history of tasks, stored as delta-encoded segments.
+
+Each change made through `Task.update()`, `mark_as_done()` or the tag and
+blocker methods becomes one history entry holding only the fields it
+changed. A task's first entry, and one after every `KEYFRAME_INTERVAL`
+revisions, is a keyframe holding the whole task, so any past revision is
+rebuilt from one keyframe and a bounded number of deltas. A delta's `at` is
+the task's new `updated_at`.
+
+History lives in `<storage_path>.history/`, in numbered segment files with
+one JSON entry per line:
+
+    {"id": ..., "rev": 1, "at": ..., "task": {<task record>}}     keyframe
+    {"id": ..., "rev": 2, "at": ..., "fields": {"status": "done", ...}}
+    {"id": ..., "rev": 3, "at": ..., "deleted": true}
+
+Only the newest segment is appended to; it is sealed once it grows past
+`SEGMENT_BYTES`. Task files never point into the history, so loading tasks
+never reads it.
+"""
+
+# task_manager/history.py
+import json
+import os
+from bisect import bisect_right
+from datetime import datetime
+from enum import Enum
+
+from .codec import codec, dict_to_task
+
+KEYFRAME_INTERVAL = 16
+SEGMENT_BYTES = 4 * 1024 * 1024
+SEGMENT_SUFFIX = ".ndjson"
+
+_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def _encode_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _entry(task_id, revision, at, body):
+    head = _dumps({"id": task_id, "rev": revision, "at": at.isoformat()})
+    return head[:-1].encode("utf-8") + b"," + body + b"}\n"
+
+
+def history_entries(task):
+    """Encode the history entries for a task that is about to be stored.
+
+    Consumes the changes queued by `Task.pop_deltas()` and advances
+    `task.revision`.
+
+    Args:
+        task (Task): Task that was added or changed.
+
+    Returns:
+        list[bytes]: Entries to append, newline-terminated.
+
+    Notes:
+        A task without history yet, or one changed without recorded deltas
+        (for example by plain attribute assignment or replacement, or before
+        `Task.track_deltas()`), gets a keyframe instead of deltas.
+    """
+    deltas = task.pop_deltas()
+    if not task.revision or not deltas:
+        task.revision += 1
+        return [_entry(task.id, task.revision, task.updated_at, b'"task":' + codec.encode_task(task))]
+    entries = []
+    first = task.revision + 1
+    for at, fields in deltas:
+        task.revision += 1
+        body = {name: _encode_value(value) for name, value in fields.items()}
+        entries.append(_entry(task.id, task.revision, at, b'"fields":' + _dumps(body).encode("utf-8")))
+    if task.revision // KEYFRAME_INTERVAL != (first - 1) // KEYFRAME_INTERVAL:
+        entries.append(_entry(task.id, task.revision, task.updated_at, b'"task":' + codec.encode_task(task)))
+    return entries
+
+
+def deletion_entry(task):
+    """Encode the history entry recording that a task was deleted.
+
+    Args:
+        task (Task): Deleted task.
+
+    Returns:
+        bytes: Entry to append, newline-terminated.
+    """
+    task.revision += 1
+    return _entry(task.id, task.revision, datetime.now(), b'"deleted":true')
+
+
+class TaskHistory:
+    """Reader and writer of the history segments next to a task file.
+
+    Args:
+        directory (str): Segment directory, created on first write.
+        segment_bytes (int): Size after which a new segment is started.
+
+    Example:
+        >>> history = TaskHistory("tasks.json.history")
+        >>> history.revisions("unknown-id")
+        []
+
+    Notes:
+        Writers must hold the storage file lock (see `FileLock`). Readers
+        index the segments on first use, reading each entry once; later
+        calls only read what was appended since. With the index, a revision
+        is rebuilt by seeking to its keyframe and reading at most
+        `KEYFRAME_INTERVAL` further entries, however long the history is.
+    """
+
+    def __init__(self, directory, segment_bytes=SEGMENT_BYTES):
+        """Initialize the history without touching the disk.
+
+        Returns:
+            None
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._index = {}
+        self._scanned = (0, 0)
+
+    def _segments(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in names if name.endswith(SEGMENT_SUFFIX))
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"{number:06d}{SEGMENT_SUFFIX}")
+
+    def append(self, entries):
+        """Append encoded entries to the newest segment.
+
+        Args:
+            entries (list[bytes]): Entries from `history_entries()` or
+                `deletion_entry()`.
+
+        Returns:
+            None
+        """
+        if not entries:
+            return
+        segments = self._segments()
+        number = segments[-1] if segments else 1
+        path = self._segment_path(number)
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+            path = self._segment_path(number + 1)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(b"".join(entries))
+
+    def _scan(self):
+        """Index the entries appended since the last scan."""
+        segment, offset = self._scanned
+        for number in self._segments():
+            if number < segment:
+                continue
+            start = offset if number == segment else 0
+            with open(self._segment_path(number), "rb") as f:
+                f.seek(start)
+                position = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # entry still being written
+                    entry = codec.loads(line)
+                    kind = "task" if "task" in entry else "deleted" if "deleted" in entry else "fields"
+                    located = self._index.setdefault(entry["id"], [])
+                    if located and entry["rev"] < located[-1][0]:
+                        located.clear()  # the ID was reused after its task was deleted
+                    located.append((entry["rev"], kind, number, position))
+                    position += len(line)
+            segment, offset = number, position
+        self._scanned = (segment, offset)
+
+    def _read(self, location):
+        _, _, number, position = location
+        with open(self._segment_path(number), "rb") as f:
+            f.seek(position)
+            return codec.loads(f.readline())
+
+    def revisions(self, task_id):
+        """List the changes recorded for a task, oldest first.
+
+        Args:
+            task_id (str): Task ID.
+
+        Returns:
+            list[dict]: Entries with `rev` and `at`, plus `fields` (the
+            changed fields), `task` (a keyframe, listed when it is the only
+            entry of its revision) or `deleted`.
+        """
+        self._scan()
+        located = self._index.get(task_id, [])
+        entries = []
+        for i, location in enumerate(located):
+            # A keyframe repeats the revision of the delta just before it
+            if location[1] == "task" and i and located[i - 1][0] == location[0]:
+                continue
+            entries.append(self._read(location))
+        return entries
+
+    def task_at(self, task_id, revision=None):
+        """Rebuild a task as it was at a revision.
+
+        Args:
+            task_id (str): Task ID.
+            revision (int | None): Revision number; None for the latest.
+
+        Returns:
+            Task | None: The task, or None when the revision is unknown or
+            the task was deleted by then.
+        """
+        self._scan()
+        located = self._index.get(task_id, [])
+        if not located:
+            return None
+        if revision is None:
+            revision = located[-1][0]
+        # Entries are ordered by revision; "~" sorts after every entry kind
+        end = bisect_right(located, (revision, "~"))
+        start = end - 1
+        while start >= 0 and located[start][1] != "task":
+            start -= 1
+        if start < 0:
+            return None
+        record = self._read(located[start])["task"]
+        for location in located[start + 1:end]:
+            if location[1] == "deleted":
+                return None
+            entry = self._read(location)
+            record.update(entry["fields"])
+            record["updated_at"] = entry["at"]
+        record["revision"] = revision
+        return dict_to_task(record)
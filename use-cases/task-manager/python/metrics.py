@@ -0,0 +1,366 @@
+"""Prometheus text-format metrics for the task store.
+
+Exported metrics (all prefixed with `task_manager_`):
+
+    storage_operations_total{operation}   counter    Storage calls by type:
+                                                     load, add, update, delete,
+                                                     commit, compact, search,
+                                                     reload, refresh.
+    save_duration_seconds                 histogram  Time spent writing the
+                                                     task file in `commit()`.
+    store_file_size_bytes                 gauge      Task file size after the
+                                                     last load or save.
+    tasks{status}                         gauge      Tasks per status.
+    overdue_tasks                         gauge      Open tasks past their due
+                                                     date.
+    sweep_duration_seconds                histogram  Duration of auto-abandon
+                                                     sweeps.
+    swept_tasks_total                     counter    Tasks abandoned by sweeps.
+    archived_tasks_total                  counter    Tasks moved to archive
+                                                     segments.
+    task_cache_size                       gauge      Hydrated tasks held by the
+                                                     on-disk store's cache.
+    task_cache_lookups_total{result}      counter    Cache lookups: hit, miss.
+    task_cache_evictions_total            counter    Tasks evicted from the
+                                                     cache.
+    task_cache_pinned                     gauge      Changed tasks evicted from
+                                                     the cache and held in
+                                                     memory until the next
+                                                     commit.
+    storage_conflicts_total               counter    Local task changes dropped
+                                                     because another process
+                                                     committed the same task.
+    notifications_total{event}            counter    Due-date callbacks fired:
+                                                     due_soon, overdue,
+                                                     abandon.
+
+Gauges are read from the incrementally maintained `TaskStatistics` when the
+metrics are rendered, so publishing never scans the tasks. The cache metrics
+are only reported when the storage uses the on-disk store.
+"""
+
+# task_manager/metrics.py
+import os
+import threading
+from bisect import bisect_left
+from datetime import datetime
+
+PREFIX = "task_manager_"
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+METRICS = {
+    "storage_operations_total": ("counter", "Storage operations by type."),
+    "save_duration_seconds": ("histogram", "Time spent writing the task file."),
+    "store_file_size_bytes": ("gauge", "Size of the task file after the last load or save."),
+    "tasks": ("gauge", "Number of tasks by status."),
+    "overdue_tasks": ("gauge", "Number of open tasks past their due date."),
+    "sweep_duration_seconds": ("histogram", "Duration of auto-abandon sweeps."),
+    "swept_tasks_total": ("counter", "Tasks moved to abandoned by sweeps."),
+    "archived_tasks_total": ("counter", "Tasks moved out of the task file into archive segments."),
+    "task_cache_size": ("gauge", "Hydrated tasks held in the on-disk store's cache."),
+    "task_cache_lookups_total": ("counter", "Task cache lookups by result."),
+    "task_cache_evictions_total": ("counter", "Tasks evicted from the task cache."),
+    "task_cache_pinned": ("gauge", "Changed tasks evicted from the task cache and held until the next commit."),
+    "storage_conflicts_total": ("counter", "Local task changes dropped for another process's commit."),
+    "notifications_total": ("counter", "Due-date callbacks fired by event."),
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.bucket_counts[bisect_left(DURATION_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """In-memory counters, gauges and histograms declared in `METRICS`.
+
+    Example:
+        >>> registry = MetricsRegistry()
+        >>> registry.inc("storage_operations_total", operation="add")
+        >>> "task_manager_storage_operations_total" in registry.render()
+        True
+
+    Notes:
+        Updates are O(1). Gauges that mirror existing state are provided by
+        collectors (see `add_collector()`), which are called at render time.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._values = {name: {} for name in METRICS}
+        self._collectors = {}
+
+    def _key(self, name, labels):
+        if name not in METRICS:
+            raise ValueError(f"Unknown metric: {name}")
+        return tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        """Increase a counter.
+
+        Args:
+            name (str): Metric name from `METRICS` without the prefix.
+            amount (int | float): Increment.
+            **labels: Label values.
+
+        Returns:
+            None
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            samples = self._values[name]
+            samples[key] = samples.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Set a gauge.
+
+        Args:
+            name (str): Metric name from `METRICS` without the prefix.
+            value (int | float): New value.
+            **labels: Label values.
+
+        Returns:
+            None
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[name][key] = value
+
+    def observe(self, name, value, **labels):
+        """Record one observation in a histogram.
+
+        Args:
+            name (str): Metric name from `METRICS` without the prefix.
+            value (float): Observed value, usually seconds.
+            **labels: Label values.
+
+        Returns:
+            None
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._values[name].get(key)
+            if histogram is None:
+                histogram = self._values[name][key] = _Histogram()
+            histogram.observe(value)
+
+    def add_collector(self, key, collect):
+        """Register a callable that supplies gauge values at render time.
+
+        Args:
+            key (str): Collector name; registering the same key replaces the
+                previous collector.
+            collect (Callable[[], Iterable[tuple[str, dict, float]]]): Returns
+                `(metric_name, labels, value)` samples.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._collectors[key] = collect
+
+    def reset(self):
+        """Drop all values and collectors.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._values = {name: {} for name in METRICS}
+            self._collectors = {}
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text ending with a newline.
+        """
+        with self._lock:
+            collectors = list(self._collectors.values())
+        for collect in collectors:
+            for name, labels, value in collect():
+                self.set(name, value, **labels)
+
+        lines = []
+        with self._lock:
+            for name, (kind, help_text) in METRICS.items():
+                full_name = PREFIX + name
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                for key, value in sorted(self._values[name].items()):
+                    if kind != "histogram":
+                        lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(DURATION_BUCKETS + (float("inf"),), value.bucket_counts):
+                        cumulative += count
+                        bucket_labels = _format_labels(key + (("le", _format_value(bound)),))
+                        lines.append(f"{full_name}_bucket{bucket_labels} {cumulative}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {_format_value(value.sum)}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def watch_storage(storage, metrics_registry=None):
+    """Publish task counts from `storage`'s incremental statistics.
+
+    Args:
+        storage (TaskStorage): Storage to report on.
+        metrics_registry (MetricsRegistry | None): Target registry, defaults
+            to the module `registry`.
+
+    Returns:
+        None
+    """
+    from .models import TaskStatus
+
+    def collect():
+        statistics = storage.statistics
+        for status in TaskStatus:
+            yield "tasks", {"status": status.value}, statistics.by_status[status]
+        yield "overdue_tasks", {}, statistics.count_overdue(datetime.now())
+        cache = storage.cache_info()
+        if cache is not None:
+            yield "task_cache_size", {}, cache["size"]
+            yield "task_cache_lookups_total", {"result": "hit"}, cache["hits"]
+            yield "task_cache_lookups_total", {"result": "miss"}, cache["misses"]
+            yield "task_cache_evictions_total", {}, cache["evictions"]
+            yield "task_cache_pinned", {}, cache["pinned"]
+
+    (metrics_registry or registry).add_collector("storage", collect)
+
+
+class FileSink:
+    """Write the metrics to a file, for example for a textfile collector.
+
+    Args:
+        path (str): Destination file. It is replaced atomically.
+    """
+
+    def __init__(self, path):
+        """Initialize the sink.
+
+        Returns:
+            None
+        """
+        self.path = path
+
+    def publish(self, metrics_registry):
+        """Write the current metrics.
+
+        Args:
+            metrics_registry (MetricsRegistry): Registry to render.
+
+        Returns:
+            None
+        """
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(metrics_registry.render())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        """Nothing to release for a file sink.
+
+        Returns:
+            None
+        """
+
+
+class HttpSink:
+    """Serve the metrics at `http://<host>:<port>/metrics`.
+
+    Args:
+        host (str): Interface to bind, local-only by default.
+        port (int): TCP port; 0 picks a free port (see `port` after publish).
+
+    Notes:
+        The server starts on the first `publish()` and renders the registry
+        on every scrape.
+    """
+
+    def __init__(self, host="127.0.0.1", port=9464):
+        """Initialize the sink without starting the server.
+
+        Returns:
+            None
+        """
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def publish(self, metrics_registry):
+        """Start serving `metrics_registry` if the server is not running yet.
+
+        Args:
+            metrics_registry (MetricsRegistry): Registry to serve.
+
+        Returns:
+            None
+        """
+        if self._server is not None:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics_registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+
+    def close(self):
+        """Stop the HTTP server.
+
+        Returns:
+            None
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
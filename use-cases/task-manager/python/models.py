@@ -1,6 +1,7 @@
 """Domain models for tasks and related enums."""
 
 # task_manager/models.py
+from copy import deepcopy
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -33,17 +34,32 @@ class Task:
         priority (TaskPriority): Priority level.
         due_date (datetime | None): Optional due date.
         tags (list[str] | None): Optional list of tags.
+        blocked_by (list[str] | None): IDs of tasks that must finish first.
+        recurrence (dict | None): Rule, start and exceptions of a recurring
+            task, built by `recurrence.make_recurrence()`.
 
     Example:
         >>> Task("Write docs")
         <...Task...>
 
     Notes:
-        IDs are generated as UUID4 strings on creation.
+        IDs are generated as UUID4 strings on creation. `update()`,
+        `mark_as_done()`, `add_tag()`, `remove_tag()`, `add_blocker()` and
+        `remove_blocker()` record the fields
+        they change in `changed_fields` until storage persists the task and
+        calls `mark_clean()`. Plain attribute assignment is not tracked.
+        Once `track_deltas()` was called, the same methods also queue each
+        change with the new values for the change history (see
+        `pop_deltas()` and `history.py`); `revision` counts the history
+        entries written for the task.
+        A recurring task has no due date of its own; its occurrences are
+        generated by `recurrence.iter_occurrences()`. `version` counts the
+        commits that wrote the task; storage uses it to detect changes made
+        by other processes.
     """
 
     def __init__(self, title, description="", priority=TaskPriority.MEDIUM,
-                 due_date=None, tags=None):
+                 due_date=None, tags=None, blocked_by=None, recurrence=None):
         """Initialize a new task instance.
 
         Args:
@@ -52,6 +68,8 @@ class Task:
             priority (TaskPriority): Priority level.
             due_date (datetime | None): Optional due date.
             tags (list[str] | None): Optional list of tags.
+            blocked_by (list[str] | None): IDs of blocking tasks.
+            recurrence (dict | None): Recurrence of a recurring task.
 
         Returns:
             None
@@ -66,6 +84,78 @@ class Task:
         self.due_date = due_date
         self.completed_at = None
         self.tags = tags or []
+        self.blocked_by = blocked_by or []
+        self.recurrence = recurrence
+        self.version = 0
+        self.revision = 0
+        self._changed = set()
+        self._deltas = None
+
+    @property
+    def changed_fields(self):
+        """frozenset[str]: Fields changed since the task was last persisted."""
+        return frozenset(self._changed)
+
+    @property
+    def is_dirty(self):
+        """bool: True when the task has changes that were not persisted."""
+        return bool(self._changed)
+
+    def mark_clean(self):
+        """Forget recorded changes, typically after the task was saved.
+
+        Returns:
+            None
+        """
+        self._changed.clear()
+        if self._deltas is not None:
+            self._deltas.clear()
+
+    def track_deltas(self):
+        """Start queueing changes for the change history.
+
+        Returns:
+            bool: True when changes are now queued. Untracked changes that
+            were not persisted yet would leave gaps, so tracking then only
+            starts with the next `pop_deltas()`.
+
+        Notes:
+            Tasks do not queue changes by default, so tasks kept without a
+            history never copy changed values.
+        """
+        if self._deltas is None and not self._changed:
+            self._deltas = []
+        return self._deltas is not None
+
+    def pop_deltas(self):
+        """Return and forget the changes queued for the change history.
+
+        Returns:
+            list[tuple[datetime, dict]]: One `(updated_at, {field: new value})`
+            pair per change, oldest first. Empty when changes were not
+            tracked; they are tracked from now on.
+
+        Example:
+            >>> task = Task("Do stuff")
+            >>> task.track_deltas()
+            True
+            >>> task.add_tag("home")
+            True
+            >>> [fields for _, fields in task.pop_deltas()]
+            [{'tags': ['home']}]
+        """
+        deltas = self._deltas or []
+        self._deltas = []
+        return deltas
+
+    def _touch(self, *fields, at=None):
+        self.updated_at = at or datetime.now()
+        self._changed.update(fields)
+        self._changed.add("updated_at")
+        if self._deltas is None:
+            return
+        # Copy lists and dicts so later in-place edits do not rewrite this change
+        self._deltas.append((self.updated_at, {field: deepcopy(getattr(self, field)) for field in fields}))
 
     def update(self, **kwargs):
         """Update mutable fields using keyword arguments.
@@ -74,16 +164,123 @@ class Task:
             **kwargs: Field-value pairs to update.
 
         Returns:
-            None
+            set[str]: Names of the fields whose value changed. When nothing
+            changed, `updated_at` is left alone and the set is empty.
 
         Example:
             >>> task = Task("Do stuff")
             >>> task.update(title="Do more stuff")
+            {'title'}
+        """
+        changed = {
+            key for key, value in kwargs.items()
+            if hasattr(self, key) and getattr(self, key) != value
+        }
+        for key in changed:
+            setattr(self, key, kwargs[key])
+        if changed:
+            self._touch(*changed)
+        return changed
+
+    def add_tag(self, tag):
+        """Add a tag unless the task already carries it.
+
+        Args:
+            tag (str): Tag to add.
+
+        Returns:
+            bool: True when the tag was added.
+        """
+        if tag in self.tags:
+            return False
+        self.tags.append(tag)
+        self._touch("tags")
+        return True
+
+    def remove_tag(self, tag):
+        """Remove a tag from the task.
+
+        Args:
+            tag (str): Tag to remove.
+
+        Returns:
+            bool: True when the tag was present and removed.
+        """
+        if tag not in self.tags:
+            return False
+        self.tags.remove(tag)
+        self._touch("tags")
+        return True
+
+    def add_blocker(self, task_id):
+        """Record that another task must finish before this one.
+
+        Args:
+            task_id (str): ID of the blocking task.
+
+        Returns:
+            bool: True when the blocker was added.
+
+        Notes:
+            Cycles are rejected by storage (`TaskStorage.add_dependency()`),
+            not here.
+        """
+        if task_id in self.blocked_by:
+            return False
+        self.blocked_by.append(task_id)
+        self._touch("blocked_by")
+        return True
+
+    def remove_blocker(self, task_id):
+        """Drop a blocking task.
+
+        Args:
+            task_id (str): ID of the blocking task.
+
+        Returns:
+            bool: True when the blocker was present and removed.
+        """
+        if task_id not in self.blocked_by:
+            return False
+        self.blocked_by.remove(task_id)
+        self._touch("blocked_by")
+        return True
+
+    def set_occurrence_status(self, day, status):
+        """Record the status of one occurrence of a recurring task.
+
+        Args:
+            day (date): Occurrence date.
+            status (TaskStatus): New status; TODO removes the exception.
+
+        Returns:
+            bool: True when the recorded status changed.
+
+        Raises:
+            ValueError: If the task is not recurring.
+
+        Notes:
+            Exceptions are stored as `{"status": ..., "completed_at": ...}`;
+            `completed_at` is only set for DONE. Older files hold the bare
+            status string, which is still read.
         """
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-        self.updated_at = datetime.now()
+        if self.recurrence is None:
+            raise ValueError("Task is not recurring")
+        exceptions = self.recurrence["exceptions"]
+        key = day.isoformat()
+        current = exceptions.get(key, TaskStatus.TODO.value)
+        if isinstance(current, dict):
+            current = current["status"]
+        if current == status.value:
+            return False
+        if status == TaskStatus.TODO:
+            del exceptions[key]
+        elif status == TaskStatus.DONE:
+            exceptions[key] = {"status": status.value, "completed_at": datetime.now().isoformat()}
+        else:
+            exceptions[key] = {"status": status.value}
+        self._touch("recurrence")
+        return True
 
     def mark_as_done(self):
         """Mark the task as done and stamp completion time.
@@ -99,7 +296,7 @@ class Task:
         """
         self.status = TaskStatus.DONE
         self.completed_at = datetime.now()
-        self.updated_at = self.completed_at
+        self._touch("status", "completed_at", at=self.completed_at)
 
     def is_overdue(self):
         """Check if the task is overdue and not completed.
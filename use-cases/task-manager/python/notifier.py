@@ -0,0 +1,408 @@
+"""Due-date notifications driven by a hierarchical timer wheel.
+
+`DueDateNotifier` calls back when an open task is about to become due, when
+it becomes overdue and when the sweeper would abandon it, instead of
+polling the due-date index. `TaskStorage` reports every due-date, priority
+or status change to it (see `TaskStorage.watch_due_dates()`), so deadlines
+are rescheduled as tasks change, and a background thread or asyncio task
+sleeps until the next deadline.
+
+Deadlines are kept in `TimerWheel`, a hierarchy of 64-slot wheels as in
+Varghese and Lauck's hashed hierarchical timing wheels (and the Linux
+kernel timers): inserting and cancelling a timer cost O(1), and each timer
+is moved down at most once per level before it fires.
+"""
+
+# task_manager/notifier.py
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+from .metrics import registry as metrics
+from .models import TaskPriority
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 5
+MAX_DELTA = (1 << (SLOT_BITS * LEVELS)) - 1
+EVENTS = ("due_soon", "overdue", "abandon")
+_KEEP_PRIORITIES = (TaskPriority.HIGH, TaskPriority.URGENT)
+
+
+class TimerWheel:
+    """Timers keyed by ID on a hierarchy of wheels of `SLOTS` slots.
+
+    Level 0 holds timers due in the next 64 ticks, level 1 those due in the
+    next 64², and so on; with one-second ticks the five levels cover 34
+    years, and later timers wait in the last level until they come in range.
+
+    Args:
+        start_tick (int): First tick that `advance()` will process.
+
+    Example:
+        >>> wheel = TimerWheel(start_tick=0)
+        >>> wheel.schedule("a", 70, "late")
+        >>> wheel.schedule("b", 5)
+        >>> wheel.advance(10)
+        [('b', 5, None)]
+        >>> wheel.advance(100)
+        [('a', 70, 'late')]
+
+    Notes:
+        Not thread-safe; `DueDateNotifier` serializes access.
+    """
+
+    def __init__(self, start_tick=0):
+        """Create empty wheels.
+
+        Returns:
+            None
+        """
+        self._levels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self._counts = [0] * LEVELS
+        self._where = {}
+        self._expired = {}
+        self.next_tick = start_tick
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def schedule(self, key, tick, payload=None):
+        """Set the timer of `key`, replacing any timer it already has.
+
+        Args:
+            key (Hashable): Timer ID.
+            tick (int): Tick at which the timer fires; ticks that were
+                already processed fire on the next `advance()`.
+            payload (object): Returned with the timer when it fires.
+
+        Returns:
+            None
+        """
+        self.cancel(key)
+        self._place(key, tick, payload)
+
+    def _place(self, key, tick, payload):
+        delta = tick - self.next_tick
+        if delta < 0:
+            self._expired[key] = (tick, payload)
+            self._where[key] = None
+            return
+        delta = min(delta, MAX_DELTA)
+        level = (delta.bit_length() - 1) // SLOT_BITS if delta else 0
+        slot = ((self.next_tick + delta) >> (SLOT_BITS * level)) & SLOT_MASK
+        self._levels[level][slot][key] = (tick, payload)
+        self._counts[level] += 1
+        self._where[key] = (level, slot)
+
+    def cancel(self, key):
+        """Remove the timer of `key`.
+
+        Args:
+            key (Hashable): Timer ID.
+
+        Returns:
+            bool: True when a timer was removed.
+        """
+        if key not in self._where:
+            return False
+        location = self._where.pop(key)
+        if location is None:
+            del self._expired[key]
+        else:
+            level, slot = location
+            del self._levels[level][slot][key]
+            self._counts[level] -= 1
+        return True
+
+    def _cascade(self, level, slot):
+        timers = self._levels[level][slot]
+        if timers:
+            self._levels[level][slot] = {}
+            self._counts[level] -= len(timers)
+            for key, (tick, payload) in timers.items():
+                self._place(key, tick, payload)
+
+    def advance(self, tick):
+        """Process every tick up to and including `tick`.
+
+        Args:
+            tick (int): Current tick.
+
+        Returns:
+            list[tuple]: `(key, tick, payload)` of the fired timers, in the
+            order they were due.
+        """
+        fired = [(key, due, payload) for key, (due, payload) in self._expired.items()]
+        for key, _, _ in fired:
+            del self._where[key]
+        self._expired.clear()
+        levels = self._levels
+        counts = self._counts
+        while self.next_tick <= tick:
+            current = self.next_tick
+            if not self._where:
+                self.next_tick = tick + 1
+                break
+            index = current & SLOT_MASK
+            if index == 0:
+                for level in range(1, LEVELS):
+                    slot = (current >> (SLOT_BITS * level)) & SLOT_MASK
+                    self._cascade(level, slot)
+                    if slot:
+                        break
+            elif not counts[0]:
+                # Nothing can fire before the lowest non-empty level cascades
+                level = 1
+                while level < LEVELS - 1 and not counts[level]:
+                    level += 1
+                self.next_tick = min((current | ((1 << (SLOT_BITS * level)) - 1)) + 1, tick + 1)
+                continue
+            timers = levels[0][index]
+            if timers:
+                levels[0][index] = {}
+                counts[0] -= len(timers)
+                for key, (due, payload) in timers.items():
+                    del self._where[key]
+                    fired.append((key, due, payload))
+            self.next_tick = current + 1
+        return fired
+
+    def next_due_tick(self):
+        """Return a tick at or before the next timer, without moving the wheels.
+
+        Returns:
+            int | None: The tick of the earliest timer on level 0 or the next
+            cascade that can move timers down, whichever comes first; None
+            when no timer is set.
+        """
+        if self._expired:
+            return self.next_tick - 1
+        if not self._where:
+            return None
+        boundary = (self.next_tick + SLOT_MASK) & ~SLOT_MASK
+        if self._counts[0]:
+            level0 = self._levels[0]
+            for offset in range(SLOTS):
+                if level0[(self.next_tick + offset) & SLOT_MASK]:
+                    return min(self.next_tick + offset, boundary)
+        if boundary == self.next_tick:
+            return boundary
+        level = 1
+        while level < LEVELS - 1 and not self._counts[level]:
+            level += 1
+        mask = (1 << (SLOT_BITS * level)) - 1
+        return (self.next_tick + mask) & ~mask
+
+
+class DueDateNotifier:
+    """Call back when open tasks reach their due dates.
+
+    Args:
+        storage (TaskStorage): Storage whose due dates are watched.
+        on_due_soon (Callable[[str, datetime], None] | None): Called with the
+            task ID and due date `due_soon` before a task is due.
+        on_overdue (Callable[[str, datetime], None] | None): Called when a
+            task becomes overdue.
+        on_abandon (Callable[[str, datetime], None] | None): Called when a
+            task has been overdue for `grace_period` and is not HIGH or
+            URGENT, i.e. when the sweeper would abandon it.
+        due_soon (timedelta): Warning time before the due date.
+        grace_period (timedelta): Overdue age at which tasks are abandoned.
+        resolution (timedelta): Length of one wheel tick; callbacks run at
+            most this late.
+
+    Example:
+        >>> from .storage import TaskStorage
+        >>> notifier = DueDateNotifier(TaskStorage("tasks.json"), on_overdue=print)
+        >>> notifier.run_pending()
+        []
+
+    Notes:
+        Each task has at most one timer, for its next event; when it fires
+        the following event is scheduled. Events that are already in the
+        past when a task is first seen or changed are not reported, so
+        starting a notifier does not replay the overdue backlog. Callbacks
+        run outside the storage lock, on the notifier's thread or event
+        loop. Changes committed by other processes are picked up through
+        `TaskStorage.maybe_refresh()`.
+    """
+
+    def __init__(self, storage, on_due_soon=None, on_overdue=None, on_abandon=None,
+                 due_soon=timedelta(hours=1), grace_period=timedelta(days=7),
+                 resolution=timedelta(seconds=1)):
+        """Schedule the open tasks with due dates and watch for changes.
+
+        Returns:
+            None
+        """
+        self.storage = storage
+        self.callbacks = {"due_soon": on_due_soon, "overdue": on_overdue, "abandon": on_abandon}
+        self.offsets = (-due_soon, timedelta(0), grace_period)
+        self._resolution = resolution.total_seconds()
+        self._lock = threading.Lock()
+        self._wheel = TimerWheel(self._tick(datetime.now()))
+        self._tasks = {}
+        self._wake_tick = float("-inf")
+        self._wakeup = threading.Event()
+        self._async_wakeup = None
+        self._thread = None
+        self._stopping = False
+        storage.watch_due_dates(self._on_change)
+
+    def __len__(self):
+        return len(self._wheel)
+
+    def _tick(self, moment):
+        # Round up so that no event fires before its time
+        return int(-(-moment.timestamp() // self._resolution))
+
+    def _on_change(self, task_id, due_date, priority):
+        """Reschedule a task after storage reported a change."""
+        abandonable = priority not in _KEEP_PRIORITIES
+        with self._lock:
+            if due_date is None:
+                self._tasks.pop(task_id, None)
+                self._wheel.cancel(task_id)
+                return
+            if self._tasks.get(task_id) == (due_date, abandonable):
+                return
+            self._wheel.cancel(task_id)
+            self._tasks.pop(task_id, None)
+            self._schedule(task_id, due_date, abandonable, 0, self._wheel.next_tick)
+
+    def _schedule(self, task_id, due_date, abandonable, first_event, earliest_tick):
+        """Set the timer for the first enabled event not before `earliest_tick`."""
+        for index in range(first_event, len(EVENTS)):
+            event = EVENTS[index]
+            if self.callbacks[event] is None or (event == "abandon" and not abandonable):
+                continue
+            tick = self._tick(due_date + self.offsets[index])
+            if tick < earliest_tick:
+                continue
+            self._tasks[task_id] = (due_date, abandonable)
+            self._wheel.schedule(task_id, tick, index)
+            if tick < self._wake_tick:
+                self._wake()
+            return True
+        return False
+
+    def run_pending(self, now=None):
+        """Fire the callbacks of every event due by `now`.
+
+        Args:
+            now (datetime | None): Reference time, defaults to now.
+
+        Returns:
+            list[tuple[str, str, datetime]]: `(event, task_id, due_date)` for
+            every event fired, in order.
+        """
+        fired = []
+        tick = self._tick(now or datetime.now())
+        with self._lock:
+            batch = self._wheel.advance(tick)
+            while batch:
+                for task_id, _, index in batch:
+                    due_date, abandonable = self._tasks.pop(task_id)
+                    fired.append((EVENTS[index], task_id, due_date))
+                    # Later events that are already due fire in the next batch
+                    self._schedule(task_id, due_date, abandonable, index + 1, float("-inf"))
+                batch = self._wheel.advance(tick)
+        for event, task_id, due_date in fired:
+            metrics.inc("notifications_total", event=event)
+            try:
+                self.callbacks[event](task_id, due_date)
+            except Exception as e:
+                print(f"Error in {event} callback for task {task_id}: {e}")
+        return fired
+
+    def _seconds_until_next(self):
+        with self._lock:
+            tick = self._wheel.next_due_tick()
+            self._wake_tick = float("inf") if tick is None else tick
+        timeout = None
+        if tick is not None:
+            timeout = max(tick * self._resolution - datetime.now().timestamp(), 0)
+        if self.storage.refresh_interval is not None:
+            timeout = self.storage.refresh_interval if timeout is None else min(timeout, self.storage.refresh_interval)
+        return timeout
+
+    def _wake(self):
+        self._wakeup.set()
+        if self._async_wakeup is not None:
+            self._async_wakeup()
+
+    def start(self):
+        """Fire callbacks from a background thread until `stop()`.
+
+        Returns:
+            None
+
+        Notes:
+            The thread is a daemon and does not keep the interpreter alive.
+        """
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="due-date-notifier", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread started by `start()`.
+
+        Returns:
+            None
+        """
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                self.storage.maybe_refresh()
+                self.run_pending()
+            except Exception as e:
+                print(f"Error notifying due dates: {e}")
+            self._wakeup.wait(self._seconds_until_next())
+
+    async def run_async(self):
+        """Fire callbacks from the running event loop until cancelled.
+
+        Returns:
+            None
+
+        Example:
+            >>> task = asyncio.create_task(notifier.run_async())  # doctest: +SKIP
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        self._async_wakeup = lambda: loop.call_soon_threadsafe(wakeup.set)
+        try:
+            while True:
+                wakeup.clear()
+                self.storage.maybe_refresh()
+                self.run_pending()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self._seconds_until_next())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._async_wakeup = None
+
+    def close(self):
+        """Stop the thread and stop watching the storage.
+
+        Returns:
+            None
+        """
+        self.stop()
+        self.storage.unwatch_due_dates(self._on_change)
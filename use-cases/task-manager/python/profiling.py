@@ -0,0 +1,286 @@
+"""Opt-in timing instrumentation for storage, manager and CLI operations."""
+
+# task_manager/profiling.py
+import functools
+import os
+import sys
+import types
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+PROFILE_ENV_VAR = "TASK_MANAGER_PROFILE"
+PROFILE_DUMP_ENV_VAR = "TASK_MANAGER_PROFILE_DUMP"
+MAX_SAMPLES = 10000
+PERCENTILES = (50, 95, 99)
+# Same value as inspect.CO_GENERATOR; inspect itself is slow to import
+_CO_GENERATOR = 0x20
+
+_NULL_SPAN = nullcontext()
+
+
+class _Operation:
+    __slots__ = ("count", "total", "samples", "bytes_read", "bytes_written")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Profiler:
+    """Collect per-operation call counts, latencies and I/O byte counts.
+
+    Args:
+        enabled (bool): Start collecting right away.
+
+    Example:
+        >>> profiler = Profiler(enabled=True)
+        >>> profiler.record("storage.save", 0.002, bytes_written=512)
+        >>> profiler.report()["storage.save"]["count"]
+        1
+
+    Notes:
+        When disabled, instrumented functions cost one attribute check per
+        call. Latency percentiles are computed over the most recent
+        `MAX_SAMPLES` calls of each operation; counts and totals are exact.
+    """
+
+    def __init__(self, enabled=False):
+        """Initialize an empty profiler.
+
+        Returns:
+            None
+        """
+        self.enabled = enabled
+        self._operations = {}
+
+    def reset(self):
+        """Forget all recorded operations.
+
+        Returns:
+            None
+        """
+        self._operations = {}
+
+    def _operation(self, name):
+        operation = self._operations.get(name)
+        if operation is None:
+            operation = self._operations[name] = _Operation()
+        return operation
+
+    def record(self, name, seconds, bytes_read=0, bytes_written=0):
+        """Record one completed call of `name`.
+
+        Args:
+            name (str): Operation name, for example "TaskStorage.load".
+            seconds (float): Wall-clock duration.
+            bytes_read (int): Bytes read from disk by the call.
+            bytes_written (int): Bytes written to disk by the call.
+
+        Returns:
+            None
+        """
+        operation = self._operation(name)
+        operation.count += 1
+        operation.total += seconds
+        operation.samples.append(seconds)
+        operation.bytes_read += bytes_read
+        operation.bytes_written += bytes_written
+
+    def add_bytes(self, name, read=0, written=0):
+        """Attribute I/O to an operation without counting a call.
+
+        Args:
+            name (str): Operation name.
+            read (int): Bytes read.
+            written (int): Bytes written.
+
+        Returns:
+            None
+        """
+        if self.enabled:
+            operation = self._operation(name)
+            operation.bytes_read += read
+            operation.bytes_written += written
+
+    def span(self, name):
+        """Time a block of code as one call of `name`.
+
+        Args:
+            name (str): Operation name.
+
+        Returns:
+            ContextManager: A timing context, or a shared no-op context when
+            the profiler is disabled.
+
+        Example:
+            >>> with Profiler().span("cli.format"):
+            ...     pass
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._timed_span(name)
+
+    @contextmanager
+    def _timed_span(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def report(self):
+        """Summarize the recorded operations.
+
+        Returns:
+            dict: Maps operation names to `count`, `total`, `mean`, `p50`,
+            `p95`, `p99`, `max` (seconds), `bytes_read` and `bytes_written`.
+        """
+        summary = {}
+        for name, operation in self._operations.items():
+            ordered = sorted(operation.samples)
+            entry = {
+                "count": operation.count,
+                "total": operation.total,
+                "mean": operation.total / operation.count if operation.count else 0.0,
+                "max": ordered[-1] if ordered else 0.0,
+                "bytes_read": operation.bytes_read,
+                "bytes_written": operation.bytes_written,
+            }
+            for percent in PERCENTILES:
+                entry[f"p{percent}"] = _percentile(ordered, percent)
+            summary[name] = entry
+        return summary
+
+    def format_report(self):
+        """Render `report()` as a table sorted by total time.
+
+        Returns:
+            str: Human-readable report, one line per operation.
+        """
+        rows = sorted(self.report().items(), key=lambda item: item[1]["total"], reverse=True)
+        lines = [
+            f"{'operation':<36} {'count':>7} {'total ms':>10} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'read B':>10} {'written B':>10}"
+        ]
+        for name, entry in rows:
+            lines.append(
+                f"{name:<36} {entry['count']:>7} {entry['total'] * 1000:>10.2f} "
+                f"{entry['p50'] * 1000:>8.3f} {entry['p95'] * 1000:>8.3f} {entry['p99'] * 1000:>8.3f} "
+                f"{entry['bytes_read']:>10} {entry['bytes_written']:>10}"
+            )
+        return "\n".join(lines)
+
+    @contextmanager
+    def session(self, dump_path=None, out=None):
+        """Profile everything run inside the block and report at the end.
+
+        Args:
+            dump_path (str | None): Also run cProfile and write its stats to
+                this file (readable with `python -m pstats`).
+            out (TextIO | None): Stream for the report, defaults to stderr.
+
+        Yields:
+            Profiler: This profiler, enabled and reset.
+        """
+        was_enabled = self.enabled
+        self.reset()
+        self.enabled = True
+        cprofile = None
+        if dump_path:
+            import cProfile
+
+            cprofile = cProfile.Profile()
+            cprofile.enable()
+        try:
+            yield self
+        finally:
+            if cprofile is not None:
+                cprofile.disable()
+                cprofile.dump_stats(dump_path)
+            self.enabled = was_enabled
+            print(self.format_report(), file=out or sys.stderr)
+
+
+profiler = Profiler(enabled=bool(os.environ.get(PROFILE_ENV_VAR)))
+
+
+def _timed_iteration(name, iterator):
+    """Yield from `iterator`, timing only the work done inside it."""
+    elapsed = 0.0
+    try:
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += perf_counter() - start
+            yield item
+    finally:
+        profiler.record(name, elapsed)
+
+
+def timed(name):
+    """Decorate a function so each call is recorded by `profiler` as `name`.
+
+    Args:
+        name (str): Operation name.
+
+    Returns:
+        Callable: Decorator. Generator functions are timed over the whole
+        iteration, excluding the time the consumer spends between items.
+
+    Example:
+        >>> @timed("algo.example")
+        ... def example():
+        ...     return 1
+        >>> example()
+        1
+    """
+    def decorate(func):
+        if func.__code__.co_flags & _CO_GENERATOR:
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not profiler.enabled:
+                    return func(*args, **kwargs)
+                return _timed_iteration(name, func(*args, **kwargs))
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def instrument_methods(cls):
+    """Class decorator applying `timed()` to every public method of `cls`.
+
+    Args:
+        cls (type): Class to instrument.
+
+    Returns:
+        type: The same class, with methods recorded as `<Class>.<method>`.
+    """
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and isinstance(value, types.FunctionType):
+            setattr(cls, attr, timed(f"{cls.__name__}.{attr}")(value))
+    return cls
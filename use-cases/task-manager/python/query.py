@@ -0,0 +1,330 @@
+"""Compound task queries planned against the storage indexes."""
+
+# task_manager/query.py
+import heapq
+from datetime import datetime
+from urllib.parse import quote, unquote
+
+from .algo import calculate_task_score
+from .models import TaskPriority, TaskStatus
+from .profiling import timed
+
+SORT_KEYS = {
+    "created": lambda task: task.created_at,
+    "updated": lambda task: task.updated_at,
+    "due": lambda task: (task.due_date is None, task.due_date or datetime.min),
+    "priority": lambda task: task.priority.value,
+    "status": lambda task: task.status.value,
+    "title": lambda task: task.title.lower(),
+    "score": lambda task: -calculate_task_score(task),
+}
+
+# Sort keys with an ordered storage index, so unlimited listings stream
+ORDERED_SORT_KEYS = ("created", "due")
+
+_CURSOR_CODECS = {
+    "created": (datetime.isoformat, datetime.fromisoformat),
+    "updated": (datetime.isoformat, datetime.fromisoformat),
+    "due": (
+        lambda value: "" if value[0] else value[1].isoformat(),
+        lambda text: (False, datetime.fromisoformat(text)) if text else (True, datetime.min),
+    ),
+    "priority": (str, int),
+    "status": (str, str),
+    "title": (str, str),
+    "score": (repr, float),
+}
+
+
+def encode_cursor(task, sort_by="created"):
+    """Encode the pagination cursor of the last task on a page.
+
+    Args:
+        task (Task): Last task shown.
+        sort_by (str): Sort key of the listing.
+
+    Returns:
+        str: `<sort value>,<task ID>`, with the value percent-encoded so the
+        cursor can be passed on a command line unquoted.
+
+    Example:
+        >>> from .models import Task
+        >>> encode_cursor(Task("Plan"), "title").startswith("plan,")
+        True
+
+    Notes:
+        The cursor carries the sort value itself, so the next page starts at
+        the same place even if the task was changed or deleted since.
+    """
+    encode, _ = _CURSOR_CODECS[sort_by]
+    return f"{quote(encode(SORT_KEYS[sort_by](task)), safe=':')},{task.id}"
+
+
+def decode_cursor(cursor, sort_by="created"):
+    """Decode a cursor from `encode_cursor()`.
+
+    Args:
+        cursor (str): Encoded cursor.
+        sort_by (str): Sort key of the listing; must match the one used to
+            encode the cursor.
+
+    Returns:
+        tuple: `(sort_value, task_id)`, as built by `TaskQuery.cursor_for()`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    value, separator, task_id = cursor.rpartition(",")
+    if not separator or not task_id:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    _, decode = _CURSOR_CODECS[sort_by]
+    return decode(unquote(value)), task_id
+
+
+class TaskQuery:
+    """A combination of task filters plus a sort order.
+
+    All given filters must match (logical AND). Filters left as None are not
+    applied.
+
+    Args:
+        statuses (Iterable[TaskStatus] | None): Allowed statuses.
+        min_priority (TaskPriority | None): Lowest allowed priority.
+        max_priority (TaskPriority | None): Highest allowed priority.
+        tags_any (Iterable[str] | None): Task must carry at least one tag.
+        tags_all (Iterable[str] | None): Task must carry every tag.
+        due_after (datetime | None): Inclusive lower bound for the due date.
+        due_before (datetime | None): Exclusive upper bound for the due date.
+        overdue (bool): Only tasks that are overdue at query time.
+        text (str | None): Case-insensitive substring of title or description.
+        sort_by (str): One of `SORT_KEYS`.
+        reverse (bool): Reverse the sort order.
+        limit (int | None): Maximum number of results.
+        after (tuple | None): Position from `cursor_for()` or
+            `decode_cursor()`; only results that come after it in the sort
+            order are returned.
+
+    Example:
+        >>> from .storage import TaskStorage
+        >>> query = TaskQuery(statuses=[TaskStatus.TODO], tags_all=["work"])
+        >>> query.run(TaskStorage("tasks.json"))
+        ...
+
+    Raises:
+        ValueError: If `sort_by` is not a known sort key.
+    """
+
+    def __init__(self, statuses=None, min_priority=None, max_priority=None,
+                 tags_any=None, tags_all=None, due_after=None, due_before=None,
+                 overdue=False, text=None, sort_by="created", reverse=False,
+                 limit=None, after=None):
+        """Initialize the query.
+
+        Returns:
+            None
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        self.statuses = set(statuses) if statuses else None
+        self.min_priority = min_priority
+        self.max_priority = max_priority
+        self.tags_any = set(tags_any) if tags_any else None
+        self.tags_all = set(tags_all) if tags_all else None
+        self.due_after = due_after
+        self.due_before = due_before
+        self.overdue = overdue
+        self.text = text.lower() if text else None
+        self.sort_by = sort_by
+        self.reverse = reverse
+        self.limit = limit
+        self.after = after
+
+    def _priorities(self):
+        low = self.min_priority.value if self.min_priority else TaskPriority.LOW.value
+        high = self.max_priority.value if self.max_priority else TaskPriority.URGENT.value
+        return [priority for priority in TaskPriority if low <= priority.value <= high]
+
+    def _index_sources(self, storage, now):
+        """Yield `(estimated_size, fetch_ids)` for every indexed filter."""
+        if self.statuses is not None:
+            sets = [storage.ids_by_status(status) for status in self.statuses]
+            yield sum(len(ids) for ids in sets), lambda sets=sets: set().union(*sets)
+
+        if self.min_priority is not None or self.max_priority is not None:
+            sets = [storage.ids_by_priority(priority) for priority in self._priorities()]
+            yield sum(len(ids) for ids in sets), lambda sets=sets: set().union(*sets)
+
+        if self.tags_all is not None:
+            for tag in self.tags_all:
+                ids = storage.ids_by_tag(tag)
+                yield len(ids), lambda ids=ids: set(ids)
+
+        if self.tags_any is not None:
+            sets = [storage.ids_by_tag(tag) for tag in self.tags_any]
+            yield sum(len(ids) for ids in sets), lambda sets=sets: set().union(*sets)
+
+        due_before = self.due_before
+        if self.overdue and (due_before is None or now < due_before):
+            due_before = now
+        if self.due_after is not None or due_before is not None:
+            yield (storage.count_due_between(self.due_after, due_before),
+                   lambda: storage.ids_due_between(self.due_after, due_before))
+
+    @timed("TaskQuery.plan")
+    def plan(self, storage, now=None):
+        """Pick candidate task IDs using the most selective indexes.
+
+        Args:
+            storage (TaskStorage): Storage providing the indexes.
+            now (datetime | None): Reference time for `overdue`.
+
+        Returns:
+            set[str] | None: Candidate IDs, or None when no indexed filter
+            applies and every task is a candidate.
+
+        Notes:
+            Sources are ordered by estimated size. The smallest one is
+            materialized, and the others are intersected while they are no
+            larger than the candidate set.
+        """
+        now = now or datetime.now()
+        sources = sorted(self._index_sources(storage, now), key=lambda source: source[0])
+        if not sources:
+            return None
+
+        _, fetch = sources[0]
+        candidates = fetch()
+        for size, fetch in sources[1:]:
+            if not candidates or size > len(candidates):
+                break
+            candidates &= fetch()
+        return candidates
+
+    def matches(self, task, now=None):
+        """Check a single task against every filter.
+
+        Args:
+            task (Task): Task to check.
+            now (datetime | None): Reference time for `overdue`.
+
+        Returns:
+            bool: True when the task satisfies the query.
+        """
+        if self.statuses is not None and task.status not in self.statuses:
+            return False
+        if self.min_priority is not None and task.priority.value < self.min_priority.value:
+            return False
+        if self.max_priority is not None and task.priority.value > self.max_priority.value:
+            return False
+        if self.tags_all is not None and not self.tags_all.issubset(task.tags):
+            return False
+        if self.tags_any is not None and self.tags_any.isdisjoint(task.tags):
+            return False
+        if self.due_after is not None and (task.due_date is None or task.due_date < self.due_after):
+            return False
+        if self.due_before is not None and (task.due_date is None or task.due_date >= self.due_before):
+            return False
+        if self.overdue and not (task.due_date and task.due_date < (now or datetime.now())
+                                 and task.status != TaskStatus.DONE):
+            return False
+        if self.text is not None and self.text not in task.title.lower() \
+                and self.text not in (task.description or "").lower():
+            return False
+        return True
+
+    def cursor_for(self, task):
+        """Build the pagination cursor for `task` under this sort order.
+
+        Args:
+            task (Task): Last task seen on the previous page.
+
+        Returns:
+            tuple: `(sort_value, task_id)`; the ID breaks ties so paging is
+            stable.
+        """
+        return SORT_KEYS[self.sort_by](task), task.id
+
+    def _is_after_cursor(self, task):
+        if self.reverse:
+            return self.cursor_for(task) < self.after
+        return self.cursor_for(task) > self.after
+
+    @timed("TaskQuery.iter_results")
+    def iter_results(self, storage, now=None):
+        """Lazily yield the tasks matching the query.
+
+        Args:
+            storage (TaskStorage): Storage to query.
+            now (datetime | None): Reference time for `overdue`.
+
+        Yields:
+            Task: Matching tasks in the requested order.
+
+        Notes:
+            Candidate tasks are filtered as a stream. With a `limit`, only the
+            best `limit` tasks are kept while streaming, so memory stays
+            bounded by the page size. Without one, listings sorted by
+            `ORDERED_SORT_KEYS` walk the storage index in order from the
+            cursor on, so the first results come without sorting the rest;
+            only a small candidate set is sorted instead.
+        """
+        now = now or datetime.now()
+        with storage.lock:
+            candidate_ids = self.plan(storage, now)
+            walk = self.limit is None and self.sort_by in ORDERED_SORT_KEYS and (
+                candidate_ids is None or len(candidate_ids) * 4 >= len(storage.tasks))
+            if not walk:
+                candidate_ids = list(storage.tasks) if candidate_ids is None else list(candidate_ids)
+
+        if walk:
+            ids = self._ordered_ids(storage)
+            if candidate_ids is not None:
+                ids = (task_id for task_id in ids if task_id in candidate_ids)
+            tasks = (task for task in map(storage.tasks.get, ids) if task is not None)
+            yield from (task for task in tasks if self.matches(task, now))
+            return
+        tasks = (task for task in map(storage.tasks.get, candidate_ids) if task is not None)
+        yield from self.select(tasks, now)
+
+    def _ordered_ids(self, storage):
+        if self.sort_by == "created":
+            return storage.iter_ids_by_created(self.after, self.reverse)
+        after = self.after
+        if after is not None:
+            (undated, due_date), task_id = after
+            after = (None if undated else due_date, task_id)
+        return storage.iter_ids_by_due(after, self.reverse)
+
+    def select(self, tasks, now=None):
+        """Filter, sort and page an arbitrary stream of tasks.
+
+        Args:
+            tasks (Iterable[Task]): Tasks to check, for example archived ones
+                that are not in the storage indexes.
+            now (datetime | None): Reference time for `overdue`.
+
+        Yields:
+            Task: Matching tasks in the requested order.
+        """
+        now = now or datetime.now()
+        matches = (task for task in tasks if self.matches(task, now))
+        if self.after is not None:
+            matches = (task for task in matches if self._is_after_cursor(task))
+
+        if self.limit is not None:
+            select = heapq.nlargest if self.reverse else heapq.nsmallest
+            yield from select(self.limit, matches, key=self.cursor_for)
+        else:
+            yield from sorted(matches, key=self.cursor_for, reverse=self.reverse)
+
+    def run(self, storage, now=None):
+        """Execute the query against `storage`.
+
+        Args:
+            storage (TaskStorage): Storage to query.
+            now (datetime | None): Reference time for `overdue`.
+
+        Returns:
+            list[Task]: Matching tasks in the requested order.
+        """
+        return list(self.iter_results(storage, now))
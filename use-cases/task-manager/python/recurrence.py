@@ -0,0 +1,331 @@
+"""Recurring tasks expanded lazily into occurrences.
+
+A recurring task is stored once, as a series: its `recurrence` field holds
+the rule, the first due date and a map of exceptions, and it has no due date
+of its own. Occurrences are generated on demand for a time window and are
+never written to the task file. Completing (or abandoning) one occurrence
+only adds a `"YYYY-MM-DD": {"status": ..., "completed_at": ...}` entry to
+the exceptions.
+
+Rules are written as `<frequency>[/<interval>][:<days>]`:
+
+    daily                every day
+    daily/3              every third day
+    weekly:mon,fri       Mondays and Fridays
+    weekly/2             every other week, on the weekday of the start date
+    monthly:1,15         the 1st and 15th of every month (shorter months skip
+                         days they do not have)
+"""
+
+# task_manager/recurrence.py
+import calendar
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+from .models import Task, TaskStatus
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+OCCURRENCE_SEPARATOR = "@"
+_STATUSES = {status.value: status for status in TaskStatus}
+
+
+class RecurrenceRule:
+    """When a recurring task comes due.
+
+    Args:
+        frequency (str): "daily", "weekly" or "monthly".
+        interval (int): Repeat every `interval` days, weeks or months.
+        days (Iterable[int] | None): Weekdays (0 = Monday) for weekly rules or
+            days of the month for monthly rules; defaults to the start date's.
+
+    Raises:
+        ValueError: If the frequency, interval or days are invalid.
+
+    Example:
+        >>> rule = RecurrenceRule.parse("weekly:mon,wed")
+        >>> [d.day for d in rule.iter_dates(datetime(2026, 1, 1), end=datetime(2026, 1, 15))]
+        [5, 7, 12, 14]
+    """
+
+    def __init__(self, frequency, interval=1, days=None):
+        """Validate and store the rule.
+
+        Returns:
+            None
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency: {frequency}")
+        if interval < 1:
+            raise ValueError("Interval must be at least 1")
+        days = sorted(set(days)) if days else None
+        if days and frequency == "daily":
+            raise ValueError("Daily rules take no days")
+        if days and frequency == "weekly" and not all(0 <= day <= 6 for day in days):
+            raise ValueError("Weekdays must be between 0 (Monday) and 6 (Sunday)")
+        if days and frequency == "monthly" and not all(1 <= day <= 31 for day in days):
+            raise ValueError("Days of the month must be between 1 and 31")
+        self.frequency = frequency
+        self.interval = interval
+        self.days = days
+
+    @classmethod
+    def parse(cls, text):
+        """Parse a rule such as "weekly/2:mon,thu".
+
+        Args:
+            text (str): Rule text, see the module docstring.
+
+        Returns:
+            RecurrenceRule: The parsed rule.
+
+        Raises:
+            ValueError: If the text is not a valid rule.
+        """
+        head, _, day_text = text.strip().lower().partition(":")
+        frequency, _, interval_text = head.partition("/")
+        try:
+            interval = int(interval_text) if interval_text else 1
+            days = None
+            if day_text:
+                names = [name.strip() for name in day_text.split(",") if name.strip()]
+                if frequency == "weekly":
+                    days = [WEEKDAYS.index(name[:3]) for name in names]
+                else:
+                    days = [int(name) for name in names]
+        except ValueError:
+            raise ValueError(f"Invalid recurrence rule: {text}") from None
+        return cls(frequency, interval, days)
+
+    def __str__(self):
+        text = self.frequency if self.interval == 1 else f"{self.frequency}/{self.interval}"
+        if self.days:
+            names = [WEEKDAYS[day] for day in self.days] if self.frequency == "weekly" else map(str, self.days)
+            text += ":" + ",".join(names)
+        return text
+
+    def iter_dates(self, start, window_start=None, end=None):
+        """Lazily yield due dates from `start` onwards.
+
+        Args:
+            start (datetime): First due date of the series; every date keeps
+                its time of day.
+            window_start (datetime | None): Skip dates before this. Earlier
+                periods are jumped over arithmetically, not enumerated.
+            end (datetime | None): Stop before this; None yields forever.
+
+        Yields:
+            datetime: Due dates in increasing order.
+        """
+        lower = max(start, window_start) if window_start else start
+        if self.frequency == "daily":
+            step = timedelta(days=self.interval)
+            current = start + step * max(-(-(lower - start) // step), 0)
+            while end is None or current < end:
+                yield current
+                current += step
+            return
+        if self.frequency == "weekly":
+            week_start = start - timedelta(days=start.weekday())
+            weekdays = self.days or [start.weekday()]
+            period = max((lower - week_start).days // 7 // self.interval, 0)
+            while True:
+                base = week_start + timedelta(weeks=period * self.interval)
+                for weekday in weekdays:
+                    current = base + timedelta(days=weekday)
+                    if end is not None and current >= end:
+                        return
+                    if current >= lower:
+                        yield current
+                period += 1
+        month_index = start.year * 12 + start.month - 1
+        days = self.days or [start.day]
+        lower_index = lower.year * 12 + lower.month - 1
+        period = max((lower_index - month_index) // self.interval, 0)
+        while True:
+            year, month = divmod(month_index + period * self.interval, 12)
+            month += 1
+            if end is not None and start.replace(year=year, month=month, day=1) >= end:
+                return
+            last_day = calendar.monthrange(year, month)[1]
+            for day in days:
+                if day > last_day:
+                    continue
+                current = start.replace(year=year, month=month, day=day)
+                if end is not None and current >= end:
+                    return
+                if current >= lower:
+                    yield current
+            period += 1
+
+    def count_dates(self, start, end):
+        """Count the due dates `iter_dates(start, end=end)` would yield.
+
+        Args:
+            start (datetime): First due date of the series.
+            end (datetime): Exclusive latest due date.
+
+        Returns:
+            int: Number of dates. Only the first and last periods are
+            enumerated; whole weeks in between are counted arithmetically
+            and whole months once each, so the cost does not grow with the
+            number of dates.
+        """
+        if end <= start:
+            return 0
+        if self.frequency == "daily":
+            return -(-(end - start) // timedelta(days=self.interval))
+        if self.frequency == "weekly":
+            week_start = start - timedelta(days=start.weekday())
+            step = timedelta(weeks=self.interval)
+            count = sum(1 for _ in self.iter_dates(start, end=min(end, week_start + timedelta(weeks=1))))
+            full = max((end - week_start - timedelta(weeks=1)) // step, 0)
+            count += full * len(self.days or [start.weekday()])
+            return count + sum(1 for _ in self.iter_dates(start, week_start + step * (full + 1), end))
+        days = self.days or [start.day]
+        month_index = start.year * 12 + start.month - 1
+        last = (end.year * 12 + end.month - 1 - month_index) // self.interval
+        if last == 0:
+            return sum(1 for _ in self.iter_dates(start, end=end))
+
+        def period_start(period):
+            year, month = divmod(month_index + period * self.interval, 12)
+            return datetime(year, month + 1, 1)
+
+        count = sum(1 for _ in self.iter_dates(start, end=period_start(1)))
+        for period in range(1, last):
+            first = period_start(period)
+            count += bisect_right(days, calendar.monthrange(first.year, first.month)[1])
+        return count + sum(1 for _ in self.iter_dates(start, period_start(last), end))
+
+
+def make_recurrence(rule_text, start):
+    """Build the value stored in `Task.recurrence`.
+
+    Args:
+        rule_text (str): Rule, see `RecurrenceRule.parse()`.
+        start (datetime): First due date.
+
+    Returns:
+        dict: `{"rule": ..., "start": ..., "exceptions": {}}`.
+
+    Raises:
+        ValueError: If the rule is invalid.
+    """
+    return {"rule": str(RecurrenceRule.parse(rule_text)), "start": start.isoformat(), "exceptions": {}}
+
+
+def occurrence_id(series_id, day):
+    """Return the ID of one occurrence, such as "<series id>@2026-03-02"."""
+    return f"{series_id}{OCCURRENCE_SEPARATOR}{day.isoformat()}"
+
+
+def parse_occurrence_id(task_id):
+    """Split an occurrence ID.
+
+    Args:
+        task_id (str): Task or occurrence ID.
+
+    Returns:
+        tuple[str, date] | None: Series ID and occurrence date, or None when
+        `task_id` is not an occurrence ID.
+    """
+    series_id, separator, day = task_id.partition(OCCURRENCE_SEPARATOR)
+    if not separator:
+        return None
+    try:
+        return series_id, date.fromisoformat(day)
+    except ValueError:
+        return None
+
+
+def _exception(series, key):
+    """Return the exception recorded for one date as a dict, empty when none."""
+    exception = series.recurrence["exceptions"].get(key)
+    if isinstance(exception, str):  # written before completion times were kept
+        return {"status": exception}
+    return exception or {}
+
+
+def _occurrence(series, due_date):
+    day = due_date.date()
+    exception = _exception(series, day.isoformat())
+    completed_at = exception.get("completed_at")
+    task = object.__new__(Task)
+    task.__dict__ = dict(
+        series.__dict__,
+        id=occurrence_id(series.id, day),
+        due_date=due_date,
+        status=_STATUSES[exception["status"]] if exception else TaskStatus.TODO,
+        completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+        tags=list(series.tags),
+        recurrence=None,
+        series_id=series.id,
+        _changed=set(),
+        _deltas=None,
+    )
+    return task
+
+
+def iter_occurrences(series, window_start=None, end=None):
+    """Lazily yield the occurrences of a recurring task.
+
+    Args:
+        series (Task): Task whose `recurrence` is set.
+        window_start (datetime | None): Earliest due date to yield.
+        end (datetime | None): Exclusive latest due date; None never stops.
+
+    Yields:
+        Task: Transient tasks with an occurrence ID, the due date, the
+        status and completion time recorded in the exceptions (TODO
+        otherwise) and `series_id`. They are not stored; change them through the series.
+    """
+    recurrence = series.recurrence
+    rule = RecurrenceRule.parse(recurrence["rule"])
+    start = datetime.fromisoformat(recurrence["start"])
+    for due_date in rule.iter_dates(start, window_start, end):
+        yield _occurrence(series, due_date)
+
+
+def count_open_occurrences(series, end):
+    """Count the occurrences of a recurring task due before `end` that are not done.
+
+    Args:
+        series (Task): Task whose `recurrence` is set.
+        end (datetime): Exclusive latest due date.
+
+    Returns:
+        int: Same as counting `iter_occurrences(series, end=end)` with a
+        status other than DONE, but the occurrences are counted by
+        `RecurrenceRule.count_dates()` and only the exceptions are read.
+    """
+    recurrence = series.recurrence
+    start = datetime.fromisoformat(recurrence["start"])
+    done = sum(
+        1 for key in recurrence["exceptions"]
+        if _exception(series, key).get("status") == TaskStatus.DONE.value
+        and datetime.combine(date.fromisoformat(key), start.time()) < end
+    )
+    return RecurrenceRule.parse(recurrence["rule"]).count_dates(start, end) - done
+
+
+def iter_completions(series):
+    """Yield when occurrences of a recurring task were marked done.
+
+    Args:
+        series (Task): Task whose `recurrence` is set.
+
+    Yields:
+        datetime: Completion times, in no particular order. Occurrences
+        completed before these times were recorded are left out.
+    """
+    for key in series.recurrence["exceptions"]:
+        completed_at = _exception(series, key).get("completed_at")
+        if completed_at:
+            yield datetime.fromisoformat(completed_at)
+
+
+def get_occurrence(series, day):
+    """Return the occurrence of `series` on `day`, or None if it has none that day."""
+    start = datetime.combine(day, datetime.min.time())
+    return next(iter_occurrences(series, start, start + timedelta(days=1)), None)
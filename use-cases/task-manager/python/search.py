@@ -0,0 +1,317 @@
+"""Inverted full-text index over task titles and descriptions."""
+
+# task_manager/search.py
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from .profiling import timed
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TITLE_WEIGHT = 2
+PARTIAL_MATCH_WEIGHT = 0.5
+MAX_PARTIAL_MATCHES = 32
+INDEX_VERSION = 2
+MIN_REWRITE_BYTES = 64 * 1024
+
+
+def tokenize(text):
+    """Split text into lower-cased word tokens.
+
+    Args:
+        text (str | None): Text to tokenize.
+
+    Returns:
+        list[str]: Tokens in order of appearance.
+
+    Example:
+        >>> tokenize("Fix the Login-page")
+        ['fix', 'the', 'login', 'page']
+    """
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class TextIndex:
+    """Inverted index mapping tokens to the tasks that contain them.
+
+    Args:
+        trigrams (bool): Also index vocabulary trigrams so query terms can
+            match inside longer words (for example "auth" finds "oauth").
+
+    Example:
+        >>> from .models import Task
+        >>> index = TextIndex()
+        >>> task = Task("Renew passport", "Book appointment")
+        >>> index.update(task)
+        >>> index.search("passport") == [task.id]
+        True
+
+    Notes:
+        Title tokens weigh `TITLE_WEIGHT` times more than description tokens.
+        Results are ranked by term weight times inverse document frequency,
+        and every query term must match.
+    """
+
+    def __init__(self, trigrams=True):
+        """Initialize an empty index.
+
+        Args:
+            trigrams (bool): Enable substring matching through trigrams.
+
+        Returns:
+            None
+        """
+        self.trigrams = trigrams
+        self._documents = {}
+        self._postings = {}
+        self._trigram_index = {}
+        self._touched = set()
+        self._snapshot_bytes = None
+
+    def __len__(self):
+        return len(self._documents)
+
+    @staticmethod
+    def _weighted_terms(task):
+        terms = Counter()
+        for token in tokenize(task.title):
+            terms[token] += TITLE_WEIGHT
+        for token in tokenize(task.description):
+            terms[token] += 1
+        return dict(terms)
+
+    def update(self, task):
+        """Index a new task or re-index a changed one.
+
+        Args:
+            task (Task): Task to index.
+
+        Returns:
+            None
+
+        Notes:
+            Tasks whose text did not change are left untouched.
+        """
+        terms = self._weighted_terms(task)
+        if self._documents.get(task.id) == terms:
+            return
+        self.remove(task.id)
+        self._add_document(task.id, terms)
+        self._touched.add(task.id)
+
+    def _add_document(self, task_id, terms):
+        self._documents[task_id] = terms
+        for token, weight in terms.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                if self.trigrams:
+                    for gram in _trigrams(token):
+                        self._trigram_index.setdefault(gram, set()).add(token)
+            postings[task_id] = weight
+
+    def remove(self, task_id):
+        """Drop a task from the index.
+
+        Args:
+            task_id (str): ID of the task to remove.
+
+        Returns:
+            None
+        """
+        terms = self._documents.pop(task_id, None)
+        if terms is None:
+            return
+        self._touched.add(task_id)
+        for token in terms:
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                if self.trigrams:
+                    for gram in _trigrams(token):
+                        tokens = self._trigram_index[gram]
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._trigram_index[gram]
+
+    def _expand(self, term):
+        """Return `(token, weight)` pairs for vocabulary tokens matching `term`."""
+        matches = [(term, 1.0)] if term in self._postings else []
+        if not self.trigrams or len(term) < 3:
+            return matches
+        gram_sets = sorted((self._trigram_index.get(gram, ()) for gram in _trigrams(term)), key=len)
+        if not gram_sets[0]:
+            return matches
+        tokens = set(gram_sets[0]).intersection(*gram_sets[1:])
+        partial = [token for token in tokens if token != term and term in token]
+        # Keep the closest (shortest) words so short terms do not fan out
+        # across a large part of the vocabulary
+        partial = heapq.nsmallest(MAX_PARTIAL_MATCHES, partial, key=lambda token: (len(token), token))
+        matches.extend((token, PARTIAL_MATCH_WEIGHT) for token in partial)
+        return matches
+
+    @timed("TextIndex.search")
+    def search(self, query, limit=10):
+        """Find the best matching task IDs for a free-text query.
+
+        Args:
+            query (str): Words to look for.
+            limit (int): Maximum number of IDs to return.
+
+        Returns:
+            list[str]: Task IDs, best match first.
+        """
+        expanded = [self._expand(term) for term in set(tokenize(query))]
+        if not expanded or not all(expanded):
+            return []
+        # Start from the rarest term so later terms only probe a few candidates
+        expanded.sort(key=lambda tokens: sum(len(self._postings[token]) for token, _ in tokens))
+
+        total = len(self._documents)
+        scores = None
+        for tokens in expanded:
+            weighted = [
+                (self._postings[token], boost * math.log(1 + total / len(self._postings[token])))
+                for token, boost in tokens
+            ]
+            if scores is None:
+                scores = {}
+                for postings, idf in weighted:
+                    for task_id, weight in postings.items():
+                        scores[task_id] = max(scores.get(task_id, 0), weight * idf)
+                continue
+
+            narrowed = {}
+            for task_id, score in scores.items():
+                best = max((postings.get(task_id, 0) * idf for postings, idf in weighted), default=0)
+                if best:
+                    narrowed[task_id] = score + best
+            scores = narrowed
+            if not scores:
+                return []
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [task_id for task_id, _ in best]
+
+    def save(self, path, previous_state, state, rewrite=False):
+        """Persist the index after a commit.
+
+        Args:
+            path (str): Index file path.
+            previous_state (list): Store state before the commit.
+            state (list): Store state after the commit.
+            rewrite (bool): Write the whole index even if changes could be
+                appended, for example after the task file was compacted.
+
+        Returns:
+            None
+
+        Notes:
+            Appends the changed documents (`append_changes()`) when this
+            index was loaded from or dumped to `path`. The whole index is
+            written instead when it was rebuilt, or when appended changes
+            have outgrown the last full write.
+        """
+        if (rewrite or self._snapshot_bytes is None or not os.path.exists(path)
+                or os.path.getsize(path) > 2 * self._snapshot_bytes + MIN_REWRITE_BYTES):
+            self.dump(path, state)
+        elif self._touched or previous_state != state:
+            self.append_changes(path, previous_state, state)
+
+    def dump(self, path, state):
+        """Write the whole index to `path`.
+
+        Args:
+            path (str): Index file path.
+            state (list): Identifies the committed task store the index
+                matches (see `TaskStorage`).
+
+        Returns:
+            int: Bytes written.
+        """
+        data = json.dumps({
+            "version": INDEX_VERSION,
+            "state": state,
+            "documents": self._documents,
+        }, separators=(",", ":")).encode("utf-8") + b"\n"
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self._touched.clear()
+        self._snapshot_bytes = len(data)
+        return len(data)
+
+    def append_changes(self, path, previous_state, state):
+        """Append the documents changed since the last `dump()` or `append_changes()`.
+
+        Args:
+            path (str): Index file written by `dump()`.
+            previous_state (list): Store state the changes apply on top of.
+            state (list): Store state after the changes.
+
+        Returns:
+            None
+
+        Notes:
+            A line costs in proportion to the changed tasks, not to the
+            index. `load()` only replays lines that continue each other from
+            the snapshot.
+        """
+        documents = {task_id: self._documents.get(task_id) for task_id in self._touched}
+        with open(path, 'ab') as f:
+            f.write(json.dumps({"previous": previous_state, "state": state, "documents": documents},
+                               separators=(",", ":")).encode("utf-8") + b"\n")
+        self._touched.clear()
+
+    @classmethod
+    def load(cls, path, state, trigrams=True):
+        """Read an index written by `dump()` and `append_changes()` if it matches `state`.
+
+        Args:
+            path (str): Index file path.
+            state (list): Expected task store state.
+            trigrams (bool): Enable substring matching through trigrams.
+
+        Returns:
+            TextIndex | None: The loaded index, or None when the file is
+            missing, unreadable or stale.
+        """
+        if state[0] is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                line = f.readline()
+                snapshot = json.loads(line)
+                if snapshot.get("version") != INDEX_VERSION:
+                    return None
+                index = cls(trigrams=trigrams)
+                index._snapshot_bytes = len(line)
+                for task_id, terms in snapshot["documents"].items():
+                    index._add_document(task_id, terms)
+                current = snapshot["state"]
+                for line in f:
+                    if current == state:
+                        break
+                    changes = json.loads(line)
+                    if changes["previous"] != current:
+                        break  # written by a process that missed other commits
+                    for task_id, terms in changes["documents"].items():
+                        index.remove(task_id)
+                        if terms is not None:
+                            index._add_document(task_id, terms)
+                    current = changes["state"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if current != state:
+            return None
+        index._touched.clear()
+        return index
@@ -0,0 +1,208 @@
+"""Interactive shell that runs CLI commands against one loaded store."""
+
+# task_manager/shell.py
+import cmd
+import os
+import shlex
+
+try:
+    import readline
+except ImportError:  # pragma: no cover - not available on Windows
+    readline = None
+
+HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".task_manager_history")
+HISTORY_LENGTH = 1000
+
+COMMANDS = [
+    "create", "list", "status", "priority", "due", "tag", "untag", "block", "unblock",
+    "ready", "show", "history", "delete", "search", "stats", "sweep", "archive", "export", "import",
+    "metrics",
+]
+SHELL_COMMANDS = ["commit", "exit", "help", "quit"]
+TASK_ID_COMMANDS = {"status", "priority", "due", "tag", "untag", "block", "unblock", "show", "history", "delete"}
+TAG_OPTIONS = {"-t", "--tag", "--any-tag"}
+STATUS_VALUES = ["todo", "in_progress", "review", "done", "abandoned"]
+UNAVAILABLE_COMMANDS = {"daemon", "shell", "watch"}
+
+
+class TaskShell(cmd.Cmd):
+    """Read-eval-print loop over the regular CLI commands.
+
+    Args:
+        task_manager (TaskManager): Manager loaded once for the session.
+        run_command (Callable[[list[str], TaskManager], None]): Runs one CLI
+            command, normally `cli.main`.
+        history_path (str | None): File used to keep command history between
+            sessions, or None to disable it.
+
+    Example:
+        >>> from .app import TaskManager
+        >>> from .cli import main
+        >>> TaskShell(TaskManager(), main).cmdloop()
+        ...
+
+    Notes:
+        Writes are kept in memory until `commit`, and committed automatically
+        when the shell exits. Task IDs, tags and statuses are completed from
+        the in-memory indexes.
+    """
+
+    intro = "Task Manager shell. Type 'help' for commands, 'commit' to save, 'exit' to quit."
+    prompt = "tasks> "
+
+    def __init__(self, task_manager, run_command, history_path=HISTORY_PATH,
+                 stdin=None, stdout=None):
+        """Initialize the shell and switch the storage to batched writes.
+
+        Returns:
+            None
+        """
+        super().__init__(stdin=stdin, stdout=stdout)
+        if stdin is not None:
+            self.use_rawinput = False
+        self.task_manager = task_manager
+        self.storage = task_manager.storage
+        self.run_command = run_command
+        self.history_path = history_path
+        self.storage.autosave = False
+
+    def preloop(self):
+        """Load the command history of earlier sessions.
+
+        Returns:
+            None
+        """
+        if readline is not None and self.history_path and os.path.exists(self.history_path):
+            try:
+                readline.read_history_file(self.history_path)
+            except OSError:
+                pass
+
+    def postloop(self):
+        """Commit pending changes, restore autosave and save the command history.
+
+        Returns:
+            None
+        """
+        if self.storage.dirty:
+            self.do_commit("")
+        self.storage.autosave = True
+        if readline is not None and self.history_path:
+            try:
+                readline.set_history_length(HISTORY_LENGTH)
+                readline.write_history_file(self.history_path)
+            except OSError:
+                pass
+
+    def postcmd(self, stop, line):
+        """Mark the prompt while changes are pending.
+
+        Args:
+            stop (bool): Whether the command asked to leave the shell.
+            line (str): Command line that was run.
+
+        Returns:
+            bool: `stop`, unchanged.
+        """
+        self.prompt = "tasks*> " if self.storage.dirty else "tasks> "
+        return stop
+
+    def emptyline(self):
+        """Do nothing on an empty line instead of repeating the last command.
+
+        Returns:
+            bool: False, to keep the shell running.
+        """
+        return False
+
+    def default(self, line):
+        """Run any other line as a CLI command."""
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            return False
+        if argv and argv[0] in UNAVAILABLE_COMMANDS:
+            print(f"'{argv[0]}' is not available inside the shell.")
+            return False
+        try:
+            self.run_command(argv, self.task_manager)
+        except SystemExit:
+            pass
+        return False
+
+    def do_help(self, arg):
+        """Show help for the CLI or for one command."""
+        self.default(f"{arg} -h" if arg else "-h")
+        if not arg:
+            print("\nShell commands: commit, exit")
+
+    def do_commit(self, arg):
+        """Write pending changes to disk."""
+        if self.storage.commit():
+            print("Changes committed.")
+        else:
+            print("Nothing to commit.")
+
+    def do_exit(self, arg):
+        """Commit pending changes and leave the shell."""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        """Leave the shell on end of input (Ctrl-D), committing like `exit`.
+
+        Args:
+            arg (str): Ignored.
+
+        Returns:
+            bool: True, to stop the loop.
+        """
+        print()
+        return True
+
+    def completenames(self, text, *ignored):
+        """Complete the command name at the start of a line.
+
+        Args:
+            text (str): Prefix typed so far.
+            *ignored: Rest of the line and cursor positions, unused.
+
+        Returns:
+            list[str]: CLI and shell commands starting with `text`.
+        """
+        return [name for name in sorted(COMMANDS + SHELL_COMMANDS) if name.startswith(text)]
+
+    def completedefault(self, text, line, begidx, endidx):
+        """Complete a command's arguments: task IDs, tags and statuses.
+
+        Args:
+            text (str): Word being completed.
+            line (str): Whole input line.
+            begidx (int): Start of `text` in `line`.
+            endidx (int): End of `text` in `line`.
+
+        Returns:
+            list[str]: Candidates starting with `text`; short IDs unless
+            `text` is already 8 characters long.
+        """
+        words = line[:begidx].split()
+        if not words:
+            return []
+        command, previous, position = words[0], words[-1], len(words)
+
+        if previous in TAG_OPTIONS or (command in ("tag", "untag") and position == 2):
+            candidates = self.storage.all_tags()
+        elif (previous == "--after" or (command in TASK_ID_COMMANDS and position == 1)
+              or (command in ("block", "unblock") and position == 2)):
+            matches = self.storage.ids_with_prefix(text)
+            if len(text) >= 8:
+                return matches
+            # Offer the short IDs the CLI prints rather than full UUIDs
+            return sorted({task_id[:8] for task_id in matches})
+        elif previous in ("-s", "--status") or (command == "status" and position == 2):
+            candidates = STATUS_VALUES
+        else:
+            return []
+        return [candidate for candidate in candidates if candidate.startswith(text)]
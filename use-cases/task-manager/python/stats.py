@@ -0,0 +1,161 @@
+"""Incrementally maintained task statistics used by the storage layer."""
+
+# task_manager/stats.py
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import timedelta
+
+from .models import TaskStatus
+
+
+class TaskStatistics:
+    """Counters that summarize a task collection without rescanning it.
+
+    `TaskStorage` calls `track()` whenever a task is added or changed and
+    `untrack()` when it is deleted, so every query here is answered from the
+    counters instead of walking all tasks.
+
+    Example:
+        >>> from .models import Task
+        >>> stats = TaskStatistics()
+        >>> stats.track(Task("Write docs"))
+        >>> stats.total
+        1
+
+    Notes:
+        Overdue counts use a sorted list of open due dates and completions are
+        kept in one bucket per calendar day, so both queries cost O(log N) for
+        the boundary plus a fixed number of bucket lookups.
+    """
+
+    def __init__(self):
+        """Initialize empty counters.
+
+        Returns:
+            None
+        """
+        self.total = 0
+        self.by_status = Counter()
+        self.by_priority = Counter()
+        self._facts = {}
+        self._open_due_dates = []
+        self._completions_by_day = {}
+
+    def track(self, task):
+        """Add a task to the counters, replacing any previously tracked state.
+
+        Args:
+            task (Task): Task that was added or changed.
+
+        Returns:
+            None
+        """
+        self.untrack(task.id)
+        facts = (task.status, task.priority, task.due_date, task.completed_at)
+        self._facts[task.id] = facts
+        self._apply(facts, 1)
+
+    def untrack(self, task_id):
+        """Remove a task from the counters.
+
+        Args:
+            task_id (str): ID of the task to forget.
+
+        Returns:
+            None
+
+        Notes:
+            Unknown IDs are ignored.
+        """
+        facts = self._facts.pop(task_id, None)
+        if facts is not None:
+            self._apply(facts, -1)
+
+    def clear(self):
+        """Reset all counters.
+
+        Returns:
+            None
+        """
+        self.__init__()
+
+    def _apply(self, facts, delta):
+        status, priority, due_date, completed_at = facts
+        self.total += delta
+        self.by_status[status] += delta
+        self.by_priority[priority] += delta
+
+        if due_date is not None and status != TaskStatus.DONE:
+            if delta > 0:
+                insort(self._open_due_dates, due_date)
+            else:
+                del self._open_due_dates[bisect_left(self._open_due_dates, due_date)]
+
+        if completed_at is not None:
+            bucket = self._completions_by_day.setdefault(completed_at.date(), [])
+            if delta > 0:
+                insort(bucket, completed_at)
+            else:
+                del bucket[bisect_left(bucket, completed_at)]
+                if not bucket:
+                    del self._completions_by_day[completed_at.date()]
+
+    def count_overdue(self, now):
+        """Count tasks that are past due and not done.
+
+        Args:
+            now (datetime): Reference time.
+
+        Returns:
+            int: Number of overdue tasks.
+        """
+        return bisect_left(self._open_due_dates, now)
+
+    def count_completed_between(self, start, end):
+        """Count tasks completed in the window `[start, end]`.
+
+        Args:
+            start (datetime): Start of the window (inclusive).
+            end (datetime): End of the window (inclusive).
+
+        Returns:
+            int: Number of tasks whose `completed_at` falls in the window.
+        """
+        count = 0
+        day = start.date()
+        while day <= end.date():
+            bucket = self._completions_by_day.get(day)
+            if bucket:
+                low = bisect_left(bucket, start) if day == start.date() else 0
+                high = bisect_right(bucket, end) if day == end.date() else len(bucket)
+                count += high - low
+            day += timedelta(days=1)
+        return count
+
+    def verify(self, tasks, now):
+        """Compare the counters against a full recount of `tasks`.
+
+        Args:
+            tasks (Iterable[Task]): All tasks currently in storage.
+            now (datetime): Reference time for time-based counts.
+
+        Returns:
+            bool: True when the counters match the recount.
+        """
+        tasks = list(tasks)
+        window_start = now - timedelta(days=7)
+        overdue = len([
+            task for task in tasks
+            if task.due_date and task.due_date < now and task.status != TaskStatus.DONE
+        ])
+        completed = len([
+            task for task in tasks
+            if task.completed_at and window_start <= task.completed_at <= now
+        ])
+        return (
+            self.total == len(tasks)
+            and +self.by_status == Counter(task.status for task in tasks)
+            and +self.by_priority == Counter(task.priority for task in tasks)
+            and self.count_overdue(now) == overdue
+            and self.count_completed_between(window_start, now) == completed
+        )
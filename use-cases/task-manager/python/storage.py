@@ -3,11 +3,54 @@
 # task_manager/storage.py
 import json
 import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
-from .models import Task, TaskPriority, TaskStatus
+from .codec import codec, dict_to_task, task_to_dict
+from .compression import compression_for_path, open_file
+from .concurrency import ChangeLog, FileLock
+from .depgraph import DependencyGraph
+from .history import TaskHistory, deletion_entry, history_entries
+from .models import Task, TaskStatus
+from .metrics import registry as metrics
+from .profiling import profiler, timed
+from .stats import TaskStatistics
+
+_EMPTY_IDS = frozenset()
+_FINISHED = (TaskStatus.DONE, TaskStatus.ABANDONED)
+_TEXT_FIELDS = frozenset(("title", "description"))
+WRITE_BATCH_BYTES = 1 << 20
+WALK_CHUNK = 1024
+
+
+class AmbiguousTaskIdError(ValueError):
+    """Raised when a short task ID prefix matches more than one task.
+
+    Args:
+        prefix (str): The prefix that was looked up.
+        matches (list[str]): Some of the full IDs sharing the prefix.
+    """
+
+    def __init__(self, prefix, matches):
+        """Initialize the error with the conflicting IDs.
+
+        Returns:
+            None
+        """
+        self.prefix = prefix
+        self.matches = matches
+        super().__init__(
+            f"Task ID prefix '{prefix}' is ambiguous; it matches: {', '.join(matches)}"
+        )
 
 class TaskEncoder(json.JSONEncoder):
-    """JSON encoder that knows how to serialize `Task` objects."""
+    """JSON encoder that knows how to serialize `Task` objects.
+
+    Notes:
+        Kept for callers that use the standard `json` module; storage itself
+        encodes through `codec`.
+    """
 
     def default(self, obj):
         """Convert a `Task` to a JSON-serializable dict.
@@ -27,18 +70,16 @@ class TaskEncoder(json.JSONEncoder):
             ...
         """
         if isinstance(obj, Task):
-            task_dict = obj.__dict__.copy()
-            task_dict['priority'] = obj.priority.value
-            task_dict['status'] = obj.status.value
-            # Convert datetime objects to ISO format strings
-            for key in ['created_at', 'updated_at', 'due_date', 'completed_at']:
-                if task_dict.get(key) is not None:
-                    task_dict[key] = task_dict[key].isoformat()
-            return task_dict
+            return task_to_dict(obj)
         return super().default(obj)
 
 class TaskDecoder(json.JSONDecoder):
-    """JSON decoder that reconstructs `Task` objects from dicts."""
+    """JSON decoder that reconstructs `Task` objects from dicts.
+
+    Notes:
+        Kept for callers that use the standard `json` module; storage itself
+        decodes through `codec`.
+    """
 
     def __init__(self, *args, **kwargs):
         """Initialize the decoder with a custom object hook.
@@ -66,28 +107,34 @@ class TaskDecoder(json.JSONDecoder):
             ...
         """
         if 'id' in obj and 'title' in obj:
-            task = Task(obj['title'], obj.get('description', ''))
-            task.id = obj['id']
-            task.priority = TaskPriority(obj['priority'])
-            task.status = TaskStatus(obj['status'])
-
-            # Convert ISO format strings to datetime objects
-            for key in ['created_at', 'updated_at', 'completed_at']:
-                if obj.get(key):
-                    setattr(task, key, datetime.fromisoformat(obj[key]))
-
-            if obj.get('due_date'):
-                task.due_date = datetime.fromisoformat(obj['due_date'])
-
-            task.tags = obj.get('tags', [])
-            return task
+            return dict_to_task(obj)
         return obj
 
+def _discard(index, key, task_id):
+    """Remove `task_id` from an index bucket, dropping the bucket when empty."""
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.discard(task_id)
+        if not bucket:
+            del index[key]
+
 class TaskStorage:
     """Storage service for persisting and querying tasks.
 
     Args:
-        storage_path (str): Path to the JSON file to read/write.
+        storage_path (str): Path to the JSON file to read/write. A `.gz`,
+            `.zst` or `.lz4` suffix stores it compressed (zstd and lz4 need
+            the `zstandard` and `lz4` packages).
+        trigram_search (bool): Enable substring matches in `search_index`.
+        cache_size (int | None): When set, keep tasks in an on-disk record
+            log and hold at most this many hydrated tasks in memory (see
+            `DiskTaskStore`). None loads the whole JSON file into memory.
+        refresh_interval (float | None): Minimum seconds between the
+            modification checks of `maybe_refresh()`; None disables them.
+
+    Attributes:
+        autosave (bool): When False, `save()` only marks the storage dirty and
+            changes are written by the next `commit()`.
 
     Example:
         >>> storage = TaskStorage("tasks.json")
@@ -95,22 +142,66 @@ class TaskStorage:
         True
 
     Notes:
-        Load and save errors are caught and printed to stdout.
+        Load and save errors are caught and printed to stdout. Mutations and
+        saves hold `lock`, so a background sweeper can share the storage.
+        Loading only decodes the tasks; the indexes, statistics and text
+        index are built on first use, so a command that reads one task by ID
+        does not pay for them. With `cache_size` set, the indexes keep only
+        IDs and keys, so memory no longer grows with the task bodies.
     """
 
-    def __init__(self, storage_path="tasks.json"):
+    def __init__(self, storage_path="tasks.json", trigram_search=True, cache_size=None,
+                 refresh_interval=None, history=False):
         """Initialize storage and load tasks from disk.
 
         Args:
             storage_path (str): JSON file path.
+            trigram_search (bool): Enable substring matches in text search.
+            cache_size (int | None): Hydrated-task cache size for the on-disk
+                store, or None to keep every task in memory.
+            refresh_interval (float | None): Seconds between the checks made
+                by `maybe_refresh()`, or None to only refresh explicitly.
+            history (bool): Record every change in the change history under
+                `<storage_path>.history/` (see `history.py`). Off by default;
+                without it tasks do not queue their changes either.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If `cache_size` is combined with a compressed file;
+                the on-disk store needs random access.
         """
+        if cache_size is not None and compression_for_path(storage_path):
+            raise ValueError("cache_size requires an uncompressed storage file")
         self.storage_path = storage_path
+        self.cache_size = cache_size
+        self.search_path = f"{storage_path}.search"
         self.tasks = {}
+        self.lock = threading.RLock()
+        self._sorted_ids = None
+        self._indexed = False
+        self._search_index = None
+        self.trigram_search = trigram_search
+        self.autosave = True
+        self.dirty = False
+        self._encoded = {}
+        self._dirty_ids = set()
+        self._deleted_ids = {}
+        self.lock_path = f"{storage_path}.lock"
+        self._changes = ChangeLog(f"{storage_path}.changes", compressor=compression_for_path(storage_path))
+        self._log_position = (None, 0)
+        self._fingerprint = None
+        self.conflicts = []
+        self.full_reloads = 0
+        self.refresh_interval = refresh_interval
+        self._last_refresh_check = time.monotonic()
+        self.history = TaskHistory(f"{storage_path}.history") if history else None
+        self._history_entries = []
+        self._due_listeners = []
         self.load()
 
+    @timed("TaskStorage.load")
     def load(self):
         """Load tasks from the storage file into memory.
 
@@ -118,17 +209,239 @@ class TaskStorage:
             None
 
         Notes:
-            Any exceptions during load are caught and printed.
+            Any exceptions during load are caught and printed. Both the JSON
+            array format and the record log written by `DiskTaskStore` are
+            accepted. The file is read under a shared storage lock, so a
+            commit running in another process is never seen half-written,
+            while other readers are not blocked. Loading creates no files;
+            the change log is created by the first commit.
+        """
+        if self.cache_size is not None:
+            from .diskstore import DiskTaskStore
+
+            try:
+                with FileLock(self.lock_path), profiler.span("TaskStorage.read"):
+                    self._fold_change_log()
+                    self.tasks = DiskTaskStore(self.storage_path, self.cache_size)
+                    self._fingerprint = self._file_fingerprint()
+                metrics.inc("storage_operations_total", operation="load")
+                metrics.set("store_file_size_bytes", self.tasks.file_size)
+            except Exception as e:
+                print(f"Error loading tasks: {e}")
+            return
+        try:
+            with FileLock(self.lock_path, shared=True):
+                self._fingerprint = self._file_fingerprint()
+                self.tasks, self._log_position = self._read_store()
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+
+    def _fold_change_log(self):
+        """Write change log entries left by in-memory storages into the task file.
+
+        The on-disk store reads only the task file; the caller holds the
+        file lock.
+        """
+        entries, _ = self._changes.read_all(self._file_fingerprint())
+        if not entries:
+            return
+        tasks, _ = self._read_store()
+        temp_path = f"{self.storage_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(codec.encode_tasks(tasks.values()))
+        os.replace(temp_path, self.storage_path)
+        self._changes.start_generation(self._file_fingerprint())
+
+    def _read_store(self):
+        """Read the task file and replay the change log on top; the caller holds the file lock.
+
+        Returns:
+            tuple[dict, tuple]: Tasks by ID and the log position reached.
         """
+        tasks = {}
         if os.path.exists(self.storage_path):
+            for task in self._read_tasks():
+                tasks[task.id] = task
+        entries, position = self._changes.read_all(self._file_fingerprint())
+        for line in entries:
+            entry = codec.loads(line)
+            for record in entry["changed"]:
+                tasks[record["id"]] = dict_to_task(record)
+            for task_id in entry["deleted"]:
+                tasks.pop(task_id, None)
+        return tasks, position
+
+    def _read_tasks(self):
+        """Read and decode every task in the storage file."""
+        if compression_for_path(self.storage_path):
+            return self._load_compressed()
+        with profiler.span("TaskStorage.read"):
+            with open(self.storage_path, 'rb') as f:
+                data = f.read()
+        profiler.add_bytes("TaskStorage.load", read=len(data))
+        metrics.inc("storage_operations_total", operation="load")
+        metrics.set("store_file_size_bytes", len(data))
+        with profiler.span("TaskStorage.decode"):
+            if data.lstrip()[:1] == b"{":
+                from .diskstore import iter_log_tasks
+
+                return list(iter_log_tasks(data))
+            return codec.decode_tasks(data)
+
+    def _load_compressed(self):
+        """Decompress and decode the task file as a stream."""
+        size = os.path.getsize(self.storage_path)
+        profiler.add_bytes("TaskStorage.load", read=size)
+        metrics.inc("storage_operations_total", operation="load")
+        metrics.set("store_file_size_bytes", size)
+        with profiler.span("TaskStorage.decode"):
             try:
-                with open(self.storage_path, 'r') as f:
-                    tasks_data = json.load(f, cls=TaskDecoder)
-                    if isinstance(tasks_data, list):
-                        for task in tasks_data:
-                            self.tasks[task.id] = task
+                with open_file(self.storage_path, 'rb') as f:
+                    return codec.decode_stream(f)
+            except ValueError:
+                # Not one record per line, e.g. an indented file compressed by hand
+                with open_file(self.storage_path, 'rb') as f:
+                    return codec.decode_tasks(f.read())
+
+    def _file_fingerprint(self):
+        try:
+            stat = os.stat(self.storage_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+    def _changed_on_disk(self):
+        """Cheaply check, by `stat` alone, whether another process wrote since the last sync."""
+        if self._file_fingerprint() != self._fingerprint:
+            return True
+        if self.cache_size is not None:
+            return False
+        try:
+            log_size = os.stat(self._changes.path).st_size
+        except OSError:
+            log_size = 0
+        return log_size != self._log_position[1]
+
+    @timed("TaskStorage.refresh")
+    def refresh(self):
+        """Bring the in-memory tasks up to date with changes made by other processes.
+
+        Returns:
+            bool: True when the files had changed and were read.
+
+        Example:
+            >>> storage = TaskStorage("tasks.json")
+            >>> storage.refresh()
+            False
+
+        Notes:
+            The check costs two `stat` calls. When something changed, only
+            the change log entries written since the last sync are applied;
+            the task file is read again only when that history is gone or
+            the file was replaced by something that did not write the log.
+            Uncommitted local changes are kept unless another process
+            committed the same task (see `conflicts`). The on-disk store
+            flushes its pending changes and reopens the file.
+        """
+        with self.lock:
+            self._last_refresh_check = time.monotonic()
+            if not self._changed_on_disk():
+                return False
+            metrics.inc("storage_operations_total", operation="refresh")
+            if self.cache_size is not None:
+                with FileLock(self.lock_path):
+                    self.tasks.close()
+                self._deleted_ids.clear()
+                self._dirty_ids.clear()
+                self._indexed = False
+                self._sorted_ids = None
+                self._search_index = None
+                self.dirty = False
+                self.full_reloads += 1
+                self.load()
+                if self._due_listeners:
+                    self._ensure_indexes()
+                return True
+            try:
+                with FileLock(self.lock_path, shared=True):
+                    self._sync_from_disk()
             except Exception as e:
                 print(f"Error loading tasks: {e}")
+                return False
+            return True
+
+    def maybe_refresh(self):
+        """Run `refresh()` if at least `refresh_interval` seconds passed since the last check.
+
+        Returns:
+            bool: True when a refresh read changes from disk.
+
+        Notes:
+            Long-running callers (`TaskManager`) call this before each
+            operation, so they see other processes' commits without paying
+            for a load on every request.
+        """
+        if self.refresh_interval is None or time.monotonic() - self._last_refresh_check < self.refresh_interval:
+            return False
+        return self.refresh()
+
+    @property
+    def search_index(self):
+        """TextIndex: Full-text index, loaded or rebuilt on first use."""
+        with self.lock:
+            if self._search_index is None:
+                self._search_index = self._load_search_index()
+            return self._search_index
+
+    def _load_search_index(self):
+        """Load the persisted text index, rebuilding it if it is stale."""
+        from .search import TextIndex
+
+        index = TextIndex.load(self.search_path, self._store_state(), trigrams=self.trigram_search)
+        if index is None:
+            index = TextIndex(trigrams=self.trigram_search)
+            for task in self.tasks.values():
+                index.update(task)
+            return index
+        # The file matches the last commit seen; add what changed here since
+        for task_id in self._dirty_ids:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                index.update(task)
+        for task_id in self._deleted_ids:
+            index.remove(task_id)
+        return index
+
+    def _store_state(self):
+        """Identify the committed task file and change log this process has seen."""
+        return [self._fingerprint, *self._log_position]
+
+    @property
+    def statistics(self):
+        """TaskStatistics: Counters over all tasks, built on first use."""
+        self._ensure_indexes()
+        return self._statistics
+
+    def _ensure_indexes(self):
+        if self._indexed:
+            return
+        with self.lock:
+            if not self._indexed:
+                if self._due_listeners:
+                    # Indexes are rebuilt after a reload; report every task again
+                    for task_id in self._index_entries:
+                        self._notify_due(task_id, None, None)
+                self._reset_indexes()
+                for task in self.tasks.values():
+                    self._index_task(task)
+                self._indexed = True
+
+    def _ensure_sorted_ids(self):
+        if self._sorted_ids is None:
+            with self.lock:
+                if self._sorted_ids is None:
+                    self._sorted_ids = sorted(self.tasks)
+        return self._sorted_ids
 
     def save(self):
         """Persist tasks to the storage file.
@@ -137,14 +450,331 @@ class TaskStorage:
             None
 
         Notes:
-            Any exceptions during save are caught and printed.
+            Any exceptions during save are caught and printed. The text search
+            index is saved next to the task file so the next load can reuse
+            it; a commit appends only the documents it changed. With
+            `autosave` off, nothing is written until `commit()`.
+            Only tasks passed to `add_task()`, `add_tasks()` or
+            `reindex_task()` since the last commit are serialized and
+            written; see `commit()`. The on-disk store commits anyway once
+            more changed tasks than `cache_size` were evicted from its cache,
+            since those are held in memory until written.
         """
-        try:
-            with open(self.storage_path, 'w') as f:
-                json.dump(list(self.tasks.values()), f, cls=TaskEncoder, indent=2)
-        except Exception as e:
-            print(f"Error saving tasks: {e}")
+        with self.lock:
+            self.dirty = True
+            if self.autosave or (self.cache_size is not None and self.tasks.pinned > self.cache_size):
+                self.commit()
+
+    @timed("TaskStorage.commit")
+    def commit(self):
+        """Write pending changes to disk.
+
+        Returns:
+            bool: True when pending changes were written.
+
+        Example:
+            >>> storage = TaskStorage("tasks.json")
+            >>> storage.autosave = False
+            >>> storage.commit()
+            False
+
+        Notes:
+            The write holds an exclusive lock on `<storage_path>.lock`.
+            Before writing, changes committed by other processes since this
+            one last read the file are merged in, normally from the change
+            log `<storage_path>.changes` (see `concurrency.py`) and only when
+            that history is gone by reading the whole file. A task changed
+            both here and elsewhere keeps the changes of both when they touch
+            different fields. Otherwise the other process's version wins and
+            the task ID is listed in `conflicts`. The on-disk store
+            (`cache_size`) only takes the lock and assumes a single writer.
+            Changes that survived the merge are then appended to the change
+            history.
+
+            The changed records are appended to the change log only, so a
+            commit writes in proportion to what changed. The task file is
+            rewritten by `compact()`, which runs when the log would grow
+            past a quarter of the file's size (see `concurrency.LOG_RATIO`)
+            or the file does not exist yet, and by `close()`.
+        """
+        with self.lock:
+            if not self.dirty:
+                return False
+            try:
+                started = time.perf_counter()
+                with FileLock(self.lock_path):
+                    if self.cache_size is None:
+                        self._sync_from_disk()
+                    previous_state = self._store_state()
+                    compacted = False
+                    if self.history is not None:
+                        self.history.append([entry for _, entry in self._history_entries])
+                    self._history_entries = []
+                    if self.cache_size is not None:
+                        self.tasks.flush()
+                        self._deleted_ids.clear()
+                        self._fingerprint = self._file_fingerprint()
+                        size = self.tasks.file_size
+                        written = size
+                    else:
+                        written = self._append_changes()
+                        if written is None:
+                            written = self._write_task_file()
+                            compacted = True
+                        elif not os.path.exists(self.storage_path):
+                            written += self._write_task_file(start_generation=False)
+                        size = os.path.getsize(self.storage_path)
+                    if self._search_index is not None:
+                        self._search_index.save(self.search_path, previous_state, self._store_state(), compacted)
+                metrics.observe("save_duration_seconds", time.perf_counter() - started)
+                metrics.inc("storage_operations_total", operation="commit")
+                metrics.set("store_file_size_bytes", size)
+                profiler.add_bytes("TaskStorage.commit", written=written)
+                self.dirty = False
+            except Exception as e:
+                print(f"Error saving tasks: {e}")
+                return False
+            return True
+
+    def _append_changes(self):
+        """Bump the versions of changed tasks and record them in the change log.
+
+        Returns the number of bytes appended (0 when nothing is left to
+        write, for example because every local change lost a conflict), or
+        None when the log is full and the task file must be rewritten.
+        """
+        changed = []
+        fields = []
+        for task_id in self._dirty_ids:
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            task.version += 1
+            fragment = self._encoded[task_id] = codec.encode_task(task)
+            fields.append(sorted(task.changed_fields))
+            task.mark_clean()
+            changed.append(fragment)
+        self._dirty_ids.clear()
+        if not changed and not self._deleted_ids:
+            return 0
+        if self._log_position[0] is None:
+            self._log_position = self._changes.ensure(self._fingerprint)
+        position = self._changes.append(changed, fields, self._deleted_ids, self._fingerprint)
+        if position is None:
+            return None
+        written = position[1] - self._log_position[1]
+        self._log_position = position
+        self._deleted_ids.clear()
+        return written
+
+    def _write_task_file(self, start_generation=True):
+        """Rewrite the task file with every task and, by default, empty the change log.
+
+        The caller holds the file lock. The file is replaced atomically, so
+        a crash leaves either the old file or the new one, and replaying
+        log entries the new file already holds changes nothing. Without
+        `start_generation` the log is kept and only its record of the task
+        file is updated, which is how the first commit creates the file
+        without making other processes reload. Returns the bytes written.
+        """
+        root, extension = os.path.splitext(self.storage_path)
+        temp_path = f"{root}.tmp{extension}"  # keep the extension that selects the compressor
+        with open_file(temp_path, 'wb') as f:
+            for chunk in self._iter_encoded():
+                f.write(chunk)
+        os.replace(temp_path, self.storage_path)
+        self._fingerprint = self._file_fingerprint()
+        if start_generation:
+            self._deleted_ids.clear()
+            self._log_position = self._changes.start_generation(self._fingerprint)
+        else:
+            self._log_position = self._changes.set_base(self._fingerprint)
+        return os.path.getsize(self.storage_path)
+
+    @timed("TaskStorage.compact")
+    def compact(self):
+        """Fold the change log into the task file.
+
+        Returns:
+            None
+
+        Notes:
+            Commits pending changes first. Runs by itself when the log fills
+            up; call it to leave a self-contained task file behind, for
+            example before copying it elsewhere.
+        """
+        with self.lock:
+            self.commit()
+            try:
+                with FileLock(self.lock_path):
+                    previous_state = self._store_state()
+                    if self.cache_size is not None:
+                        self.tasks.compact()
+                        self._fingerprint = self._file_fingerprint()
+                    else:
+                        self._sync_from_disk()
+                        self._write_task_file()
+                    if self._search_index is not None:
+                        self._search_index.save(self.search_path, previous_state, self._store_state(), rewrite=True)
+                metrics.inc("storage_operations_total", operation="compact")
+            except Exception as e:
+                print(f"Error saving tasks: {e}")
+
+    def close(self):
+        """Commit pending changes and leave a self-contained task file behind.
+
+        Returns:
+            None
+
+        Notes:
+            Folds the change log into the task file when it holds entries,
+            so copies and backups of the task file alone miss nothing. The
+            on-disk store closes its file; the storage is unusable after.
+        """
+        with self.lock:
+            if self.cache_size is not None:
+                self.commit()
+                self.tasks.close()
+            elif self.dirty or self._changes.has_entries():
+                self.compact()
+
+    def _sync_from_disk(self):
+        """Merge changes committed by other processes; the caller holds the file lock."""
+        self.conflicts = []
+        entries, position = self._changes.read_since(self._log_position, self._fingerprint)
+        if entries is None or (not entries and self._file_fingerprint() != self._fingerprint):
+            position = self._full_merge()
+        else:
+            for line in entries:
+                entry = codec.loads(line)
+                fields = entry.get("fields") or [None] * len(entry["changed"])
+                for record, changed_fields in zip(entry["changed"], fields):
+                    self._merge_task(dict_to_task(record), changed_fields)
+                for task_id in entry["deleted"]:
+                    self._merge_deletion(task_id)
+        self._log_position = position
+        self._fingerprint = self._file_fingerprint()
+
+    def _full_merge(self):
+        """Merge the whole store when the change log cannot be replayed from where this process left it.
+
+        Returns the log position reached.
+        """
+        self.full_reloads += 1
+        metrics.inc("storage_operations_total", operation="reload")
+        on_disk, position = self._read_store()
+        for task in on_disk.values():
+            self._merge_task(task)
+        for task_id in [task_id for task_id in self.tasks if task_id not in on_disk]:
+            # Tasks created here have never been committed (version 0)
+            if self.tasks[task_id].version:
+                self._merge_deletion(task_id)
+        return position
+
+    def _merge_task(self, task, changed_fields=None):
+        """Apply a task record written by another process.
+
+        `changed_fields` names the fields that commit changed; without it a
+        local change to the same task cannot be kept.
+        """
+        deleted_version = self._deleted_ids.get(task.id)
+        if deleted_version is not None:
+            if task.version <= deleted_version:
+                return
+            del self._deleted_ids[task.id]
+            self._report_conflict(task.id)
+        else:
+            local = self.tasks.get(task.id)
+            if local is not None and task.version <= local.version:
+                return
+            if task.id in self._dirty_ids and not self._rebase(local, task, changed_fields):
+                self._dirty_ids.discard(task.id)
+                self._report_conflict(task.id)
+        is_new = task.id not in self.tasks
+        self.tasks[task.id] = task
+        self._encoded.pop(task.id, None)
+        if self._indexed:
+            self._index_task(task)
+        if self._search_index is not None:
+            self._search_index.update(task)
+        if is_new and self._sorted_ids is not None:
+            insort(self._sorted_ids, task.id)
+
+    def _merge_deletion(self, task_id):
+        """Apply a deletion committed by another process."""
+        self._deleted_ids.pop(task_id, None)
+        if task_id not in self.tasks:
+            return
+        if task_id in self._dirty_ids:
+            self._dirty_ids.discard(task_id)
+            self._report_conflict(task_id)
+        del self.tasks[task_id]
+        self._encoded.pop(task_id, None)
+        if self._indexed:
+            self._drop_indexes(task_id)
+        if self._search_index is not None:
+            self._search_index.remove(task_id)
+        if self._sorted_ids is not None:
+            del self._sorted_ids[bisect_left(self._sorted_ids, task_id)]
+
+    def _rebase(self, local, task, changed_fields):
+        """Re-apply the uncommitted changes of `local` to a newer record of the same task.
+
+        Returns True when they were re-applied, which needs both sides to
+        have recorded the fields they changed and those fields to differ.
+        `task` then carries the local changes, ready to be committed.
+        """
+        if local is None:
+            return False
+        local_fields = local.changed_fields - {"updated_at"}
+        remote_fields = set(changed_fields or ()) - {"updated_at"}
+        if not local_fields or not remote_fields or not local_fields.isdisjoint(remote_fields):
+            return False
+        task.update(**{field: getattr(local, field) for field in local_fields})
+        # The queued history entries were numbered from the older revision
+        self._history_entries = [item for item in self._history_entries if item[0] != task.id]
+        self._record_history(task)
+        return True
+
+    def _report_conflict(self, task_id):
+        self._history_entries = [item for item in self._history_entries if item[0] != task_id]
+        self.conflicts.append(task_id)
+        metrics.inc("storage_conflicts_total")
+
+    def _iter_encoded(self):
+        """Yield the task file in chunks, re-encoding only tasks changed since the last commit.
 
+        Each task is encoded on its own with `codec`, so the chunks add up to
+        the same JSON array as `codec.encode_tasks()`. Chunks are about
+        `WRITE_BATCH_BYTES` long so compressors get large writes.
+        """
+        encoded = self._encoded
+        dirty_ids = self._dirty_ids
+        encode = codec.encode_task
+        if not self.tasks:
+            yield b"[]"
+            return
+        batch = [b"[\n"]
+        batch_size = 0
+        separator = b""
+        for task in self.tasks.values():
+            fragment = None if task.id in dirty_ids else encoded.get(task.id)
+            if fragment is None:
+                fragment = encoded[task.id] = encode(task)
+                task.mark_clean()
+            batch.append(separator)
+            batch.append(fragment)
+            separator = b",\n"
+            batch_size += len(fragment)
+            if batch_size >= WRITE_BATCH_BYTES:
+                yield b"".join(batch)
+                batch = []
+                batch_size = 0
+        batch.append(b"\n]")
+        dirty_ids.clear()
+        yield b"".join(batch)
+
+    @timed("TaskStorage.add_task")
     def add_task(self, task):
         """Add a task to storage and persist it.
 
@@ -160,10 +790,58 @@ class TaskStorage:
             >>> storage.add_task(Task("Plan"))
             ...
         """
-        self.tasks[task.id] = task
-        self.save()
+        metrics.inc("storage_operations_total", operation="add")
+        with self.lock:
+            existing = self.tasks.get(task.id)
+            if existing is None and self._sorted_ids is not None:
+                insort(self._sorted_ids, task.id)
+            if existing is not None:
+                task.version = max(task.version, existing.version)
+                task.revision = max(task.revision, existing.revision)
+            self.tasks[task.id] = task
+            self.reindex_task(task, text_changed=True)
+            self.save()
         return task.id
 
+    @timed("TaskStorage.add_tasks")
+    def add_tasks(self, tasks):
+        """Add many tasks and persist them with a single save.
+
+        Args:
+            tasks (Iterable[Task]): Tasks to add; an existing task with the
+                same ID is replaced.
+
+        Returns:
+            int: Number of tasks added or replaced.
+
+        Notes:
+            Indexes that have not been built yet are left alone and will
+            include these tasks when they are first used.
+        """
+        metrics.inc("storage_operations_total", operation="add")
+        count = 0
+        with self.lock:
+            for task in tasks:
+                existing = self.tasks.get(task.id)
+                if existing is not None:
+                    task.version = max(task.version, existing.version)
+                    task.revision = max(task.revision, existing.revision)
+                self._record_history(task)
+                self.tasks[task.id] = task
+                self._dirty_ids.add(task.id)
+                if self._indexed:
+                    self._index_task(task)
+                if self._search_index is not None:
+                    self._search_index.update(task)
+                if existing is None and self._sorted_ids is not None:
+                    self._sorted_ids.append(task.id)
+                count += 1
+            if count:
+                if self._sorted_ids is not None:
+                    self._sorted_ids.sort()
+                self.save()
+        return count
+
     def get_task(self, task_id):
         """Fetch a task by ID.
 
@@ -172,9 +850,234 @@ class TaskStorage:
 
         Returns:
             Task | None: The task if found, otherwise None.
+
+        Notes:
+            With a history, the task starts queueing its changes so they are
+            recorded as deltas rather than whole snapshots.
+        """
+        task = self.tasks.get(task_id)
+        if task is not None and self.history is not None:
+            task.track_deltas()
+        return task
+
+    def resolve_task_id(self, prefix):
+        """Expand a unique ID prefix (such as the 8 characters the CLI shows).
+
+        Args:
+            prefix (str): Full task ID or a prefix of one.
+
+        Returns:
+            str | None: The full task ID, or None when nothing matches.
+
+        Raises:
+            AmbiguousTaskIdError: If the prefix matches several tasks.
+
+        Example:
+            >>> storage = TaskStorage("tasks.json")
+            >>> storage.resolve_task_id("3f2a9c1e")
+            ...
+
+        Notes:
+            Uses binary search over a sorted list of IDs, so a lookup costs
+            O(log N) regardless of the number of tasks.
+        """
+        if not prefix:
+            return None
+        with self.lock:
+            if prefix in self.tasks:
+                return prefix
+            sorted_ids = self._ensure_sorted_ids()
+            start = bisect_left(sorted_ids, prefix)
+            matches = []
+            for task_id in sorted_ids[start:start + 5]:
+                if not task_id.startswith(prefix):
+                    break
+                matches.append(task_id)
+        if len(matches) > 1:
+            raise AmbiguousTaskIdError(prefix, matches)
+        return matches[0] if matches else None
+
+    def reindex_task(self, task, text_changed=None):
+        """Refresh derived counters and indexes after a task was added or changed in place.
+
+        Args:
+            task (Task): Task whose fields may have changed.
+            text_changed (bool | None): Whether the title or description may
+                have changed. None derives it from `task.changed_fields`,
+                assuming a change when no fields were recorded.
+
+        Returns:
+            None
+
+        Notes:
+            Callers that mutate a task directly (for example through
+            `Task.mark_as_done()`) must call this before saving; it also
+            marks the task as the only record to serialize again. With the
+            on-disk store the task is queued for write-back.
         """
-        return self.tasks.get(task_id)
+        if text_changed is None:
+            changed = task.changed_fields
+            text_changed = not changed or not changed.isdisjoint(_TEXT_FIELDS)
+        with self.lock:
+            self._record_history(task)
+            if self.cache_size is not None and task.id in self.tasks:
+                self.tasks[task.id] = task
+            self._dirty_ids.add(task.id)
+            self._ensure_indexes()
+            self._index_task(task)
+            if text_changed:
+                self.search_index.update(task)
+
+    def cache_info(self):
+        """Describe the hydrated-task cache of the on-disk store.
 
+        Returns:
+            dict | None: Counters from `DiskTaskStore.cache_info()`, or None
+            when all tasks are held in memory.
+        """
+        if self.cache_size is None:
+            return None
+        with self.lock:
+            return self.tasks.cache_info()
+
+    def _reset_indexes(self):
+        self._statistics = TaskStatistics()
+        self._index_entries = {}
+        self._status_index = {}
+        self._priority_index = {}
+        self._tag_index = {}
+        self._due_index = []
+        self._open_due_index = []
+        self._created_index = []
+        self._graph = DependencyGraph()
+        self._recurring_ids = set()
+
+    def _index_task(self, task):
+        self._unindex_task(task.id)
+        self._graph.update(task.id, task.blocked_by, task.status in _FINISHED)
+        if task.recurrence is not None:
+            self._recurring_ids.add(task.id)
+        self._statistics.track(task)
+        entry = (task.status, task.priority, task.due_date, tuple(set(task.tags)), task.created_at)
+        self._index_entries[task.id] = entry
+        insort(self._created_index, (task.created_at, task.id))
+
+        self._status_index.setdefault(task.status, set()).add(task.id)
+        self._priority_index.setdefault(task.priority, set()).add(task.id)
+        for tag in entry[3]:
+            self._tag_index.setdefault(tag, set()).add(task.id)
+        if task.due_date is not None:
+            insort(self._due_index, (task.due_date, task.id))
+            if task.status not in _FINISHED:
+                insort(self._open_due_index, (task.due_date, task.id))
+        if self._due_listeners:
+            if task.status in _FINISHED:
+                self._notify_due(task.id, None, task.priority)
+            else:
+                self._notify_due(task.id, task.due_date, task.priority)
+
+    def _drop_indexes(self, task_id):
+        """Remove a task that left the task file from every index."""
+        self._unindex_task(task_id)
+        self._graph.remove(task_id)
+        if self._due_listeners:
+            self._notify_due(task_id, None, None)
+
+    def _notify_due(self, task_id, due_date, priority):
+        for listener in self._due_listeners:
+            listener(task_id, due_date, priority)
+
+    def watch_due_dates(self, listener):
+        """Report the due date of every open task now and whenever it changes.
+
+        Args:
+            listener (Callable[[str, datetime | None, TaskPriority | None], None]):
+                Called with the task ID, due date and priority of each open
+                task with a due date, then again after every change to a
+                task. The due date is None when the task no longer has a
+                pending deadline: it was finished, deleted, archived or lost
+                its due date.
+
+        Returns:
+            None
+
+        Notes:
+            Listeners run while `lock` is held and must not block. Used by
+            `notifier.DueDateNotifier`.
+        """
+        with self.lock:
+            self._ensure_indexes()
+            self._due_listeners.append(listener)
+            for due_date, task_id in self._open_due_index:
+                listener(task_id, due_date, self._index_entries[task_id][1])
+
+    def unwatch_due_dates(self, listener):
+        """Stop reporting due dates to a listener added by `watch_due_dates()`.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if listener in self._due_listeners:
+                self._due_listeners.remove(listener)
+
+    def _unindex_task(self, task_id):
+        self._statistics.untrack(task_id)
+        self._recurring_ids.discard(task_id)
+        entry = self._index_entries.pop(task_id, None)
+        if entry is None:
+            return
+        status, priority, due_date, tags, created_at = entry
+
+        del self._created_index[bisect_left(self._created_index, (created_at, task_id))]
+        _discard(self._status_index, status, task_id)
+        _discard(self._priority_index, priority, task_id)
+        for tag in tags:
+            _discard(self._tag_index, tag, task_id)
+        if due_date is not None:
+            key = (due_date, task_id)
+            del self._due_index[bisect_left(self._due_index, key)]
+            if status not in _FINISHED:
+                del self._open_due_index[bisect_left(self._open_due_index, key)]
+
+    def verify_statistics(self, now=None):
+        """Check the statistics counters against a full recount.
+
+        Args:
+            now (datetime | None): Reference time, defaults to now.
+
+        Returns:
+            bool: True when the counters were consistent.
+
+        Notes:
+            Reads every task, so nothing calls it on the mutation path; run
+            it on request (`stats --verify`) or from tests. On a mismatch
+            only the counters are rebuilt from the stored tasks; the other
+            indexes are left alone.
+        """
+        if self.statistics.verify(self.tasks.values(), now or datetime.now()):
+            return True
+        print("Statistics counters out of sync; rebuilding from stored tasks")
+        with self.lock:
+            self._statistics.clear()
+            for task in self.tasks.values():
+                self._statistics.track(task)
+        return False
+
+    def _record_history(self, task):
+        """Queue the history entries of a task that was added or changed."""
+        if self.history is not None:
+            self._history_entries.extend((task.id, entry) for entry in history_entries(task))
+
+    def _remove_task(self, task_id):
+        """Drop a task and remember its deletion for the next commit."""
+        task = self.tasks.pop(task_id)
+        self._deleted_ids[task_id] = task.version
+        self._encoded.pop(task_id, None)
+        if self.history is not None:
+            self._history_entries.append((task_id, deletion_entry(task)))
+
+    @timed("TaskStorage.update_task")
     def update_task(self, task_id, **kwargs):
         """Update a task's fields and persist changes.
 
@@ -183,15 +1086,24 @@ class TaskStorage:
             **kwargs: Field-value pairs to update.
 
         Returns:
-            bool: True when updated, False when not found.
+            bool: True when the task exists, False when not found or when
+            the commit lost a conflict with another process (see `commit()`).
+
+        Notes:
+            When no field actually changes, nothing is reindexed or saved.
         """
-        task = self.get_task(task_id)
-        if task:
-            task.update(**kwargs)
-            self.save()
-            return True
+        metrics.inc("storage_operations_total", operation="update")
+        with self.lock:
+            task = self.get_task(task_id)
+            if task:
+                if task.update(**kwargs):
+                    self.reindex_task(task)
+                    self.save()
+                    return not self.autosave or task_id not in self.conflicts
+                return True
         return False
 
+    @timed("TaskStorage.delete_task")
     def delete_task(self, task_id):
         """Delete a task by ID.
 
@@ -200,13 +1112,159 @@ class TaskStorage:
 
         Returns:
             bool: True if deleted, False if not found.
+
+        Notes:
+            The task is also removed from the `blocked_by` of every task it
+            blocked; those tasks are saved with the deletion.
         """
-        if task_id in self.tasks:
-            del self.tasks[task_id]
-            self.save()
-            return True
+        metrics.inc("storage_operations_total", operation="delete")
+        with self.lock:
+            if task_id in self.tasks:
+                self._ensure_indexes()
+                dependent_ids = set(self._graph.dependents_of(task_id))
+                self._remove_task(task_id)
+                if self._sorted_ids is not None:
+                    del self._sorted_ids[bisect_left(self._sorted_ids, task_id)]
+                self._drop_indexes(task_id)
+                self.search_index.remove(task_id)
+                self._release_dependents({task_id}, dependent_ids)
+                self.save()
+                return True
         return False
 
+    @timed("TaskStorage.delete_tasks")
+    def delete_tasks(self, task_ids):
+        """Delete many tasks and persist the change with a single save.
+
+        Args:
+            task_ids (Iterable[str]): IDs to delete; unknown IDs are ignored.
+
+        Returns:
+            int: Number of tasks deleted.
+
+        Notes:
+            Like `add_tasks()`, only indexes that are already built are
+            updated. Without them, finding the tasks the deleted ones blocked
+            takes one pass over the tasks.
+        """
+        metrics.inc("storage_operations_total", operation="delete")
+        deleted = set()
+        dependent_ids = set()
+        with self.lock:
+            for task_id in task_ids:
+                if task_id not in self.tasks:
+                    continue
+                if self._indexed:
+                    dependent_ids.update(self._graph.dependents_of(task_id))
+                self._remove_task(task_id)
+                if self._indexed:
+                    self._drop_indexes(task_id)
+                if self._search_index is not None:
+                    self._search_index.remove(task_id)
+                deleted.add(task_id)
+            if deleted:
+                if self._sorted_ids is not None:
+                    self._sorted_ids = [task_id for task_id in self._sorted_ids if task_id not in deleted]
+                if not self._indexed:
+                    dependent_ids = {task.id for task in self.tasks.values() if not deleted.isdisjoint(task.blocked_by)}
+                self._release_dependents(deleted, dependent_ids)
+                self.save()
+        return len(deleted)
+
+    def _release_dependents(self, deleted_ids, dependent_ids):
+        """Drop deleted tasks from the `blocked_by` of the tasks they blocked.
+
+        The dependents are queued for the next commit like any other change.
+        """
+        for dependent_id in dependent_ids - deleted_ids:
+            task = self.tasks.get(dependent_id)
+            if task is None:
+                continue
+            changed = False
+            for task_id in deleted_ids.intersection(task.blocked_by):
+                changed |= task.remove_blocker(task_id)
+            if changed:
+                self.reindex_task(task, text_changed=False)
+
+    def add_dependency(self, task_id, blocker_id):
+        """Record that `blocker_id` must finish before `task_id` can start.
+
+        Args:
+            task_id (str): Blocked task.
+            blocker_id (str): Blocking task.
+
+        Returns:
+            bool: True when both tasks exist.
+
+        Raises:
+            DependencyCycleError: If `task_id` already blocks `blocker_id`,
+                directly or through other tasks.
+
+        Notes:
+            The cycle check and the update of the topological order only
+            visit the tasks ranked between the two (see `DependencyGraph`).
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or blocker_id not in self.tasks:
+                return False
+            self._ensure_indexes()
+            self._graph.add_edge(blocker_id, task_id)
+            if task.add_blocker(blocker_id):
+                self.reindex_task(task, text_changed=False)
+                self.save()
+        return True
+
+    def remove_dependency(self, task_id, blocker_id):
+        """Drop a "blocked by" relationship.
+
+        Args:
+            task_id (str): Blocked task.
+            blocker_id (str): Blocking task.
+
+        Returns:
+            bool: True when the relationship existed.
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or not task.remove_blocker(blocker_id):
+                return False
+            self.reindex_task(task, text_changed=False)
+            self.save()
+        return True
+
+    def recurring_ids(self):
+        """Return the IDs of recurring tasks (series).
+
+        Returns:
+            set[str]: Series IDs. Treat as read-only.
+        """
+        self._ensure_indexes()
+        return self._recurring_ids
+
+    def ready_ids(self):
+        """Return the IDs of open tasks none of whose blockers is still open.
+
+        Returns:
+            set[str]: Ready task IDs. Treat as read-only.
+
+        Notes:
+            Maintained as tasks and dependencies change; blockers that were
+            deleted or archived no longer block.
+        """
+        self._ensure_indexes()
+        return self._graph.ready
+
+    def topological_order(self):
+        """List task IDs so that every blocker precedes the tasks it blocks.
+
+        Returns:
+            list[str]: All task IDs.
+        """
+        with self.lock:
+            self._ensure_indexes()
+            return self._graph.topological_order()
+
     def get_all_tasks(self):
         """Return all tasks currently in memory.
 
@@ -215,6 +1273,23 @@ class TaskStorage:
         """
         return list(self.tasks.values())
 
+    def iter_tasks(self):
+        """Lazily yield all tasks in storage order.
+
+        Yields:
+            Task: Stored tasks.
+
+        Notes:
+            Iterates over a snapshot of the IDs, so tasks may be added or
+            deleted while the generator is consumed.
+        """
+        with self.lock:
+            task_ids = list(self.tasks)
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                yield task
+
     def get_tasks_by_status(self, status):
         """Filter tasks by status.
 
@@ -245,3 +1320,203 @@ class TaskStorage:
         """
         return [task for task in self.tasks.values() if task.is_overdue()]
 
+    def ids_by_status(self, status):
+        """Return the IDs of tasks with a given status.
+
+        Args:
+            status (TaskStatus): Desired status.
+
+        Returns:
+            set[str]: Matching task IDs. Treat as read-only.
+        """
+        self._ensure_indexes()
+        return self._status_index.get(status, _EMPTY_IDS)
+
+    def ids_by_priority(self, priority):
+        """Return the IDs of tasks with a given priority.
+
+        Args:
+            priority (TaskPriority): Desired priority.
+
+        Returns:
+            set[str]: Matching task IDs. Treat as read-only.
+        """
+        self._ensure_indexes()
+        return self._priority_index.get(priority, _EMPTY_IDS)
+
+    def ids_with_prefix(self, prefix, limit=50):
+        """List task IDs starting with `prefix`, for completion.
+
+        Args:
+            prefix (str): ID prefix, may be empty.
+            limit (int): Maximum number of IDs to return.
+
+        Returns:
+            list[str]: Matching IDs in sorted order.
+        """
+        with self.lock:
+            sorted_ids = self._ensure_sorted_ids()
+            start = bisect_left(sorted_ids, prefix)
+            matches = []
+            for task_id in sorted_ids[start:start + limit]:
+                if not task_id.startswith(prefix):
+                    break
+                matches.append(task_id)
+        return matches
+
+    def all_tags(self):
+        """Return every tag carried by at least one task.
+
+        Returns:
+            list[str]: Tags in sorted order.
+        """
+        self._ensure_indexes()
+        return sorted(self._tag_index)
+
+    def ids_by_tag(self, tag):
+        """Return the IDs of tasks carrying a tag.
+
+        Args:
+            tag (str): Tag to look up.
+
+        Returns:
+            set[str]: Matching task IDs. Treat as read-only.
+        """
+        self._ensure_indexes()
+        return self._tag_index.get(tag, _EMPTY_IDS)
+
+    def _walk(self, index, after=None, reverse=False):
+        """Yield the entries of a sorted index that come after `after`.
+
+        The index is read a chunk at a time under the lock, resuming by
+        binary search from the last entry yielded, so tasks may change
+        while the generator is consumed.
+        """
+        position = after
+        while True:
+            with self.lock:
+                if reverse:
+                    end = len(index) if position is None else bisect_left(index, position)
+                    chunk = index[max(end - WALK_CHUNK, 0):end][::-1]
+                else:
+                    start = 0 if position is None else bisect_right(index, position)
+                    chunk = index[start:start + WALK_CHUNK]
+            if not chunk:
+                return
+            yield from chunk
+            position = chunk[-1]
+
+    def iter_ids_by_created(self, after=None, reverse=False):
+        """Lazily yield task IDs by creation time, ties broken by ID.
+
+        Args:
+            after (tuple[datetime, str] | None): Start after this
+                `(created_at, task_id)` position, which need not belong to
+                an existing task.
+            reverse (bool): Newest first.
+
+        Yields:
+            str: Task IDs.
+        """
+        self._ensure_indexes()
+        for _, task_id in self._walk(self._created_index, after, reverse):
+            yield task_id
+
+    def iter_ids_by_due(self, after=None, reverse=False):
+        """Lazily yield task IDs by due date, ties broken by ID.
+
+        Args:
+            after (tuple[datetime | None, str] | None): Start after this
+                `(due_date, task_id)` position; a None due date is a
+                position among the tasks without one.
+            reverse (bool): Latest due first.
+
+        Yields:
+            str: Task IDs; tasks without a due date come last, or first
+            when reversed.
+        """
+        self._ensure_indexes()
+        dated_after = undated_after = None
+        if after is not None:
+            if after[0] is None:
+                undated_after = after[1]
+            else:
+                dated_after = after
+        dated = (task_id for _, task_id in self._walk(self._due_index, dated_after, reverse))
+        undated = (
+            task_id for task_id in self._walk(self._ensure_sorted_ids(), undated_after, reverse)
+            if self._index_entries.get(task_id, (None, None, True))[2] is None
+        )
+        if reverse:
+            if dated_after is None:
+                yield from undated
+            yield from dated
+        else:
+            if undated_after is None:
+                yield from dated
+            yield from undated
+
+    def _due_bounds(self, start=None, end=None):
+        self._ensure_indexes()
+        low = bisect_left(self._due_index, (start,)) if start is not None else 0
+        high = bisect_left(self._due_index, (end,)) if end is not None else len(self._due_index)
+        return low, high
+
+    def count_due_between(self, start=None, end=None):
+        """Count tasks due in `[start, end)` using the due-date index.
+
+        Args:
+            start (datetime | None): Inclusive lower bound, or unbounded.
+            end (datetime | None): Exclusive upper bound, or unbounded.
+
+        Returns:
+            int: Number of matching tasks.
+        """
+        low, high = self._due_bounds(start, end)
+        return max(high - low, 0)
+
+    def ids_due_between(self, start=None, end=None):
+        """Return the IDs of tasks due in `[start, end)`.
+
+        Args:
+            start (datetime | None): Inclusive lower bound, or unbounded.
+            end (datetime | None): Exclusive upper bound, or unbounded.
+
+        Returns:
+            set[str]: Matching task IDs.
+        """
+        low, high = self._due_bounds(start, end)
+        return {task_id for _, task_id in self._due_index[low:high]}
+
+    @timed("TaskStorage.search")
+    def search(self, query, limit=10):
+        """Full-text search over task titles and descriptions.
+
+        Args:
+            query (str): Words to look for; all must match.
+            limit (int): Maximum number of tasks to return.
+
+        Returns:
+            list[Task]: Matching tasks, best match first.
+        """
+        metrics.inc("storage_operations_total", operation="search")
+        with self.lock:
+            return [self.tasks[task_id] for task_id in self.search_index.search(query, limit)]
+
+    def get_open_tasks_due_before(self, cutoff):
+        """Return open tasks whose due date is earlier than `cutoff`.
+
+        Args:
+            cutoff (datetime): Exclusive upper bound for due dates.
+
+        Returns:
+            list[Task]: Tasks that are not done or abandoned, earliest due first.
+
+        Notes:
+            Uses a sorted due-date index, so only matching tasks are visited.
+        """
+        with self.lock:
+            self._ensure_indexes()
+            end = bisect_left(self._open_due_index, (cutoff,))
+            return [self.tasks[task_id] for _, task_id in self._open_due_index[:end]]
+
@@ -0,0 +1,138 @@
+"""Periodic auto-abandon sweep for stale, low-priority overdue tasks."""
+
+# task_manager/sweeper.py
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .metrics import registry as metrics
+from .models import TaskPriority, TaskStatus
+
+
+class AbandonSweeper:
+    """Move stale overdue tasks to `ABANDONED` outside of read paths.
+
+    Args:
+        storage (TaskStorage): Storage whose tasks are swept.
+        interval (timedelta): Minimum time between two sweeps.
+        grace_period (timedelta): How long a task may be overdue before it is
+            abandoned.
+        archive (TaskArchive | None): When set, each sweep also archives
+            long-finished tasks.
+
+    Example:
+        >>> from .storage import TaskStorage
+        >>> sweeper = AbandonSweeper(TaskStorage("tasks.json"))
+        >>> sweeper.maybe_sweep()
+        []
+
+    Notes:
+        Only tasks returned by `TaskStorage.get_open_tasks_due_before()` are
+        visited, and all changes from one sweep are persisted with a single
+        `save()`. HIGH and URGENT tasks are never abandoned.
+    """
+
+    def __init__(self, storage, interval=timedelta(hours=1),
+                 grace_period=timedelta(days=7), archive=None):
+        """Initialize the sweeper.
+
+        Args:
+            storage (TaskStorage): Storage to sweep.
+            interval (timedelta): Minimum time between sweeps.
+            grace_period (timedelta): Overdue age before abandoning.
+            archive (TaskArchive | None): Archive to move finished tasks to.
+
+        Returns:
+            None
+        """
+        self.storage = storage
+        self.interval = interval
+        self.grace_period = grace_period
+        self.archive = archive
+        self.last_run = None
+        self._stop_event = None
+        self._thread = None
+
+    def sweep(self, now=None):
+        """Abandon every eligible task and persist the changes once.
+
+        Args:
+            now (datetime | None): Reference time, defaults to now.
+
+        Returns:
+            list[str]: IDs of the tasks that were abandoned.
+
+        Notes:
+            With an `archive`, tasks that have been finished for longer than
+            `archive.archive_after` are archived afterwards.
+        """
+        now = now or datetime.now()
+        abandoned = []
+        started = time.perf_counter()
+
+        with self.storage.lock:
+            for task in self.storage.get_open_tasks_due_before(now - self.grace_period):
+                if task.priority in (TaskPriority.HIGH, TaskPriority.URGENT):
+                    continue
+                task.update(status=TaskStatus.ABANDONED)
+                self.storage.reindex_task(task)
+                abandoned.append(task.id)
+
+            if abandoned:
+                self.storage.save()
+            if self.archive is not None:
+                self.archive.archive_from(self.storage, now)
+            self.last_run = now
+
+        metrics.observe("sweep_duration_seconds", time.perf_counter() - started)
+        metrics.inc("swept_tasks_total", len(abandoned))
+        return abandoned
+
+    def maybe_sweep(self, now=None):
+        """Run `sweep()` if at least `interval` has passed since the last run.
+
+        Args:
+            now (datetime | None): Reference time, defaults to now.
+
+        Returns:
+            list[str]: IDs of abandoned tasks, empty when the sweep was skipped.
+        """
+        now = now or datetime.now()
+        if self.last_run is not None and now - self.last_run < self.interval:
+            return []
+        return self.sweep(now)
+
+    def start(self):
+        """Sweep on a background timer every `interval`.
+
+        Returns:
+            None
+
+        Notes:
+            Intended for long-running processes. The timer thread is a daemon
+            and does not keep the interpreter alive.
+        """
+        if self._thread is not None:
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="abandon-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background timer started by `start()`.
+
+        Returns:
+            None
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval.total_seconds()):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error sweeping tasks: {e}")
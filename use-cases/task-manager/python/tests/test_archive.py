@@ -0,0 +1,74 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.archive import TaskArchive
+from python.models import Task, TaskStatus
+from python.storage import TaskStorage
+
+
+def finished_task(title, days_ago, status=TaskStatus.DONE):
+    task = Task(title, tags=["old"])
+    task.status = status
+    task.updated_at = datetime.now() - timedelta(days=days_ago)
+    if status == TaskStatus.DONE:
+        task.completed_at = task.updated_at
+    return task
+
+
+def test_archive_moves_only_old_finished_tasks(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = TaskStorage(path)
+    old_done = finished_task("Old report", 60)
+    old_abandoned = finished_task("Old idea", 45, TaskStatus.ABANDONED)
+    recent_done = finished_task("Recent report", 2)
+    open_task = Task("Open report")
+    storage.add_tasks([old_done, old_abandoned, recent_done, open_task])
+    size_before = os.path.getsize(path)
+
+    archive = TaskArchive(str(tmp_path / "archive"), timedelta(days=30), segment_size=1)
+    assert sorted(archive.archive_from(storage)) == sorted([old_done.id, old_abandoned.id])
+
+    assert len(archive.segments()) == 2
+    assert os.path.getsize(path) < size_before
+    assert set(TaskStorage(path).tasks) == {recent_done.id, open_task.id}
+    assert {task.id for task in archive.iter_tasks()} == {old_done.id, old_abandoned.id}
+    assert archive.get_task(old_done.id).completed_at == old_done.completed_at
+    assert archive.archive_from(storage) == []
+
+
+def test_manager_archives_on_sweep_only_when_configured(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    old = finished_task("Quarterly report", 90)
+    manager.storage.add_task(old)
+    manager.create_task("Trigger a sweep")
+    assert manager.storage.get_task(old.id) is old
+    assert manager.get_statistics()["total"] == 2
+
+    # Archiving on request still leaves the tasks readable
+    assert manager.archive_tasks() == [old.id]
+    assert [task.id for task in manager.list_tasks("done", include_archived=True)] == [old.id]
+
+
+def test_manager_reads_archive_only_when_asked(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"), archive_after=timedelta(days=30))
+    old = finished_task("Quarterly report", 90)
+    manager.storage.add_task(old)
+    # The sweep triggered by the first write archives the finished task
+    new_id = manager.create_task("Quarterly report draft")
+    assert manager.storage.get_task(old.id) is None
+    assert manager.archive_tasks() == []
+
+    assert [task.id for task in manager.search("quarterly")] == [new_id]
+    assert [task.id for task in manager.search("quarterly", include_archived=True)] == [new_id, old.id]
+
+    assert [task.id for task in manager.list_tasks()] == [new_id]
+    listed = manager.list_tasks(sort_by="created", include_archived=True)
+    assert [task.id for task in listed] == [old.id, new_id]
+    assert [task.id for task in manager.list_tasks(limit=1, include_archived=True)] == [old.id]
+    assert [task.id for task in manager.list_tasks(after_id=old.id, include_archived=True)] == [new_id]
@@ -0,0 +1,85 @@
+import io
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.cli import TASK_SEPARATOR, format_task, main, write_tasks
+from python.models import Task, TaskPriority
+
+
+def sample_tasks():
+    first = Task("Deploy", "Roll out v2", TaskPriority.HIGH, datetime(2026, 4, 1), ["ops"])
+    second = Task("Write notes")
+    return [first, second]
+
+
+def test_table_matches_format_task():
+    tasks = sample_tasks()
+    out = io.StringIO()
+    assert write_tasks(iter(tasks), out)[0] == 2
+    assert out.getvalue() == "".join(f"{format_task(task)}\n{TASK_SEPARATOR}\n" for task in tasks)
+    assert "Due: 2026-04-01 | Tags: ops" in out.getvalue()
+
+
+def test_json_and_ndjson_only_include_requested_fields():
+    tasks = sample_tasks()
+    out = io.StringIO()
+    write_tasks(iter(tasks), out, "json", ["title", "due_date"])
+    assert json.loads(out.getvalue()) == [
+        {"title": "Deploy", "due_date": "2026-04-01T00:00:00"},
+        {"title": "Write notes", "due_date": None},
+    ]
+
+    out = io.StringIO()
+    write_tasks(iter(tasks), out, "ndjson", ["id"])
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [{"id": task.id} for task in tasks]
+
+
+def test_ids_and_empty_json():
+    tasks = sample_tasks()
+    out = io.StringIO()
+    write_tasks(iter(tasks), out, "ids")
+    assert out.getvalue().split() == [task.id for task in tasks]
+
+    out = io.StringIO()
+    assert write_tasks(iter([]), out, "json") == (0, None)
+    assert json.loads(out.getvalue()) == []
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        write_tasks(iter(sample_tasks()), io.StringIO(), "ndjson", ["nope"])
+
+
+def test_next_page_hints_walk_across_occurrences(tmp_path, capsys):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    series_id = manager.create_task("Standup", due_date_str="2026-03-02", repeat="daily")
+    manager.create_task("Report", due_date_str="2026-03-01")
+    argv = ["list", "--due-before", "2026-03-06", "--sort", "due", "--limit", "2", "--format", "ids"]
+
+    seen, cursors = [], []
+    for _ in range(5):
+        main(argv + (["--after", cursors[-1]] if cursors else []), task_manager=manager)
+        out, err = capsys.readouterr()
+        seen += out.split()
+        if "Next page" not in err:
+            break
+        cursors.append(err.split()[-1])
+    assert cursors == [f"2026-03-02T00:00:00,{series_id}@2026-03-02", f"2026-03-04T00:00:00,{series_id}@2026-03-04"]
+    assert len(seen) == len(set(seen)) == 5
+    assert f"{series_id}@2026-03-05" in seen
+
+
+def test_stats_verify_checks_the_counters(tmp_path, capsys):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.create_task("Counted")
+    main(["stats", "--verify"], task_manager=manager)
+    out = capsys.readouterr().out
+    assert "Statistics counters match the stored tasks" in out and "Total tasks: 1" in out
@@ -0,0 +1,60 @@
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.codec import BACKENDS, TaskCodec, codec, orjson, task_to_dict
+from python.models import Task, TaskPriority, TaskStatus
+from python.storage import TaskStorage
+
+AVAILABLE_BACKENDS = [backend for backend in BACKENDS if backend != "orjson" or orjson is not None]
+
+
+def sample_task():
+    task = Task("Réviser le plan", "Line one\nline \"two\"", TaskPriority.URGENT,
+                datetime(2026, 3, 1, 9, 30, 15, 250), ["ops", "ünïcode"])
+    task.mark_as_done()
+    return task
+
+
+@pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+def test_round_trip_preserves_every_field(backend):
+    codec = TaskCodec(backend)
+    task = sample_task()
+    restored = codec.decode_tasks(codec.encode_tasks([task]))[0]
+    assert task_to_dict(restored) == task_to_dict(task)
+    assert restored.status == TaskStatus.DONE and not restored.is_dirty
+    assert task_to_dict(codec.decode_task(codec.encode_task(task))) == task_to_dict(task)
+
+
+def test_backends_write_identical_bytes():
+    if orjson is None:
+        pytest.skip("orjson is not installed")
+    tasks = [sample_task(), Task("Plain")]
+    assert TaskCodec("orjson").encode_tasks(tasks) == TaskCodec("json").encode_tasks(tasks)
+
+
+def test_reads_indented_files_from_earlier_versions(tmp_path):
+    task = sample_task()
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([task_to_dict(task)], indent=2))
+
+    storage = TaskStorage(str(path))
+    assert task_to_dict(storage.get_task(task.id)) == task_to_dict(task)
+    storage.update_task(task.id, title="Compact")
+    storage.compact()
+    assert path.read_bytes() == codec.encode_tasks(storage.tasks.values())
+
+
+def test_invalid_values_raise_value_error():
+    record = task_to_dict(Task("Bad"))
+    record["priority"] = 9
+    with pytest.raises(ValueError):
+        TaskCodec("json").decode_tasks(json.dumps([record]))
+    with pytest.raises(ValueError):
+        TaskCodec("msgpack")
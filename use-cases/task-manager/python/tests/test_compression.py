@@ -0,0 +1,55 @@
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.codec import codec, task_to_dict
+from python.compression import EXTENSIONS, compression_for_path, is_available, open_file
+from python.models import Task
+from python.storage import TaskStorage
+
+AVAILABLE_EXTENSIONS = [ext for ext, (name, _) in EXTENSIONS.items() if is_available(name)]
+
+
+@pytest.mark.parametrize("extension", AVAILABLE_EXTENSIONS)
+def test_storage_round_trips_compressed_files(tmp_path, extension):
+    path = tmp_path / f"tasks.json{extension}"
+    storage = TaskStorage(str(path))
+    storage.autosave = False
+    storage.add_tasks(Task(f"Task {i}", "same words " * 5, tags=["ops"]) for i in range(200))
+    storage.commit()
+
+    assert path.stat().st_size < len(codec.encode_tasks(storage.tasks.values())) / 4
+    with open_file(str(path)) as f:
+        assert f.read() == codec.encode_tasks(storage.tasks.values())
+    restored = TaskStorage(str(path))
+    assert [task_to_dict(task) for task in restored.tasks.values()] == \
+        [task_to_dict(task) for task in storage.tasks.values()]
+
+
+def test_decode_stream_handles_records_split_across_chunks():
+    tasks = [Task(f"Task {i}") for i in range(50)]
+    decoded = codec.decode_stream(io.BytesIO(codec.encode_tasks(tasks)), chunk_size=7)
+    assert [task.id for task in decoded] == [task.id for task in tasks]
+    assert codec.decode_stream(io.BytesIO(b"[]")) == []
+
+
+def test_indented_compressed_file_falls_back_to_whole_read(tmp_path):
+    task = Task("Hand-compressed")
+    path = tmp_path / "tasks.json.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(json.dumps([task_to_dict(task)], indent=2))
+    assert TaskStorage(str(path)).get_task(task.id).title == "Hand-compressed"
+
+
+def test_extension_selects_compressor_and_disk_store_needs_plain_file(tmp_path):
+    assert compression_for_path("tasks.JSON.GZ") == "gzip"
+    assert compression_for_path("tasks.json") is None
+    with pytest.raises(ValueError):
+        TaskStorage(str(tmp_path / "tasks.json.gz"), cache_size=10)
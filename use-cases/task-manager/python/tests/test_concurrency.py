@@ -0,0 +1,170 @@
+import gzip
+import json
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.bench_concurrency import run_writers
+from python.models import Task
+from python.storage import TaskStorage
+
+
+def test_commits_from_two_storages_are_merged_from_the_change_log(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    first = TaskStorage(path)
+    second = TaskStorage(path)
+    first_id = first.add_task(Task("From first"))
+    second_id = second.add_task(Task("From second"))
+    assert second.get_task(first_id).title == "From first"
+
+    first.delete_task(first_id)
+    second.update_task(second_id, title="Renamed")
+    assert first_id not in second.tasks
+    assert second.full_reloads == 0
+    assert [task.title for task in TaskStorage(path).get_all_tasks()] == ["Renamed"]
+    assert first.search("renamed") == []
+    first.add_task(Task("Again"))
+    assert [task.title for task in first.search("renamed")] == ["Renamed"]
+
+
+def test_conflicting_update_keeps_the_first_commit(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    first = TaskStorage(path)
+    task_id = first.add_task(Task("Shared"))
+    second = TaskStorage(path)
+
+    assert first.update_task(task_id, title="First")
+    assert not second.update_task(task_id, title="Second")
+    assert second.conflicts == [task_id]
+    assert second.get_task(task_id).title == "First"
+    assert TaskStorage(path).get_task(task_id).version == 2
+
+
+def test_updates_to_different_fields_of_a_task_are_both_kept(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    first = TaskManager(path)
+    task_id = first.create_task("Shared")
+    second = TaskManager(path)
+    second.storage.get_task(task_id)
+
+    assert first.update_task_priority(task_id, 4)
+    assert second.update_task_status(task_id, "in_progress")
+    assert second.storage.conflicts == []
+
+    stored = TaskStorage(path).get_task(task_id)
+    assert (stored.priority.value, stored.status.value) == (4, "in_progress")
+    assert stored.version == 3
+
+
+def test_lost_change_log_falls_back_to_reading_the_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    first = TaskStorage(str(path))
+    second = TaskStorage(str(path))
+    first.add_task(Task("Kept"))
+    Path(f"{path}.changes").unlink()
+
+    second.add_task(Task("Also kept"))
+    assert second.full_reloads == 1
+    assert sorted(task.title for task in TaskStorage(str(path)).get_all_tasks()) == ["Also kept", "Kept"]
+
+
+def test_concurrent_writer_processes_lose_no_tasks(tmp_path):
+    result = run_writers(str(tmp_path / "tasks.json"), processes=3, operations=20)
+    assert result["lost"] == 0
+    assert TaskStorage(str(tmp_path / "tasks.json")).statistics.total == 4 + 3 * 10
+
+
+def test_refresh_applies_only_new_changes(tmp_path):
+    path = tmp_path / "tasks.json"
+    reader = TaskStorage(str(path))
+    writer = TaskStorage(str(path))
+    assert reader.refresh() is False
+
+    task_id = writer.add_task(Task("Written elsewhere"))
+    assert reader.refresh() is True
+    assert reader.get_task(task_id).title == "Written elsewhere"
+    assert reader.full_reloads == 0 and reader.refresh() is False
+
+    replacement = tmp_path / "replacement.json"
+    replacement.write_text(json.dumps([{"id": "x", "title": "Replaced", "priority": 2, "status": "todo"}]))
+    os.replace(replacement, path)
+    assert reader.refresh() is True
+    assert reader.full_reloads == 1
+    assert [task.title for task in reader.get_all_tasks()] == ["Replaced"]
+
+
+def test_manager_picks_up_changes_after_refresh_interval(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    manager = TaskManager(path, refresh_interval=timedelta(hours=1))
+    task_id = TaskStorage(path).add_task(Task("Elsewhere"))
+    assert manager.get_task_details(task_id) is None
+
+    manager.storage.refresh_interval = 0
+    assert manager.get_task_details(task_id).title == "Elsewhere"
+
+
+def test_commits_append_to_the_log_until_it_is_folded_into_the_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    writer = TaskStorage(str(path))
+    reader = TaskStorage(str(path))
+    task_id = writer.add_task(Task("Counter"))
+    file_bytes = path.read_bytes()
+
+    writer._changes.max_bytes = 2000
+    for i in range(6):
+        writer.update_task(task_id, title=f"Counter {i}")
+        if path.read_bytes() != file_bytes:
+            break
+    assert 0 < i < 5  # a few commits went to the log only, then it filled up
+    assert writer.get_task(task_id).title in path.read_text()
+    assert not writer._changes.has_entries()
+
+    reader.refresh()
+    assert reader.get_task(task_id).title == f"Counter {i}" and reader.full_reloads == 1
+    assert TaskStorage(str(path)).get_task(task_id).title == f"Counter {i}"
+
+
+def test_close_folds_the_log_into_the_file(tmp_path):
+    path = tmp_path / "tasks.json"
+    storage = TaskStorage(str(path))
+    task_id = storage.add_task(Task("Draft"))
+    storage.update_task(task_id, title="Final")
+    assert "Final" not in path.read_text()
+
+    storage.close()
+    assert "Final" in path.read_text()
+    assert not storage._changes.has_entries()
+
+
+def test_compressed_store_compresses_its_change_log(tmp_path):
+    path = tmp_path / "tasks.json.gz"
+    writer = TaskStorage(str(path))
+    reader = TaskStorage(str(path))
+    task_id = writer.add_task(Task("Packed"))
+    writer.update_task(task_id, title="Packed again")
+    assert b"Packed again" not in Path(f"{path}.changes").read_bytes()
+
+    reader.refresh()
+    assert reader.get_task(task_id).title == "Packed again"
+    writer.close()
+    with gzip.open(path) as f:
+        assert b"Packed again" in f.read()
+
+
+def test_reading_creates_no_files_and_the_first_commit_creates_the_log(tmp_path):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps([{"id": "x", "title": "Existing", "priority": 2, "status": "todo"}]))
+    reader = TaskStorage(str(path))
+    writer = TaskStorage(str(path))
+    assert [task.title for task in reader.search("existing")] == ["Existing"]
+    assert sorted(os.listdir(tmp_path)) == ["tasks.json"]
+
+    writer.update_task("x", title="Changed")
+    assert writer._changes.has_entries()
+    reader.refresh()
+    assert reader.get_task("x").title == "Changed" and reader.full_reloads == 0
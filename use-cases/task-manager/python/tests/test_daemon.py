@@ -0,0 +1,101 @@
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.cli import main
+from python.daemon import TaskDaemon, send_request
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets required")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    server = TaskDaemon(manager, str(tmp_path / "tasks.sock"), main)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    send_request({"shutdown": True}, server.socket_path)
+    thread.join(timeout=5)
+
+
+def test_commands_run_against_resident_manager(daemon):
+    response = send_request({"argv": ["create", "Served task", "-t", "remote"]}, daemon.socket_path)
+    assert response["output"].startswith("Created task with ID:")
+
+    response = send_request({"argv": ["list", "-t", "remote"]}, daemon.socket_path)
+    assert "Served task" in response["output"]
+    assert len(daemon.task_manager.storage.tasks) == 1
+
+
+def test_argument_errors_do_not_stop_the_daemon(daemon):
+    send_request({"argv": ["status"]}, daemon.socket_path)
+    assert send_request({"argv": ["stats"]}, daemon.socket_path)["output"].startswith("Total tasks: 0")
+
+
+def test_file_arguments_are_relative_to_the_client(daemon, tmp_path):
+    client_dir = tmp_path / "client"
+    client_dir.mkdir()
+    (client_dir / "in.ndjson").write_text('{"title": "Imported"}\n')
+
+    request = {"argv": ["import", "in.ndjson"], "cwd": str(client_dir)}
+    assert send_request(request, daemon.socket_path)["output"].startswith("Imported 1 task(s)")
+    request = {"argv": ["export", "-o", "out.ndjson"], "cwd": str(client_dir)}
+    assert send_request(request, daemon.socket_path)["status"] == 0
+    assert "Imported" in (client_dir / "out.ndjson").read_text()
+
+
+def test_exit_status_is_returned(daemon):
+    assert send_request({"argv": ["stats"]}, daemon.socket_path)["status"] == 0
+    assert send_request({"argv": ["status"]}, daemon.socket_path)["status"] == 2
+
+
+def test_second_daemon_refuses_to_start(daemon):
+    with pytest.raises(RuntimeError):
+        TaskDaemon(daemon.task_manager, daemon.socket_path, main)
+
+
+def test_no_daemon_means_direct_mode(tmp_path):
+    assert send_request({"argv": ["stats"]}, str(tmp_path / "missing.sock")) is None
+
+
+def test_output_is_streamed_in_chunks(daemon, monkeypatch):
+    from python import daemon as daemon_module
+
+    monkeypatch.setattr(daemon_module, "OUTPUT_CHUNK_CHARS", 256)
+    for i in range(20):
+        daemon.task_manager.create_task(f"Task {i}")
+
+    class Collector:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+
+    output = Collector()
+    response = send_request({"argv": ["export", "-o", "-"]}, daemon.socket_path, output)
+    assert (response["output"], response["status"]) == ("", 0)
+    assert len(output.writes) > 1
+    assert "".join(output.writes).count("\n") == 20
+
+    # Without a stream the chunks are collected into the response
+    assert send_request({"argv": ["export", "-o", "-"]}, daemon.socket_path)["output"].count("\n") == 20
+
+
+def test_forwarded_stderr_reaches_the_client(daemon, monkeypatch, capsys):
+    monkeypatch.setenv("TASK_MANAGER_SOCKET", daemon.socket_path)
+    main(["--profile", "stats"])
+    captured = capsys.readouterr()
+    assert captured.out.startswith("Total tasks: 0")
+    assert "total ms" in captured.err
+
+    response = send_request({"argv": ["--profile", "stats"]}, daemon.socket_path)
+    assert "total ms" in response["error"] and "total ms" not in response["output"]
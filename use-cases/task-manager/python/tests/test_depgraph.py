@@ -0,0 +1,90 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.depgraph import DependencyCycleError, DependencyGraph
+from python.models import Task, TaskPriority
+from python.storage import TaskStorage
+
+
+def test_order_stays_topological_and_cycles_are_rejected():
+    rng = random.Random(7)
+    graph = DependencyGraph()
+    nodes = [str(i) for i in range(60)]
+    for node in nodes:
+        graph.update(node, [], finished=False)
+    edges = set()
+    for _ in range(400):
+        blocker, task = rng.sample(nodes, 2)
+        before = graph.topological_order()
+        try:
+            graph.add_edge(blocker, task)
+            edges.add((blocker, task))
+        except DependencyCycleError:
+            assert graph.topological_order() == before
+        position = {node: i for i, node in enumerate(graph.topological_order())}
+        assert all(position[b] < position[t] for b, t in edges)
+    assert graph.ready == {node for node in nodes if not graph.blockers_of(node)}
+
+
+def test_ready_set_follows_blocker_states():
+    graph = DependencyGraph()
+    graph.update("a", ["b", "c"], finished=False)
+    assert graph.ready == {"a"}  # unknown blockers do not block
+    graph.update("b", [], finished=False)
+    graph.update("c", [], finished=True)
+    assert graph.ready == {"b"}
+    graph.update("b", [], finished=True)
+    assert graph.ready == {"a"}
+    graph.update("b", [], finished=False)
+    graph.remove("b")
+    assert graph.ready == {"a"}
+    with pytest.raises(DependencyCycleError):
+        graph.add_edge("a", "a")
+
+
+def test_ready_tasks_ranks_only_unblocked_tasks(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    manager = TaskManager(path)
+    design = manager.create_task("Design", priority_value=2)
+    build = manager.create_task("Build", priority_value=4)
+    docs = manager.create_task("Docs", priority_value=1)
+    assert manager.add_dependency(build, design)
+    assert not manager.add_dependency(design, build)
+    assert [task.title for task in manager.ready_tasks()] == ["Design", "Docs"]
+    assert docs in manager.storage.ready_ids() and build not in manager.storage.ready_ids()
+
+    manager.update_task_status(design, "done")
+    assert [task.title for task in manager.ready_tasks()] == ["Build", "Docs"]
+
+    storage = TaskStorage(path)
+    assert storage.get_task(build).blocked_by == [design]
+    assert storage.topological_order().index(design) < storage.topological_order().index(build)
+    storage.add_task(Task("Review", priority=TaskPriority.URGENT, blocked_by=[build]))
+    storage.delete_task(build)
+    assert {storage.get_task(task_id).title for task_id in storage.ready_ids()} == {"Docs", "Review"}
+
+
+def test_deleted_blocker_is_dropped_from_its_dependents(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = TaskStorage(path)
+    blocker = storage.add_task(Task("Blocker"))
+    other = storage.add_task(Task("Other"))
+    first = storage.add_task(Task("First", blocked_by=[blocker, other]))
+    second = storage.add_task(Task("Second", blocked_by=[blocker]))
+
+    assert storage.delete_task(blocker)
+    assert TaskStorage(path).get_task(first).blocked_by == [other]
+    assert TaskStorage(path).get_task(second).blocked_by == []
+
+    # Batch deletes without built indexes scan the tasks instead
+    reloaded = TaskStorage(path)
+    assert reloaded.delete_tasks([other]) == 1
+    assert TaskStorage(path).get_task(first).blocked_by == []
+    assert first in reloaded.ready_ids()
@@ -0,0 +1,97 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.diskstore import DiskTaskStore
+from python.models import Task, TaskStatus
+from python.storage import TaskStorage
+
+
+def test_cache_is_bounded_and_dirty_tasks_are_written_back(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    store = DiskTaskStore(path, cache_size=3)
+    tasks = [Task(f"Task {i}") for i in range(10)]
+    for task in tasks:
+        store[task.id] = task
+
+    # Evicted dirty tasks stay pinned until flush() writes them
+    info = store.cache_info()
+    assert info["size"] == 3 and info["evictions"] == 7 and info["writebacks"] == 0
+    assert info["pinned"] == store.pinned == 7
+    assert store.file_size == 0
+    store.flush()
+    assert store.cache_info()["writebacks"] == 10
+    assert len(store) == 10
+    assert store[tasks[0].id].title == "Task 0"
+    assert store.cache_info()["misses"] == 1
+    assert store[tasks[0].id] is store[tasks[0].id]
+    assert [task.title for task in store.values()] == [f"Task {i}" for i in range(10)]
+    assert store.cache_info()["size"] == 3
+
+    del store[tasks[1].id]
+    store.close()
+    reopened = DiskTaskStore(path, cache_size=3)
+    assert len(reopened) == 9 and tasks[1].id not in reopened
+
+
+def test_storage_commits_once_pinned_tasks_outgrow_the_cache(tmp_path):
+    storage = TaskStorage(str(tmp_path / "tasks.json"), cache_size=2)
+    storage.autosave = False
+    for i in range(10):
+        storage.add_task(Task(f"Task {i}"))
+        assert storage.tasks.pinned <= 3
+    assert storage.tasks.file_size > 0
+def test_compaction_drops_stale_records(tmp_path, monkeypatch):
+    monkeypatch.setattr("python.diskstore.MIN_COMPACT_GARBAGE_BYTES", 0)
+    path = tmp_path / "tasks.json"
+    store = DiskTaskStore(str(path), cache_size=2)
+    task = Task("Rewritten")
+    for i in range(5):
+        task.description = f"version {i}"
+        store[task.id] = task
+        store.flush()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["description"] == "version 4"
+
+
+def test_legacy_file_is_kept_when_conversion_fails(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.json"
+    TaskStorage(str(path)).add_task(Task("Legacy"))
+    original = path.read_bytes()
+
+    def fail(task):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(DiskTaskStore, "_encode", staticmethod(fail))
+    try:
+        DiskTaskStore(str(path))
+    except OSError:
+        pass
+    assert path.read_bytes() == original
+    assert not (tmp_path / "tasks.json.tmp").exists()
+
+    monkeypatch.undo()
+    assert len(DiskTaskStore(str(path))) == 1
+    assert (tmp_path / "tasks.json.legacy").read_bytes() == original
+
+
+def test_storage_converts_json_array_and_keeps_queries_working(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = TaskStorage(path)
+    for i in range(20):
+        storage.add_task(Task(f"Task {i}", tags=["even" if i % 2 == 0 else "odd"]))
+
+    manager = TaskManager(path, cache_size=5)
+    task_id = manager.list_tasks(tags_any=["even"])[0].id
+    assert len(manager.list_tasks(tags_any=["even"])) == 10
+    assert manager.update_task_status(task_id, "done")
+    assert manager.storage.cache_info()["size"] <= 5
+
+    restored = TaskStorage(path)
+    assert len(restored.tasks) == 20
+    assert restored.get_task(task_id).status == TaskStatus.DONE
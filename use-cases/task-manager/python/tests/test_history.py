@@ -0,0 +1,60 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.history import KEYFRAME_INTERVAL, TaskHistory
+from python.models import Task, TaskStatus
+from python.storage import TaskStorage
+
+
+def test_every_revision_is_rebuilt_from_keyframes_and_deltas(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = TaskStorage(path, history=True)
+    task_id = storage.add_task(Task("Draft 0"))
+    for i in range(1, 40):
+        storage.update_task(task_id, title=f"Draft {i}")
+    task = storage.get_task(task_id)
+    task.add_tag("audit")
+    task.mark_as_done()
+    storage.reindex_task(task)
+    storage.save()
+
+    history = TaskHistory(f"{path}.history")
+    entries = history.revisions(task_id)
+    assert [entry["rev"] for entry in entries] == list(range(1, 43))
+    assert entries[1]["fields"] == {"title": "Draft 1"}
+    assert set(entries[-1]["fields"]) == {"status", "completed_at"}
+    assert len(history._index[task_id]) == 42 + 42 // KEYFRAME_INTERVAL
+
+    for revision in (1, 16, 17, 33, 40):
+        assert history.task_at(task_id, revision).title == f"Draft {revision - 1}"
+    latest = history.task_at(task_id)
+    assert latest.status == TaskStatus.DONE and latest.tags == ["audit"]
+    assert latest.updated_at == task.updated_at and latest.revision == 42
+
+
+def test_deletions_segments_and_disabled_history(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.json")
+    manager = TaskManager(path, history=True)
+    manager.storage.history.segment_bytes = 100
+    task_id = manager.create_task("Short-lived")
+    manager.add_tag_to_task(task_id, "temp")
+    manager.delete_task(task_id)
+
+    assert len(os.listdir(f"{path}.history")) == 3
+    assert [entry.get("deleted", False) for entry in manager.get_task_history(task_id)] == [False, False, True]
+    assert manager.get_task_revision(task_id, 2).tags == ["temp"]
+    assert manager.get_task_revision(task_id, 3) is None
+
+    other = str(tmp_path / "other.json")
+    storage = TaskStorage(other)
+    task_id = storage.add_task(Task("Untracked"))
+    # Without a history no change is copied for it
+    monkeypatch.setattr("python.models.deepcopy", lambda value: (_ for _ in ()).throw(AssertionError))
+    storage.update_task(task_id, title="Still untracked")
+    storage.get_task(task_id).add_tag("plain")
+    assert not os.path.exists(f"{other}.history")
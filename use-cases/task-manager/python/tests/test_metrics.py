@@ -0,0 +1,62 @@
+import sys
+import urllib.request
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.metrics import FileSink, HttpSink, MetricsRegistry, registry
+
+
+def samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_histogram_buckets_are_cumulative():
+    local = MetricsRegistry()
+    for seconds in (0.0005, 0.003, 0.2, 20):
+        local.observe("save_duration_seconds", seconds)
+    values = samples(local.render())
+
+    assert values['task_manager_save_duration_seconds_bucket{le="0.001"}'] == "1"
+    assert values['task_manager_save_duration_seconds_bucket{le="0.5"}'] == "3"
+    assert values['task_manager_save_duration_seconds_bucket{le="+Inf"}'] == "4"
+    assert values["task_manager_save_duration_seconds_count"] == "4"
+
+
+def test_manager_operations_feed_the_registry(tmp_path):
+    registry.reset()
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.create_task("Current")
+    stale_id = manager.create_task("Stale", priority_value=1)
+    manager.storage.update_task(stale_id, due_date=datetime.now() - timedelta(days=30))
+    manager.sweep_abandoned()
+    values = samples(registry.render())
+
+    assert values['task_manager_storage_operations_total{operation="add"}'] == "2"
+    assert values['task_manager_storage_operations_total{operation="update"}'] == "1"
+    assert values['task_manager_tasks{status="todo"}'] == "1"
+    assert values['task_manager_tasks{status="abandoned"}'] == "1"
+    assert values["task_manager_swept_tasks_total"] == "1"
+    # The first write also triggers a (no-op) scheduled sweep
+    assert values["task_manager_sweep_duration_seconds_count"] == "2"
+    assert int(values["task_manager_store_file_size_bytes"]) == (tmp_path / "tasks.json").stat().st_size
+
+
+def test_file_and_http_sinks_publish_the_same_text(tmp_path):
+    local = MetricsRegistry()
+    local.inc("storage_operations_total", operation="load")
+
+    path = tmp_path / "metrics.prom"
+    FileSink(str(path)).publish(local)
+    assert path.read_text() == local.render()
+
+    sink = HttpSink(port=0)
+    sink.publish(local)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{sink.port}/metrics", timeout=5) as response:
+            assert response.read().decode("utf-8") == local.render()
+    finally:
+        sink.close()
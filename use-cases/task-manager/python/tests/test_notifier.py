@@ -0,0 +1,106 @@
+import asyncio
+import random
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.models import Task, TaskPriority, TaskStatus
+from python.notifier import DueDateNotifier, TimerWheel
+from python.storage import TaskStorage
+
+
+def test_timer_wheel_matches_a_sorted_reference():
+    rng = random.Random(11)
+    wheel = TimerWheel(start_tick=1000)
+    pending = {}
+    now = 999
+    for _ in range(3000):
+        action = rng.random()
+        key = rng.randrange(300)
+        if action < 0.5:
+            tick = now + rng.choice([rng.randrange(100), rng.randrange(10_000), rng.randrange(1 << 31)])
+            wheel.schedule(key, tick, tick)
+            pending[key] = tick
+        elif action < 0.7:
+            assert wheel.cancel(key) == (pending.pop(key, None) is not None)
+        else:
+            now += rng.choice([1, 63, 64, 5000, 1 << 20])
+            fired = wheel.advance(now)
+            expected = sorted((tick, key) for key, tick in pending.items() if tick <= now)
+            assert sorted((tick, key) for key, tick, _ in fired) == expected
+            assert [tick for _, tick, _ in fired] == sorted(tick for _, tick, _ in fired)
+            for _, key in expected:
+                del pending[key]
+        assert len(wheel) == len(pending)
+        hint = wheel.next_due_tick()
+        assert hint is None if not pending else hint <= min(pending.values())
+
+
+def test_notifier_follows_task_changes(tmp_path):
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    now = datetime.now()
+    report = storage.add_task(Task("Report", due_date=now + timedelta(hours=3)))
+    launch = storage.add_task(Task("Launch", priority=TaskPriority.URGENT, due_date=now + timedelta(hours=3)))
+    storage.add_task(Task("Late already", due_date=now - timedelta(days=1)))
+    events = []
+    notifier = DueDateNotifier(
+        storage,
+        on_due_soon=lambda task_id, due: events.append(("soon", task_id)),
+        on_overdue=lambda task_id, due: events.append(("overdue", task_id)),
+        on_abandon=lambda task_id, due: events.append(("abandon", task_id)),
+    )
+    assert len(notifier) == 3  # the abandon timer of "Late already" is still ahead
+
+    assert sorted(notifier.run_pending(now + timedelta(hours=2, minutes=30))) == sorted([
+        ("due_soon", report, now + timedelta(hours=3)),
+        ("due_soon", launch, now + timedelta(hours=3)),
+    ])
+    storage.update_task(report, due_date=now + timedelta(days=2))
+    storage.update_task(launch, status=TaskStatus.DONE)
+    new = storage.add_task(Task("New", due_date=now + timedelta(hours=4)))
+    events.clear()
+    notifier.run_pending(now + timedelta(days=10))
+    for task_id in (report, new):
+        assert [event for event, fired_id in events if fired_id == task_id] == ["soon", "overdue", "abandon"]
+    assert len(events) == 7 and launch not in {task_id for _, task_id in events}
+    assert len(notifier) == 0
+
+    storage.delete_task(report)
+    notifier.close()
+    assert storage._due_listeners == []
+
+
+def test_background_thread_and_asyncio_task_fire_on_time(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task_id = manager.create_task("Soon")
+    fired = threading.Event()
+    notifier = DueDateNotifier(
+        manager.storage, on_overdue=lambda *_: fired.set(), resolution=timedelta(milliseconds=10)
+    )
+    notifier.start()
+    manager.storage.update_task(task_id, due_date=datetime.now() + timedelta(milliseconds=200))
+    assert fired.wait(5)
+    notifier.close()
+
+    async def watch():
+        results = []
+        notifier = DueDateNotifier(
+            manager.storage, on_due_soon=lambda task_id, _: results.append(task_id),
+            due_soon=timedelta(0), resolution=timedelta(milliseconds=10),
+        )
+        runner = asyncio.create_task(notifier.run_async())
+        manager.storage.update_task(task_id, due_date=datetime.now() + timedelta(milliseconds=200))
+        for _ in range(500):
+            if results:
+                break
+            await asyncio.sleep(0.01)
+        runner.cancel()
+        notifier.close()
+        return results
+
+    assert asyncio.run(watch()) == [task_id]
@@ -0,0 +1,59 @@
+import pstats
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.profiling import Profiler, profiler, timed
+
+
+@timed("test.double")
+def double(value):
+    return value * 2
+
+
+@timed("test.count")
+def count_up(limit):
+    yield from range(limit)
+
+
+def test_disabled_profiler_records_nothing():
+    profiler.reset()
+    was_enabled, profiler.enabled = profiler.enabled, False
+    try:
+        assert double(2) == 4
+        assert list(count_up(3)) == [0, 1, 2]
+        assert profiler.span("test.block") is profiler.span("test.other")
+    finally:
+        profiler.enabled = was_enabled
+    assert profiler.report() == {}
+
+
+def test_session_reports_calls_bytes_and_percentiles(tmp_path, capsys):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    dump_path = tmp_path / "profile.out"
+    with profiler.session(str(dump_path)):
+        for value in range(10):
+            double(value)
+        assert list(count_up(4)) == [0, 1, 2, 3]
+        manager.create_task("Profiled task")
+        report = profiler.report()
+
+    assert report["test.double"]["count"] == 10
+    assert report["test.count"]["count"] == 1
+    assert report["TaskManager.create_task"]["count"] == 1
+    assert report["TaskStorage.commit"]["bytes_written"] > 0
+    assert report["test.double"]["p50"] <= report["test.double"]["p99"] <= report["test.double"]["max"]
+    assert "TaskManager.create_task" in capsys.readouterr().err
+    assert pstats.Stats(str(dump_path)).total_calls > 0
+
+
+def test_percentiles_use_recorded_samples():
+    local = Profiler(enabled=True)
+    for millis in range(1, 101):
+        local.record("op", millis / 1000, bytes_read=10)
+    entry = local.report()["op"]
+    assert (entry["count"], entry["bytes_read"]) == (100, 1000)
+    assert (entry["p50"], entry["p95"], entry["p99"]) == (0.05, 0.095, 0.099)
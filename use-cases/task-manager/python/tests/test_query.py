@@ -0,0 +1,144 @@
+from datetime import datetime
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.models import TaskPriority, TaskStatus
+from python.query import TaskQuery, decode_cursor, encode_cursor
+
+
+def _manager(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.create_task("Write report", "quarterly numbers", 3, "2026-01-10", ["work", "writing"])
+    manager.create_task("Buy milk", "", 1, "2026-01-05", ["home"])
+    manager.create_task("Fix prod bug", "pager alert", 4, "2026-01-20", ["work", "urgent"])
+    manager.create_task("Read book", "", 2, None, ["home", "writing"])
+    return manager
+
+
+def test_filters_are_combined(tmp_path):
+    manager = _manager(tmp_path)
+    bug = [t for t in manager.storage.get_all_tasks() if t.title == "Fix prod bug"][0]
+    manager.update_task_status(bug.id, "in_progress")
+
+    titles = [t.title for t in manager.list_tasks(status_filter="todo", tags_all=["work"])]
+    assert titles == ["Write report"]
+
+    titles = [t.title for t in manager.list_tasks(status_filter=["todo", "in_progress"], min_priority=3)]
+    assert titles == ["Write report", "Fix prod bug"]
+
+
+def test_tags_any_all_and_text(tmp_path):
+    manager = _manager(tmp_path)
+
+    assert {t.title for t in manager.list_tasks(tags_any=["urgent", "home"])} == {
+        "Buy milk", "Fix prod bug", "Read book"}
+    assert [t.title for t in manager.list_tasks(tags_all=["home", "writing"])] == ["Read book"]
+    assert [t.title for t in manager.list_tasks(text="PAGER")] == ["Fix prod bug"]
+
+
+def test_due_range_and_sort(tmp_path):
+    manager = _manager(tmp_path)
+
+    tasks = manager.list_tasks(due_after_str="2026-01-06", due_before_str="2026-01-20")
+    assert [t.title for t in tasks] == ["Write report"]
+
+    tasks = manager.list_tasks(sort_by="due")
+    assert [t.title for t in tasks] == ["Buy milk", "Write report", "Fix prod bug", "Read book"]
+
+    tasks = manager.list_tasks(sort_by="priority", reverse=True)
+    assert [t.priority for t in tasks][0] == TaskPriority.URGENT
+
+
+def test_overdue_uses_due_index(tmp_path):
+    manager = _manager(tmp_path)
+    now = datetime(2026, 1, 12)
+    query = TaskQuery(overdue=True, tags_any=["work", "home"])
+
+    assert {t.title for t in query.run(manager.storage, now)} == {"Write report", "Buy milk"}
+    assert len(query.plan(manager.storage, now)) == 2
+
+
+def test_plan_starts_from_most_selective_index(tmp_path):
+    manager = _manager(tmp_path)
+    query = TaskQuery(statuses=[TaskStatus.TODO], tags_all=["urgent"])
+
+    # Only the single "urgent" task is a candidate, not every TODO task
+    assert len(query.plan(manager.storage)) == 1
+
+
+def test_indexes_follow_tag_changes(tmp_path):
+    manager = _manager(tmp_path)
+    milk = manager.list_tasks(text="milk")[0]
+
+    manager.add_tag_to_task(milk.id, "errand")
+    assert [t.title for t in manager.list_tasks(tags_all=["errand"])] == ["Buy milk"]
+
+    manager.remove_tag_from_task(milk.id, "errand")
+    assert manager.list_tasks(tags_all=["errand"]) == []
+
+
+def test_cursor_pagination_walks_every_task_once(tmp_path):
+    manager = _manager(tmp_path)
+    seen = []
+    after_id = None
+    while True:
+        page = manager.list_tasks(sort_by="title", limit=3, after_id=after_id)
+        seen.extend(task.title for task in page)
+        if len(page) < 3:
+            break
+        after_id = page[-1].id
+
+    assert seen == ["Buy milk", "Fix prod bug", "Read book", "Write report"]
+
+
+def test_cursor_keeps_its_place_when_the_task_changes(tmp_path):
+    manager = _manager(tmp_path)
+    first = manager.list_tasks(sort_by="due", limit=2)
+    cursor = encode_cursor(first[-1], "due")
+    assert decode_cursor(cursor, "due") == TaskQuery(sort_by="due").cursor_for(first[-1])
+
+    manager.delete_task(first[-1].id)
+    manager.update_task_due_date(first[0].id, "2026-01-30")
+    rest = manager.list_tasks(sort_by="due", limit=5, after_id=cursor)
+    assert [t.title for t in rest] == ["Fix prod bug", "Buy milk", "Read book"]
+
+    title_cursor = encode_cursor(manager.list_tasks(sort_by="title", limit=1)[0], "title")
+    assert title_cursor.startswith("buy%20milk,")
+    assert manager.list_tasks(after_id="2026-99-01,abc", sort_by="due") == []
+
+
+def test_unlimited_listings_stream_in_index_order(tmp_path):
+    manager = _manager(tmp_path)
+    manager.create_task("Old", "", 2, "2026-01-05")
+    old = manager.list_tasks(text="Old")[0]
+    old.created_at = datetime(2020, 1, 1)
+    manager.storage.reindex_task(old)
+    for sort_by in ("created", "due"):
+        for reverse in (False, True):
+            streamed = [t.id for t in manager.iter_tasks(sort_by=sort_by, reverse=reverse)]
+            limited = [t.id for t in manager.list_tasks(sort_by=sort_by, reverse=reverse, limit=10)]
+            assert streamed == limited
+            cursor = TaskQuery(sort_by=sort_by).cursor_for(manager.storage.get_task(streamed[1]))
+            query = TaskQuery(sort_by=sort_by, reverse=reverse, after=cursor)
+            assert [t.id for t in query.iter_results(manager.storage)] == streamed[2:]
+
+
+def test_reverse_pagination_and_unknown_cursor(tmp_path):
+    manager = _manager(tmp_path)
+    first = manager.list_tasks(sort_by="priority", reverse=True, limit=2)
+    second = manager.list_tasks(sort_by="priority", reverse=True, limit=2, after_id=first[-1].id)
+
+    assert [t.priority.value for t in first + second] == [4, 3, 2, 1]
+    assert manager.list_tasks(after_id="missing") == []
+
+
+def test_iter_tasks_is_lazy(tmp_path):
+    manager = _manager(tmp_path)
+    tasks = manager.iter_tasks(tags_any=["home"])
+
+    assert not isinstance(tasks, list)
+    assert next(tasks).title == "Buy milk"
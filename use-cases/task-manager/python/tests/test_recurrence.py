@@ -0,0 +1,103 @@
+import json
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.models import TaskStatus
+from python.recurrence import RecurrenceRule
+
+
+def test_rules_expand_lazily_from_any_window():
+    start = datetime(2026, 1, 30, 9, 0)
+    monthly = RecurrenceRule.parse("monthly:30,31")
+    assert [d.date().isoformat() for d in monthly.iter_dates(start, end=datetime(2026, 4, 1))] == [
+        "2026-01-30", "2026-01-31", "2026-03-30", "2026-03-31",
+    ]
+    every_other_week = RecurrenceRule.parse("weekly/2:mon")
+    window = every_other_week.iter_dates(start, datetime(2126, 1, 1), datetime(2126, 1, 20))
+    assert [d.isoformat() for d in window] == ["2126-01-14T09:00:00"]
+    daily = RecurrenceRule.parse("daily/3").iter_dates(start)
+    assert next(daily) == start and next(daily) == start + timedelta(days=3)
+    assert str(RecurrenceRule.parse("Weekly/2:fri,mon")) == "weekly/2:mon,fri"
+
+
+def test_dates_are_counted_like_they_are_expanded():
+    start = datetime(2026, 1, 30, 9, 0)
+    rules = ["daily", "daily/3", "weekly", "weekly/2:mon,fri", "weekly:sun", "monthly:30,31", "monthly/5:1,15"]
+    ends = [start, start + timedelta(hours=1), datetime(2026, 2, 2, 9, 0), datetime(2026, 2, 9), datetime(2029, 7, 1, 12)]
+    for text in rules:
+        rule = RecurrenceRule.parse(text)
+        for end in ends:
+            assert rule.count_dates(start, end) == len(list(rule.iter_dates(start, end=end))), (text, end)
+def test_series_is_stored_once_and_occurrences_are_tracked_as_exceptions(tmp_path):
+    path = tmp_path / "tasks.json"
+    manager = TaskManager(str(path))
+    series_id = manager.create_task("Standup", due_date_str="2026-03-02", repeat="weekly:mon,thu")
+    assert manager.create_task("Broken", repeat="hourly") is None
+
+    listed = manager.list_tasks(due_after_str="2026-03-01", due_before_str="2026-03-15")
+    assert [task.id for task in listed] == [
+        f"{series_id}@2026-03-02", f"{series_id}@2026-03-05",
+        f"{series_id}@2026-03-09", f"{series_id}@2026-03-12",
+    ]
+    assert len(json.loads(path.read_text())) == 1
+
+    occurrence_id = manager.resolve_task_id(f"{series_id[:8]}@2026-03-05")
+    assert occurrence_id == f"{series_id}@2026-03-05"
+    assert manager.update_task_status(occurrence_id, "done")
+    reloaded = TaskManager(str(path))
+    exceptions = reloaded.get_task_details(series_id).recurrence["exceptions"]
+    assert list(exceptions) == ["2026-03-05"] and exceptions["2026-03-05"]["status"] == "done"
+    occurrence = reloaded.get_task_details(f"{series_id}@2026-03-05")
+    assert occurrence.status == TaskStatus.DONE
+    assert occurrence.completed_at == datetime.fromisoformat(exceptions["2026-03-05"]["completed_at"])
+    overdue = reloaded.list_tasks(status_filter="todo", due_before_str="2026-03-06")
+    assert [task.id for task in overdue] == [f"{series_id}@2026-03-02"]
+
+
+def test_ready_tasks_include_upcoming_occurrences(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    today = date.today().isoformat()
+    series_id = manager.create_task("Water plants", due_date_str=today, repeat="daily")
+    manager.create_task("One-off")
+
+    assert [task.title for task in manager.ready_tasks()] == ["One-off"]
+    upcoming = manager.ready_tasks(due_before=datetime.now() + timedelta(days=2))
+    assert sorted(task.id for task in upcoming if task.title == "Water plants") == [
+        f"{series_id}@{date.today() + timedelta(days=offset)}" for offset in range(3)
+    ]
+
+
+def test_statistics_count_occurrences_like_listings(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    start = date.today() - timedelta(days=3)
+    series_id = manager.create_task("Stretch", due_date_str=start.isoformat(), repeat="daily")
+    manager.update_task_status(f"{series_id}@{start}", "done")
+
+    overdue = manager.list_tasks(show_overdue=True)
+    assert [task.id for task in overdue] == [f"{series_id}@{start + timedelta(days=offset)}" for offset in (1, 2, 3)]
+    stats = manager.get_statistics()
+    assert stats["overdue"] == len(overdue)
+    assert stats["completed_last_week"] == 1
+
+
+def test_ready_occurrences_start_today_and_old_exceptions_are_read(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    start = date.today() - timedelta(days=30)
+    series_id = manager.create_task("Water plants", due_date_str=start.isoformat(), repeat="daily")
+
+    upcoming = manager.ready_tasks(limit=None, due_before=datetime.now() + timedelta(days=2))
+    assert [task.due_date.date() for task in sorted(upcoming, key=lambda task: task.due_date)] == [
+        date.today() + timedelta(days=offset) for offset in range(3)
+    ]
+
+    # Exceptions written before completion times were stored hold the bare status
+    series = manager.storage.get_task(series_id)
+    series.recurrence["exceptions"][start.isoformat()] = "done"
+    occurrence = manager.get_task_details(f"{series_id}@{start}")
+    assert occurrence.status == TaskStatus.DONE and occurrence.completed_at is None
+    assert not series.set_occurrence_status(start, TaskStatus.DONE)
@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.models import Task
+from python.search import TextIndex, tokenize
+
+
+def test_tokenize():
+    assert tokenize("Fix the Login-page!") == ["fix", "the", "login", "page"]
+    assert tokenize(None) == []
+
+
+def test_ranking_prefers_title_and_requires_all_terms():
+    index = TextIndex()
+    in_title = Task("Quarterly report", "numbers")
+    in_description = Task("Finance", "prepare the quarterly report")
+    partial = Task("Quarterly planning")
+    for task in (in_title, in_description, partial):
+        index.update(task)
+
+    assert index.search("quarterly report") == [in_title.id, in_description.id]
+    assert index.search("missing words") == []
+
+
+def test_trigram_substring_matches():
+    index = TextIndex()
+    task = Task("Migrate OAuth tokens")
+    index.update(task)
+
+    assert index.search("auth") == [task.id]
+    assert TextIndex(trigrams=False).search("auth") == []
+
+
+def test_index_follows_updates_and_deletes(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task_id = manager.create_task("Draft budget")
+
+    manager.storage.update_task(task_id, title="Draft roadmap")
+    assert manager.search("budget") == []
+    assert [t.id for t in manager.search("roadmap")] == [task_id]
+
+    manager.delete_task(task_id)
+    assert manager.search("roadmap") == []
+
+
+def test_index_is_persisted_and_reused(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.json")
+    manager = TaskManager(path)
+    task_id = manager.create_task("Renew passport", "book appointment")
+
+    # A fresh load must not re-tokenize tasks when the index file is current
+    monkeypatch.setattr(TextIndex, "update", lambda self, task: (_ for _ in ()).throw(AssertionError))
+    reloaded = TaskManager(path)
+    assert [t.id for t in reloaded.search("appointment")] == [task_id]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    path = tmp_path / "tasks.json"
+    manager = TaskManager(str(path))
+    manager.create_task("Renew passport")
+    (tmp_path / "tasks.json.search").write_text('{"version": 1, "fingerprint": [0, 0], "documents": {}}')
+
+    assert len(TaskManager(str(path)).search("passport")) == 1
+
+
+def test_commits_append_changes_to_the_index_file(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.json"
+    search_path = tmp_path / "tasks.json.search"
+    manager = TaskManager(str(path))
+    first_id = manager.create_task("Renew passport")
+    manager.search("passport")
+    snapshot = search_path.read_bytes()
+
+    second_id = manager.create_task("Book flights")
+    manager.storage.update_task(first_id, title="Renew visa")
+
+    # The full index is written once; later commits only add lines to it
+    data = search_path.read_bytes()
+    assert data.startswith(snapshot)
+    assert len(data.splitlines()) == 3
+
+    monkeypatch.setattr(TextIndex, "update", lambda self, task: (_ for _ in ()).throw(AssertionError))
+    reloaded = TaskManager(str(path))
+    assert [t.id for t in reloaded.search("visa")] == [first_id]
+    assert [t.id for t in reloaded.search("flights")] == [second_id]
+    assert reloaded.search("passport") == []
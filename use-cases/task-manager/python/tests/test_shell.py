@@ -0,0 +1,67 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.cli import main
+from python.shell import TaskShell
+
+
+def run_shell(manager, lines):
+    shell = TaskShell(manager, main, history_path=None, stdin=io.StringIO("\n".join(lines) + "\n"))
+    shell.cmdloop(intro="")
+    return shell
+
+
+def stored_titles(path):
+    if not path.exists():
+        return []
+    return [task["title"] for task in json.loads(path.read_text())]
+
+
+def test_writes_are_batched_until_commit(tmp_path, capsys):
+    path = tmp_path / "tasks.json"
+    manager = TaskManager(str(path))
+    shell = TaskShell(manager, main, history_path=None)
+
+    shell.onecmd('create "First task" -t ops')
+    shell.onecmd('create "Second task"')
+    assert stored_titles(path) == []
+    assert manager.storage.dirty
+
+    shell.onecmd("commit")
+    assert sorted(stored_titles(path)) == ["First task", "Second task"]
+    assert "Changes committed." in capsys.readouterr().out
+
+
+def test_exit_commits_pending_changes(tmp_path):
+    path = tmp_path / "tasks.json"
+    manager = TaskManager(str(path))
+    run_shell(manager, ['create "Keep me"', "exit"])
+
+    assert stored_titles(path) == ["Keep me"]
+    assert manager.storage.autosave
+
+
+def test_completion_uses_short_ids_and_tags(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task_id = manager.create_task("Tagged", tags=["backend", "bugfix"])
+    shell = TaskShell(manager, main, history_path=None)
+
+    assert shell.completedefault(task_id[:2], f"show {task_id[:2]}", 5, 7) == [task_id[:8]]
+    assert shell.completedefault("b", "list -t b", 8, 9) == ["backend", "bugfix"]
+    assert shell.completedefault("ba", f"tag {task_id[:8]} ba", 13, 15) == ["backend"]
+    assert shell.completenames("st") == ["stats", "status"]
+
+
+def test_invalid_arguments_keep_the_shell_running(tmp_path, capsys):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    run_shell(manager, ["status", "shell", "stats"])
+
+    out = capsys.readouterr().out
+    assert "not available inside the shell" in out
+    assert "Total tasks: 0" in out
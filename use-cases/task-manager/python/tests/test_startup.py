@@ -0,0 +1,36 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_PARENT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = {"python.app", "python.storage", "python.query", "python.search",
+                 "python.daemon", "python.shell", "socket"}
+
+
+def imported_modules(tmp_path, *argv):
+    """Run the CLI with `-X importtime` and return the modules it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "python.cli", *argv],
+        cwd=tmp_path, env={"PYTHONPATH": str(PACKAGE_PARENT)},
+        capture_output=True, text=True, check=False,
+    )
+    return {line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines()
+            if line.startswith("import time:") and "|" in line}
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["list", "--bad-option"], ["daemon", "--stop"]])
+def test_commands_without_tasks_skip_application_imports(tmp_path, argv):
+    assert not HEAVY_MODULES & imported_modules(tmp_path, *argv)
+
+
+@pytest.mark.parametrize("argv,expected", [
+    (["show", "abc"], {"python.app", "python.storage"}),
+    (["list"], {"python.app", "python.storage", "python.query"}),
+])
+def test_commands_import_only_what_they_use(tmp_path, argv, expected):
+    modules = imported_modules(tmp_path, *argv)
+    assert expected <= modules
+    assert not (HEAVY_MODULES - expected) & modules
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.models import Task, TaskPriority, TaskStatus
+from python.stats import TaskStatistics
+
+
+def test_statistics_follow_mutations(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    soon = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    first = manager.create_task("First", priority_value=3, due_date_str=soon)
+    second = manager.create_task("Second", priority_value=1)
+
+    manager.update_task_status(first, "done")
+    manager.update_task_priority(second, 4)
+
+    stats = manager.get_statistics()
+    assert stats["total"] == 2
+    assert stats["by_status"]["done"] == 1
+    assert stats["by_status"]["todo"] == 1
+    assert stats["by_priority"] == {1: 0, 2: 0, 3: 1, 4: 1}
+    assert stats["completed_last_week"] == 1
+    assert stats["overdue"] == 0
+
+    manager.delete_task(first)
+    stats = manager.get_statistics()
+    assert stats["total"] == 1
+    assert stats["completed_last_week"] == 0
+    assert manager.storage.verify_statistics()
+
+
+def test_statistics_survive_reload(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    manager = TaskManager(path)
+    manager.create_task("Late", priority_value=4, due_date_str="2020-01-01")
+
+    reloaded = TaskManager(path)
+    assert reloaded.get_statistics()["overdue"] == 1
+
+
+def test_completed_window_and_overdue_counts():
+    now = datetime(2026, 3, 10, 12, 0)
+    stats = TaskStatistics()
+    for days_ago in (0, 3, 7, 8):
+        task = Task(f"Done {days_ago}")
+        task.status = TaskStatus.DONE
+        task.completed_at = now - timedelta(days=days_ago)
+        stats.track(task)
+    late = Task("Late", priority=TaskPriority.LOW, due_date=now - timedelta(hours=1))
+    stats.track(late)
+
+    assert stats.count_completed_between(now - timedelta(days=7), now) == 3
+    assert stats.count_overdue(now) == 1
+
+    late.update(status=TaskStatus.DONE)
+    stats.track(late)
+    assert stats.count_overdue(now) == 0
+
+
+def test_verify_statistics_rebuilds_after_untracked_change(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task_id = manager.create_task("Sneaky")
+
+    # Mutating without going through storage leaves the counters stale
+    manager.storage.get_task(task_id).status = TaskStatus.REVIEW
+
+    graph = manager.storage._graph
+    assert manager.storage.verify_statistics() is False
+    assert manager.storage._graph is graph
+    assert manager.get_statistics()["by_status"]["review"] == 1
+    assert manager.storage.verify_statistics() is True
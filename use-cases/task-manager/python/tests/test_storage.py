@@ -0,0 +1,103 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.models import Task
+from python.storage import AmbiguousTaskIdError, TaskStorage
+
+
+def _task(task_id):
+    task = Task(f"Task {task_id}")
+    task.id = task_id
+    return task
+
+
+def test_resolve_unique_prefix(tmp_path):
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    for task_id in ("abc12345-1", "abd99999-2", "ffff0000-3"):
+        storage.add_task(_task(task_id))
+
+    assert storage.resolve_task_id("abc1") == "abc12345-1"
+    assert storage.resolve_task_id("ffff0000-3") == "ffff0000-3"
+    assert storage.resolve_task_id("zzz") is None
+    assert storage.resolve_task_id("") is None
+
+
+def test_ambiguous_prefix_lists_matches(tmp_path):
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    storage.add_task(_task("abc12345-1"))
+    storage.add_task(_task("abc67890-2"))
+
+    with pytest.raises(AmbiguousTaskIdError) as error:
+        storage.resolve_task_id("abc")
+    assert error.value.matches == ["abc12345-1", "abc67890-2"]
+    assert "ambiguous" in str(error.value)
+
+
+def test_prefix_index_follows_deletes_and_reload(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = TaskStorage(path)
+    storage.add_task(_task("abc12345-1"))
+    storage.add_task(_task("abc67890-2"))
+
+    storage.delete_task("abc67890-2")
+    assert storage.resolve_task_id("abc") == "abc12345-1"
+    assert TaskStorage(path).resolve_task_id("abc") == "abc12345-1"
+
+
+def test_indexes_are_built_on_first_use(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    writer = TaskStorage(path)
+    writer.add_task(_task("abc12345-1"))
+    writer.add_task(_task("abd99999-2"))
+
+    storage = TaskStorage(path)
+    assert storage.get_task("abc12345-1").title == "Task abc12345-1"
+    assert storage.resolve_task_id("abc12345-1") == "abc12345-1"
+    assert not storage._indexed and storage._search_index is None
+
+    assert storage.statistics.total == 2
+    assert storage._indexed
+
+
+def test_task_records_changed_fields():
+    task = Task("Draft", tags=["a"])
+    assert not task.is_dirty
+    assert task.update(title="Draft", description="More") == {"description"}
+    assert task.add_tag("b") and not task.add_tag("b")
+    assert task.changed_fields == {"description", "tags", "updated_at"}
+    task.mark_clean()
+    assert task.update(title="Draft") == set() and not task.is_dirty
+
+
+def test_commit_reencodes_only_changed_tasks(tmp_path, monkeypatch):
+    from python.codec import codec
+
+    path = tmp_path / "tasks.json"
+    storage = TaskStorage(str(path))
+    for task_id in ("a", "b", "c"):
+        storage.add_task(_task(task_id))
+
+    encoded = []
+    original = codec.encode_task
+    monkeypatch.setattr(codec, "encode_task", lambda task: encoded.append(task.id) or original(task))
+    mtime = path.stat().st_mtime_ns
+    log_size = os.path.getsize(f"{path}.changes")
+    assert storage.update_task("b", description="changed")
+    assert encoded == ["b"]
+
+    # Commits only append the changed record to the change log
+    assert path.stat().st_mtime_ns == mtime
+    assert os.path.getsize(f"{path}.changes") - log_size < 400
+    assert storage.update_task("b", description="changed")
+    assert encoded == ["b"]
+
+    storage.compact()
+    assert encoded == ["b"]
+    assert path.read_bytes() == codec.encode_tasks(storage.tasks.values())
+    assert TaskStorage(str(path)).get_task("b").description == "changed"
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+import sys
+from pathlib import Path
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.app import TaskManager
+from python.models import Task, TaskPriority, TaskStatus
+from python.storage import TaskStorage
+from python.sweeper import AbandonSweeper
+
+
+def _add(storage, title, priority, overdue_days):
+    task = Task(title, priority=priority, due_date=datetime.now() - timedelta(days=overdue_days))
+    storage.add_task(task)
+    return task
+
+
+def test_sweep_abandons_only_stale_low_priority_tasks(tmp_path):
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    stale = _add(storage, "Stale", TaskPriority.LOW, 10)
+    recent = _add(storage, "Recent", TaskPriority.MEDIUM, 2)
+    urgent = _add(storage, "Urgent", TaskPriority.URGENT, 10)
+
+    abandoned = AbandonSweeper(storage).sweep()
+
+    assert abandoned == [stale.id]
+    assert stale.status == TaskStatus.ABANDONED
+    assert recent.status == TaskStatus.TODO
+    assert urgent.status == TaskStatus.TODO
+    # Abandoned tasks leave the candidate index
+    assert stale not in storage.get_open_tasks_due_before(datetime.now())
+
+
+def test_sweep_saves_once(tmp_path, monkeypatch):
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    for index in range(3):
+        _add(storage, f"Stale {index}", TaskPriority.LOW, 30)
+
+    saves = []
+    monkeypatch.setattr(storage, "save", lambda: saves.append(1))
+    assert len(AbandonSweeper(storage).sweep()) == 3
+    assert len(saves) == 1
+
+
+def test_maybe_sweep_respects_interval(tmp_path):
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    sweeper = AbandonSweeper(storage, interval=timedelta(minutes=10))
+    now = datetime.now()
+    sweeper.maybe_sweep(now)
+
+    task = _add(storage, "Stale", TaskPriority.LOW, 10)
+    assert sweeper.maybe_sweep(now + timedelta(minutes=5)) == []
+    assert sweeper.maybe_sweep(now + timedelta(minutes=10)) == [task.id]
+
+
+def test_reads_do_not_sweep(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = _add(manager.storage, "Stale", TaskPriority.LOW, 10)
+
+    manager.list_tasks()
+    manager.get_task_details(task.id)
+    manager.get_statistics()
+    assert task.status == TaskStatus.TODO
+
+    manager.create_task("Trigger a write")
+    assert task.status == TaskStatus.ABANDONED
@@ -0,0 +1,67 @@
+import io
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure the package root is on sys.path so relative imports work
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from python.models import Task, TaskPriority, TaskStatus
+from python.storage import TaskStorage
+from python.transfer import export_tasks, import_tasks, record_to_task, task_to_record
+
+
+def sample_task():
+    task = Task("Ship release", "Tag, build\nand publish", TaskPriority.HIGH,
+                datetime(2026, 3, 1, 9, 30), ["release", "ops"])
+    task.status = TaskStatus.REVIEW
+    return task
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+@pytest.mark.parametrize("timestamps", ["iso", "epoch"])
+def test_round_trip(tmp_path, fmt, timestamps):
+    task = sample_task()
+    buffer = io.StringIO()
+    assert export_tasks(iter([task]), buffer, fmt, timestamps) == 1
+
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    buffer.seek(0)
+    result = import_tasks(storage, buffer, fmt)
+    assert result["imported"] == 1 and result["skipped"] == 0
+
+    restored = TaskStorage(str(tmp_path / "tasks.json")).get_task(task.id)
+    assert task_to_record(restored) == task_to_record(task)
+
+
+def test_import_skips_invalid_records_and_batches(tmp_path, capsys):
+    lines = [f'{{"title": "Task {i}", "priority": 1}}' for i in range(5)]
+    lines[2] = "not json"
+    lines.append('{"title": "Bad", "status": "unknown"}')
+
+    storage = TaskStorage(str(tmp_path / "tasks.json"))
+    result = import_tasks(storage, io.StringIO("\n".join(lines)), batch_size=2)
+
+    assert (result["imported"], result["skipped"]) == (4, 2)
+    assert storage.statistics.total == 4
+    assert storage.autosave and not storage.dirty
+    assert "Skipping record 3" in capsys.readouterr().out
+
+
+def test_import_commits_each_batch_to_the_disk_store(tmp_path):
+    lines = [f'{{"title": "Task {i}"}}' for i in range(6)]
+    storage = TaskStorage(str(tmp_path / "tasks.json"), cache_size=2)
+    pinned = []
+    commit = storage.commit
+    storage.commit = lambda: pinned.append(storage.tasks.pinned) or commit()
+
+    import_tasks(storage, io.StringIO("\n".join(lines)), batch_size=2)
+    assert len(pinned) >= 3 and max(pinned) <= 2
+    assert TaskStorage(str(tmp_path / "tasks.json"), cache_size=2).statistics.total == 6
+def test_epoch_and_iso_timestamps_are_both_accepted():
+    due = datetime(2026, 5, 4, 12, 0)
+    assert record_to_task({"title": "A", "due_date": due.timestamp()}).due_date == due
+    assert record_to_task({"title": "B", "due_date": str(due.timestamp())}).due_date == due
+    assert record_to_task({"title": "C", "due_date": due.isoformat()}).due_date == due
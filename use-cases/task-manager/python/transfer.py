@@ -0,0 +1,287 @@
+"""Streaming NDJSON and CSV export and import of tasks."""
+
+# task_manager/transfer.py
+import csv
+import json
+import time
+from datetime import datetime
+
+from .models import Task, TaskPriority, TaskStatus
+
+FORMATS = ("ndjson", "csv")
+TIMESTAMP_STYLES = ("iso", "epoch")
+FIELDS = [
+    "id", "title", "description", "priority", "status",
+    "created_at", "updated_at", "due_date", "completed_at", "tags", "blocked_by",
+    "recurrence",
+]
+TIMESTAMP_FIELDS = ("created_at", "updated_at", "due_date", "completed_at")
+TAG_SEPARATOR = ","
+DEFAULT_BATCH_SIZE = 1000
+
+
+def format_for_path(path, default="ndjson"):
+    """Guess the exchange format from a file name.
+
+    Args:
+        path (str | None): File name, or None/"-" for stdin/stdout.
+        default (str): Format used when the extension is not recognized.
+
+    Returns:
+        str: One of `FORMATS`.
+    """
+    if path and path.lower().endswith(".csv"):
+        return "csv"
+    if path and path.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return default
+
+
+def _parse_timestamp(value):
+    """Parse an ISO 8601 string or a Unix epoch (number or numeric string)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    try:
+        return datetime.fromtimestamp(float(value))
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+def _timestamp_getter(key, timestamps):
+    if timestamps == "epoch":
+        def get(task):
+            value = getattr(task, key)
+            return None if value is None else value.timestamp()
+    else:
+        def get(task):
+            value = getattr(task, key)
+            return None if value is None else value.isoformat()
+    return get
+
+
+def record_builder(fields=None, timestamps="iso"):
+    """Build a function that converts tasks to records with only `fields`.
+
+    Args:
+        fields (list[str] | None): Keys to include, defaults to `FIELDS`.
+        timestamps (str): "iso" for ISO 8601 strings, "epoch" for Unix seconds.
+
+    Returns:
+        Callable[[Task], dict]: Converter; fields that were not requested are
+        never computed.
+
+    Raises:
+        ValueError: If a field or the timestamp style is unknown.
+
+    Example:
+        >>> to_record = record_builder(["id", "title"])
+        >>> sorted(to_record(Task("Write docs")))
+        ['id', 'title']
+    """
+    if timestamps not in TIMESTAMP_STYLES:
+        raise ValueError(f"Unknown timestamp style: {timestamps}")
+    getters = {
+        "id": lambda task: task.id,
+        "title": lambda task: task.title,
+        "description": lambda task: task.description,
+        "priority": lambda task: task.priority.value,
+        "status": lambda task: task.status.value,
+        "tags": lambda task: list(task.tags),
+        "blocked_by": lambda task: list(task.blocked_by),
+        "recurrence": lambda task: task.recurrence,
+    }
+    for key in TIMESTAMP_FIELDS:
+        getters[key] = _timestamp_getter(key, timestamps)
+
+    fields = list(fields or FIELDS)
+    unknown = [field for field in fields if field not in getters]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    selected = [(field, getters[field]) for field in fields]
+    return lambda task: {field: get(task) for field, get in selected}
+
+
+def task_to_record(task, timestamps="iso"):
+    """Convert a task to a flat, JSON-serializable record.
+
+    Args:
+        task (Task): Task to convert.
+        timestamps (str): "iso" for ISO 8601 strings, "epoch" for Unix seconds.
+
+    Returns:
+        dict: Record with the keys in `FIELDS`.
+    """
+    return record_builder(FIELDS, timestamps)(task)
+
+
+def _split_list(value):
+    """Read a list field given as a list or as a CSV cell joined by `TAG_SEPARATOR`."""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(TAG_SEPARATOR) if item.strip()]
+    return list(value or [])
+
+
+def record_to_task(record):
+    """Build a task from a record produced by `task_to_record()` or a CSV row.
+
+    Args:
+        record (dict): Record; only `title` is required.
+
+    Returns:
+        Task: The decoded task. A new ID is generated when `id` is missing.
+
+    Raises:
+        ValueError: If a priority, status or timestamp is invalid, or the
+            title is missing.
+    """
+    if not record.get("title"):
+        raise ValueError("missing title")
+    task = Task(record["title"], record.get("description") or "")
+    if record.get("id"):
+        task.id = record["id"]
+    if record.get("priority") not in (None, ""):
+        task.priority = TaskPriority(int(record["priority"]))
+    if record.get("status"):
+        task.status = TaskStatus(record["status"])
+    for key in TIMESTAMP_FIELDS:
+        parsed = _parse_timestamp(record.get(key))
+        if parsed is not None:
+            setattr(task, key, parsed)
+
+    task.tags = _split_list(record.get("tags"))
+    task.blocked_by = _split_list(record.get("blocked_by"))
+    recurrence = record.get("recurrence") or None
+    task.recurrence = json.loads(recurrence) if isinstance(recurrence, str) else recurrence
+    return task
+
+
+def export_tasks(tasks, out, fmt="ndjson", timestamps="iso"):
+    """Write tasks to `out` one record at a time.
+
+    Args:
+        tasks (Iterable[Task]): Tasks to export, typically a generator.
+        out (TextIO): Writable text stream.
+        fmt (str): "ndjson" or "csv".
+        timestamps (str): "iso" or "epoch".
+
+    Returns:
+        int: Number of exported tasks.
+
+    Raises:
+        ValueError: If `fmt` or `timestamps` is unknown.
+
+    Example:
+        >>> import io
+        >>> export_tasks([Task("Write docs")], io.StringIO())
+        1
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    to_record = record_builder(FIELDS, timestamps)
+
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        for task in tasks:
+            record = to_record(task)
+            record["tags"] = TAG_SEPARATOR.join(record["tags"])
+            record["blocked_by"] = TAG_SEPARATOR.join(record["blocked_by"])
+            if record["recurrence"] is not None:
+                record["recurrence"] = json.dumps(record["recurrence"], separators=(",", ":"))
+            writer.writerow(record)
+            count += 1
+    else:
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        for task in tasks:
+            out.write(encode(to_record(task)))
+            out.write("\n")
+            count += 1
+    return count
+
+
+def iter_records(source, fmt="ndjson"):
+    """Lazily read records from an NDJSON or CSV stream.
+
+    Args:
+        source (TextIO): Readable text stream.
+        fmt (str): "ndjson" or "csv".
+
+    Yields:
+        tuple[int, dict | None, str | None]: Line or row number, the record,
+        and an error message when the line could not be parsed.
+
+    Raises:
+        ValueError: If `fmt` is unknown.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(source), start=2):
+            yield number, row, None
+        return
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line), None
+        except ValueError as e:
+            yield number, None, str(e)
+
+
+def import_tasks(storage, source, fmt="ndjson", batch_size=DEFAULT_BATCH_SIZE):
+    """Stream tasks from `source` into `storage` in batches.
+
+    Args:
+        storage (TaskStorage): Destination storage.
+        source (TextIO): Readable NDJSON or CSV stream.
+        fmt (str): "ndjson" or "csv".
+        batch_size (int): Number of tasks handed to `add_tasks()` at once.
+
+    Returns:
+        dict: `imported` and `skipped` counts, elapsed `seconds` and
+        `per_second` throughput.
+
+    Notes:
+        Tasks with an existing ID replace the stored task. Invalid records are
+        reported and skipped. Each batch is committed once it is added, so
+        the on-disk store (`cache_size`) never holds more than one batch of
+        unwritten tasks; a storage with `autosave` off is left to commit.
+    """
+    started = time.perf_counter()
+    imported = skipped = 0
+    batch = []
+    autosave = storage.autosave
+    storage.autosave = False
+    try:
+        for number, record, error in iter_records(source, fmt):
+            if error is None:
+                try:
+                    batch.append(record_to_task(record))
+                except (AttributeError, ValueError, TypeError, OverflowError) as e:
+                    error = str(e)
+            if error is not None:
+                print(f"Skipping record {number}: {error}")
+                skipped += 1
+                continue
+            if len(batch) >= batch_size:
+                imported += storage.add_tasks(batch)
+                batch = []
+                if autosave:
+                    storage.commit()
+        if batch:
+            imported += storage.add_tasks(batch)
+    finally:
+        storage.autosave = autosave
+    if autosave:
+        storage.commit()
+
+    seconds = time.perf_counter() - started
+    return {
+        "imported": imported,
+        "skipped": skipped,
+        "seconds": seconds,
+        "per_second": imported / seconds if seconds else 0.0,
+    }